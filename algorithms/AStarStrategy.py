@@ -0,0 +1,164 @@
+import math
+from array import array
+
+from core.compat import get_numpy
+from core.PriorityQueue import create_priority_queue
+from ui.CanvasScene import CanvasScene
+from .DijkstraStrategy import DijkstraStrategy
+from .StepTrace import Op, NO_NODE
+
+HEURISTICS = ('euclidean', 'manhattan')
+
+
+class AStarStrategy(DijkstraStrategy):
+    """
+    A*: Dijkstra có hướng tới một nút đích, khóa hàng đợi là g + h.
+
+    h(v) = scale * khoảng cách (Euclid hoặc Manhattan) từ tọa độ của v tới đích, với
+    scale = min trên mọi cung của trọng số / độ dài hình học. Nhờ đó h không bao giờ
+    vượt quá trọng số thật (chấp nhận được và nhất quán) với mọi bộ tọa độ; trên đồ
+    thị hình học (trọng số ~ độ dài) h sát với thực tế nên chỉ xét một phần nhỏ số nút.
+
+    Bước sinh ra giống Dijkstra (giá trị trong 'update_distance' là g), dừng khi lấy
+    được đích rồi phát các cạnh của đường đi ('path_edge') từ start tới đích.
+    """
+
+    def __init__(self, heuristic='euclidean', queue_kind='binary'):
+        super().__init__(queue_kind)
+        self.heuristic = heuristic
+
+    def cache_options(self, graph):
+        # Heuristic đọc tọa độ nút: cùng cung nhưng khác tọa độ là trace khác
+        return dict(super().cache_options(graph), heuristic=self.heuristic,
+                    geometry=graph.geometry_fingerprint())
+
+    def iter_steps(self, graph, start_node, target=None, heuristic=None, queue_kind=None):
+        heuristic = heuristic or self.heuristic
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Heuristic không hợp lệ: '{heuristic}' "
+                             f"(chọn một trong {', '.join(HEURISTICS)})")
+        if target is None:
+            target = graph.default_target_node(start_node)
+        return self._search(graph, graph.index_of(start_node), graph.index_of(target),
+                            heuristic, queue_kind or self.queue_kind)
+
+    def _search(self, graph, start, goal, heuristic, queue_kind):
+        num_nodes = graph.num_nodes
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        xs, ys = graph.xs, graph.ys
+        goal_x, goal_y = xs[goal], ys[goal]
+        scale = self.heuristic_scale(graph, heuristic)
+        euclidean = heuristic == 'euclidean'
+        integral = queue_kind == 'bucket'
+
+        def estimate(node):
+            dx, dy = xs[node] - goal_x, ys[node] - goal_y
+            h = scale * (math.hypot(dx, dy) if euclidean else abs(dx) + abs(dy))
+            # Khóa của BucketQueue phải nguyên: làm tròn xuống vẫn nhất quán với trọng số nguyên
+            return math.floor(h) if integral else h
+
+        inf = float('inf')
+        distances = [inf] * num_nodes
+        parent = array('i', [NO_NODE]) * num_nodes
+        pq = self._search_queue(graph, queue_kind)
+        closed = bytearray(num_nodes)
+        distances[start] = 0
+        pq.push(start, estimate(start))
+        pushes, pops, decreases, relaxed = 1, 0, 0, 0
+        try:
+            yield Op.UPDATE_DISTANCE, start, NO_NODE, 0
+            while pq:
+                _, current_node = pq.pop()
+                pops += 1
+                closed[current_node] = 1
+                yield Op.VISIT, current_node
+                if current_node == goal:
+                    yield from path_steps(parent, start, goal)
+                    return
+
+                current_distance = distances[current_node]
+                for k in range(offsets[current_node], offsets[current_node + 1]):
+                    neighbor = targets[k]
+                    if closed[neighbor]:
+                        continue
+                    yield Op.EXPLORE, current_node, neighbor
+                    new_distance = current_distance + weights[k]
+                    relaxed += 1
+                    if new_distance < distances[neighbor]:
+                        if distances[neighbor] == inf:
+                            pushes += 1
+                        else:
+                            decreases += 1
+                        distances[neighbor] = new_distance
+                        parent[neighbor] = current_node
+                        pq.push(neighbor, new_distance + estimate(neighbor))
+                        yield Op.UPDATE_DISTANCE, neighbor, current_node, new_distance
+        finally:
+            self._count('heap_push', pushes)
+            self._count('heap_pop', pops)
+            self._count('decrease_key', decreases)
+            self._count('edges_relaxed', relaxed)
+
+    @staticmethod
+    def heuristic_scale(graph, heuristic='euclidean'):
+        """min(trọng số / độ dài hình học) trên các cung có độ dài > 0 (0 nếu không có cung nào)."""
+        np = get_numpy()
+        if np is not None:
+            offsets = np.asarray(memoryview(graph.offsets))
+            sources = np.repeat(np.arange(graph.num_nodes), np.diff(offsets))
+            targets = np.asarray(memoryview(graph.targets))
+            xs, ys = np.asarray(memoryview(graph.xs)), np.asarray(memoryview(graph.ys))
+            dx, dy = xs[targets] - xs[sources], ys[targets] - ys[sources]
+            lengths = np.hypot(dx, dy) if heuristic == 'euclidean' else np.abs(dx) + np.abs(dy)
+            positive = lengths > 0
+            if not positive.any():
+                return 0.0
+            weights = np.asarray(memoryview(graph.weights))[positive]
+            return max(float((weights / lengths[positive]).min()), 0.0)
+
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        xs, ys = graph.xs, graph.ys
+        scale = math.inf
+        for u in range(graph.num_nodes):
+            for k in range(offsets[u], offsets[u + 1]):
+                dx, dy = xs[targets[k]] - xs[u], ys[targets[k]] - ys[u]
+                length = math.hypot(dx, dy) if heuristic == 'euclidean' else abs(dx) + abs(dy)
+                if length > 0:
+                    scale = min(scale, weights[k] / length)
+        return 0.0 if scale == math.inf else max(scale, 0.0)
+
+    def _search_queue(self, graph, queue_kind):
+        max_weight = None
+        if queue_kind == 'bucket':
+            if not graph.has_integer_weights:
+                raise ValueError("Hàng đợi 'bucket' chỉ dùng được với trọng số nguyên")
+            # f = g + h tăng tối đa 2 * trọng số mỗi cung (h nhất quán)
+            max_weight = 2 * max(graph.weights, default=0)
+        return create_priority_queue(queue_kind, graph.num_nodes, max_weight)
+
+    def _create_queue(self, graph, queue_kind=None):
+        # Hàng đợi hiển thị giữ khóa g (không đơn điệu theo thứ tự lấy ra): luôn dùng heap nhị phân
+        return create_priority_queue('binary', graph.num_nodes)
+
+    def apply_step(self, state, step):
+        if step[0] == 'path_edge':
+            state.set('edge_colors', tuple(sorted((step[1], step[2]))), 'blue')
+            state.set('node_colors', step[1], 'gold')
+            state.set('node_colors', step[2], 'gold')
+            return
+        super().apply_step(state, step)
+
+    def _create_scene(self, canvas, graph):
+        # Vẽ theo tọa độ graph.xs/ys mà heuristic dùng (không theo bố cục riêng của Dijkstra)
+        return CanvasScene(canvas, graph, graph.nodes, graph.dijkstra_weighted_edges,
+                           weighted=True)
+
+
+def path_steps(parent, start, goal):
+    """Các bước 'path_edge' theo thứ tự start -> goal, lần theo mảng cha từ goal."""
+    path = [goal]
+    while path[-1] != start:
+        path.append(parent[path[-1]])
+    path.reverse()
+    for a, b in zip(path, path[1:]):
+        yield Op.PATH_EDGE, a, b
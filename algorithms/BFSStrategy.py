@@ -1,138 +1,103 @@
 from core.Graph import Graph
 from .IBaseAlgorithmStrategy import IBaseAlgorithmStrategy
+from .RenderState import RenderState
+from .StepTrace import Op
+from ui.CanvasScene import CanvasScene
 from collections import deque
 
 class BFSStrategy(IBaseAlgorithmStrategy):
-    def run(self,graph: Graph,start_node):
-        steps = []  # Danh sách để lưu các bước
-        queue = deque([start_node])
-        visited = {start_node}
-
-        # ('visit', node, highlight_color)
-        steps.append(('visit', start_node, 'orange'))
-
-        while queue:
-            current_node = queue.popleft()
-            # ('process', node, highlight_color)
-            steps.append(('process', current_node, 'gray'))
-
-            for neighbor in graph.unweighted_edges.get(current_node, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append(neighbor)
-                    # ('explore', from_node, to_node, highlight_color)
-                    steps.append(('explore', current_node, neighbor, 'red'))
-                    steps.append(('visit', neighbor, 'orange'))
-
-        steps.append(('finish', None, None))  # Báo hiệu kết thúc
-        return steps
-
-    def render_step(self, canvas, graph, all_steps, index):
-        # 1. Vẽ đồ thị ban đầu
-        node_ui, edge_ui, text_ui = self._draw_base_graph(canvas, graph)
-
-        # 2. Tính toán trạng thái màu sắc/text TÍCH LŨY đến bước 'index'
-        node_colors = {}
-        edge_colors = {}
-        visited = set()
-        discovered = set()
-        queue = deque()
+    def iter_steps(self, graph: Graph, start_node):
+        start = graph.index_of(start_node)
+        queue = deque([start])
+        visited = bytearray(graph.num_nodes)
+        visited[start] = 1
+
+        # Bộ đếm cho profiler (chỉ báo cáo khi đang bật)
+        pushes, pops, scanned = 1, 0, 0
+        try:
+            # ('visit', node) -> tô màu cam
+            yield Op.VISIT, start
+
+            while queue:
+                current_node = queue.popleft()
+                pops += 1
+                # ('process', node) -> tô màu xám
+                yield Op.PROCESS, current_node
+
+                neighbors = graph.unweighted_neighbors(current_node)
+                scanned += len(neighbors)
+                for neighbor in neighbors:
+                    if not visited[neighbor]:
+                        visited[neighbor] = 1
+                        queue.append(neighbor)
+                        pushes += 1
+                        # ('explore', from_node, to_node) -> tô màu đỏ
+                        yield Op.EXPLORE, current_node, neighbor
+                        yield Op.VISIT, neighbor
+
+            yield (Op.FINISH,)  # Báo hiệu kết thúc
+        finally:
+            self._count('queue_push', pushes)
+            self._count('queue_pop', pops)
+            self._count('edges_scanned', scanned)
+
+    def create_render_state(self, graph, all_steps):
+        state = RenderState(
+            maps=('node_colors', 'edge_colors', 'visited', 'discovered'),
+            sequences=('queue',))
 
         start_node = None
         if all_steps and all_steps[0][0] == 'visit':
             start_node = all_steps[0][1]
         if start_node is not None:
             # Khởi tạo đúng một lần: queue chứa start_node
-            queue.append(start_node)
-            discovered.add(start_node)
-
-        for i in range(index + 1):
-            step = all_steps[i]
-            action = step[0]
-
-            # 3. "PHIÊN DỊCH" CÁC BƯỚC LOGIC CỦA BFS RA MÀU
-            if action == 'visit':
-                # ('visit', node)
-                node = step[1]
-                node_colors[node] = 'orange'  # BFS 'visit' -> màu cam
-                visited.add(node)
-
-            elif action == 'process':
-                # ('process', node)
-                node = step[1]
-                node_colors[node] = 'gray'  # BFS 'process' -> màu xám
-                if queue and queue[0] == node:
-                    queue.popleft()
-
-            elif action == 'explore':
-                # ('explore', from_node, to_node)
-                edge_key = tuple(sorted((step[1], step[2])))
-                edge_colors[edge_key] = 'red'  # BFS 'explore' -> màu đỏ
-                to_node = step[2]
-                if to_node not in discovered:
-                    discovered.add(to_node)
-                    queue.append(to_node)
-
-            elif action == 'finish':
-                queue.clear()
-
-        # 4. Áp dụng các màu đã tính toán lên canvas
-        for node, color in node_colors.items():
-            if node in node_ui:
-                canvas.itemconfig(node_ui[node], fill=color)
-
-        for edge_key, color in edge_colors.items():
-            if edge_key in edge_ui:
-                canvas.itemconfig(edge_ui[edge_key], fill=color, width=3)
-
-        canvas.delete("info_text")
-
-        visited_text = "Visited: " + ", ".join(sorted(visited))
-        queue_text = "Queue: " + ", ".join(reversed(queue))
-
-        canvas.create_text(
-            20, 20, anchor="w", text=visited_text,
-            font=("Helvetica", 14, "bold"), fill="blue", tags="info_text"
-        )
-        canvas.create_text(
-            20, 50, anchor="w", text=queue_text,
-            font=("Helvetica", 14, "bold"), fill="green", tags="info_text"
-        )
+            state.push('queue', start_node)
+            state.add('discovered', start_node)
+        return state
+
+    def apply_step(self, state, step):
+        action = step[0]
+
+        # "PHIÊN DỊCH" CÁC BƯỚC LOGIC CỦA BFS RA MÀU
+        if action == 'visit':
+            # ('visit', node)
+            node = step[1]
+            state.set('node_colors', node, 'orange')  # BFS 'visit' -> màu cam
+            state.add('visited', node)
+
+        elif action == 'process':
+            # ('process', node)
+            node = step[1]
+            state.set('node_colors', node, 'gray')  # BFS 'process' -> màu xám
+            queue = state.seqs['queue']
+            if queue and queue[0] == node:
+                state.popleft('queue')
+
+        elif action == 'explore':
+            # ('explore', from_node, to_node)
+            edge_key = tuple(sorted((step[1], step[2])))
+            state.set('edge_colors', edge_key, 'red')  # BFS 'explore' -> màu đỏ
+            to_node = step[2]
+            if not state.has('discovered', to_node):
+                state.add('discovered', to_node)
+                state.push('queue', to_node)
+
+        elif action == 'finish':
+            state.clear('queue')
+
+    def draw_state(self, canvas, graph, state):
+        # 1. Cảnh vẽ được tạo một lần; chỉ cập nhật các nút/cạnh đổi màu
+        scene = self.scene_for(canvas, graph)
+        changed = scene.sync(state, node_fill='node_colors', edge_fill='edge_colors')
+
+        # 2. Dòng thông tin chỉ tính lại khi dữ liệu liên quan thay đổi
+        if changed is None or 'visited' in changed:
+            visited_text = "Visited: " + ", ".join(sorted(state.maps['visited']))
+            scene.set_info('visited', 20, 20, visited_text, fill="blue")
+        if changed is None or 'queue' in changed:
+            queue_text = "Queue: " + ", ".join(reversed(state.seqs['queue']))
+            scene.set_info('queue', 20, 50, queue_text, fill="green")
 
     # noinspection PyMethodMayBeStatic
-    def _draw_base_graph(self, canvas, graph):
-        canvas.delete("all")  # Xóa mọi thứ
-
-        node_ui = {}
-        edge_ui = {}
-        text_ui = {}
-
-        node_radius = 20
-        default_color = 'lightgray'
-
-        # Vẽ các cạnh (Edges) trước
-        for node, neighbors in graph.unweighted_edges.items():
-            x1, y1 = graph.nodes[node]
-            for neighbor in neighbors:
-                key = tuple(sorted((node, neighbor)))  # (A,B)
-                if key not in edge_ui:
-                    x2, y2 = graph.nodes[neighbor]
-                    edge_id = canvas.create_line(
-                        x1, y1, x2, y2, fill=default_color, width=2
-                    )
-                    edge_ui[key] = edge_id
-
-        # Vẽ các nút (Nodes)
-        for node, (x, y) in graph.nodes.items():
-            oval_id = canvas.create_oval(
-                x - node_radius, y - node_radius,
-                x + node_radius, y + node_radius,
-                fill=default_color, outline='black', width=2
-            )
-            # Tạo text, ban đầu chỉ có tên nút
-            text_id = canvas.create_text(x, y, text=node,
-                                         font=('Arial', 12, 'bold'))
-            node_ui[node] = oval_id
-            text_ui[node] = text_id
-
-        return node_ui, edge_ui, text_ui
\ No newline at end of file
+    def _create_scene(self, canvas, graph):
+        return CanvasScene(canvas, graph, graph.nodes, graph.unweighted_edges)
@@ -0,0 +1,236 @@
+import heapq
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from core.compat import get_numpy
+
+METHODS = ('dijkstra', 'bfs')
+
+
+class BatchShortestPaths:
+    """
+    Đường đi ngắn nhất từ nhiều nguồn cùng lúc, không sinh trace.
+
+    - 'dijkstra': khoảng cách theo trọng số (trọng số phải không âm).
+    - 'bfs': số cạnh trên bản không trọng số.
+
+    Mỗi nguồn là một lượt tìm độc lập. workers > 1 thì các nguồn được chia cho
+    một process pool; CSR của đồ thị được đặt trong shared memory một lần, các
+    process chỉ gắn vào chứ không nhận bản sao qua pickle. Ma trận kết quả cũng
+    nằm trong shared memory để các process ghi thẳng từng dòng.
+    Không tới được: khoảng cách là inf.
+    """
+    # Số nguồn mỗi task gửi cho pool
+    chunk = 16
+
+    def __init__(self, method='dijkstra', workers=None):
+        if method not in METHODS:
+            raise ValueError(f"Phương pháp không hợp lệ: '{method}' "
+                             f"(chọn một trong {', '.join(METHODS)})")
+        self.method = method
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+
+    def distance_matrix(self, graph, sources=None):
+        """
+        Ma trận len(sources) x num_nodes (dòng i: khoảng cách từ sources[i]; sources=None
+        là mọi nút). Là mảng NumPy float64 nếu có NumPy, nếu không là list các array('d').
+        """
+        ids = self._source_ids(graph, sources)
+        num_nodes = graph.num_nodes
+        if self.workers <= 1 or len(ids) <= 1:
+            rows = [_search(self.method, *_columns(graph), source) for source in ids]
+            np = get_numpy()
+            if np is None:
+                return rows
+            matrix = np.empty((len(ids), num_nodes))
+            for i, row in enumerate(rows):
+                matrix[i] = np.frombuffer(row, dtype=np.float64)
+            return matrix
+
+        output = shared_memory.SharedMemory(create=True, size=max(8 * len(ids) * num_nodes, 1))
+        try:
+            tasks = [(output.name, start, ids[start:start + self.chunk])
+                     for start in range(0, len(ids), self.chunk)]
+            with _SharedGraph(graph) as shared, self._pool(shared, len(tasks)) as pool:
+                for _ in pool.map(_fill_rows, tasks):
+                    pass
+            values = output.buf[:8 * len(ids) * num_nodes].cast('d')
+            np = get_numpy()
+            if np is not None:
+                matrix = np.frombuffer(values, dtype=np.float64).reshape(len(ids), num_nodes).copy()
+            else:
+                matrix = [array('d', values[i * num_nodes:(i + 1) * num_nodes])
+                          for i in range(len(ids))]
+            values.release()
+            return matrix
+        finally:
+            output.close()
+            output.unlink()
+
+    def iter_distances(self, graph, sources=None):
+        """
+        Generator (nhãn nguồn, array('d') khoảng cách tới từng nút) theo đúng thứ tự nguồn;
+        chỉ giữ kết quả của các task đang chạy (dùng cho hàng nghìn nguồn trên đồ thị lớn).
+        """
+        ids = self._source_ids(graph, sources)
+        labels = graph.labels
+        if self.workers <= 1 or len(ids) <= 1:
+            columns = _columns(graph)
+            for source in ids:
+                yield labels[source], _search(self.method, *columns, source)
+            return
+
+        tasks = [ids[start:start + self.chunk] for start in range(0, len(ids), self.chunk)]
+        with _SharedGraph(graph) as shared, self._pool(shared, len(tasks)) as pool:
+            # Chỉ gửi trước một số task giới hạn để kết quả không dồn lại trong bộ nhớ
+            pending = deque()
+            for task in tasks:
+                pending.append((task, pool.submit(_search_rows, task)))
+                if len(pending) > 2 * self.workers:
+                    yield from self._rows(labels, *pending.popleft())
+            while pending:
+                yield from self._rows(labels, *pending.popleft())
+
+    @staticmethod
+    def _rows(labels, task, future):
+        for source, row in zip(task, future.result()):
+            yield labels[source], row
+
+    def _pool(self, shared, num_tasks):
+        return ProcessPoolExecutor(min(self.workers, num_tasks), initializer=_attach,
+                                   initargs=(self.method, shared.layout))
+
+    def _source_ids(self, graph, sources):
+        if self.method == 'dijkstra' and any(w < 0 for w in graph.weights):
+            raise ValueError("Dijkstra cần trọng số không âm")
+        if sources is None:
+            return list(range(graph.num_nodes))
+        return [graph.index_of(label) for label in sources]
+
+
+# ----------------------------------------------------------------------
+# Tìm đường từ một nguồn (chạy trong process chính hoặc trong pool)
+# ----------------------------------------------------------------------
+def _columns(graph):
+    return graph.offsets, graph.targets, graph.weights, graph.unweighted_mask
+
+
+def _search(method, offsets, targets, weights, mask, source):
+    if method == 'bfs':
+        return _bfs(offsets, targets, mask, source)
+    return _dijkstra(offsets, targets, weights, source)
+
+
+def _dijkstra(offsets, targets, weights, source):
+    inf = float('inf')
+    distances = [inf] * (len(offsets) - 1)
+    distances[source] = 0.0
+    heap = [(0.0, source)]
+    pop, push = heapq.heappop, heapq.heappush
+    while heap:
+        distance, node = pop(heap)
+        if distance > distances[node]:
+            continue  # mục cũ (heap không giảm khóa, chỉ đẩy thêm)
+        for k in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[k]
+            new_distance = distance + weights[k]
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                push(heap, (new_distance, neighbor))
+    return array('d', distances)
+
+
+def _bfs(offsets, targets, mask, source):
+    inf = float('inf')
+    distances = [inf] * (len(offsets) - 1)
+    distances[source] = 0.0
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        next_distance = distances[node] + 1
+        for k in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[k]
+            if distances[neighbor] == inf and (mask is None or mask[k]):
+                distances[neighbor] = next_distance
+                queue.append(neighbor)
+    return array('d', distances)
+
+
+# ----------------------------------------------------------------------
+# Shared memory
+# ----------------------------------------------------------------------
+class _SharedGraph:
+    """Chép các cột CSR vào shared memory; layout = [(tên block, typecode, độ dài) | None]."""
+
+    def __init__(self, graph):
+        self._blocks = []
+        self.layout = []
+        try:
+            for column in _columns(graph):
+                if column is None:
+                    self.layout.append(None)
+                    continue
+                if not isinstance(column, array):
+                    column = array(column.format, column)
+                size = len(column) * column.itemsize
+                block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+                self._blocks.append(block)
+                block.buf[:size] = column.tobytes()
+                self.layout.append((block.name, column.typecode, len(column)))
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+# Trạng thái của từng process trong pool (gán bởi _attach)
+_worker_method = None
+_worker_blocks = []
+_worker_columns = None
+
+
+def _attach(method, layout):
+    global _worker_method, _worker_columns
+    _worker_method = method
+    columns = []
+    for entry in layout:
+        if entry is None:
+            columns.append(None)
+            continue
+        name, typecode, length = entry
+        block = shared_memory.SharedMemory(name=name)
+        _worker_blocks.append(block)  # giữ block mở suốt đời process
+        columns.append(block.buf[:length * array(typecode).itemsize].cast(typecode))
+    _worker_columns = tuple(columns)
+
+
+def _search_rows(sources):
+    return [_search(_worker_method, *_worker_columns, source) for source in sources]
+
+
+def _fill_rows(task):
+    name, first_row, sources = task
+    output = shared_memory.SharedMemory(name=name)
+    try:
+        num_nodes = len(_worker_columns[0]) - 1
+        values = output.buf.cast('B')
+        for row, source in enumerate(sources, first_row):
+            values[8 * row * num_nodes:8 * (row + 1) * num_nodes] = \
+                _search(_worker_method, *_worker_columns, source).tobytes()
+        values.release()
+    finally:
+        output.close()
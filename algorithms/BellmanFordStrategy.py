@@ -0,0 +1,262 @@
+from array import array
+from collections import deque
+
+from .IBaseAlgorithmStrategy import IBaseAlgorithmStrategy
+from .RenderState import RenderState
+from .StepTrace import Op, NO_NODE
+from core.compat import get_numpy
+from ui.CanvasScene import CanvasScene
+
+MODES = ('spfa', 'early_exit', 'vectorized')
+
+
+class BellmanFordStrategy(IBaseAlgorithmStrategy):
+    """
+    Bellman–Ford: đường đi ngắn nhất từ một nút, chấp nhận trọng số âm.
+
+    - 'spfa': hàng đợi FIFO, chỉ xét lại cạnh ra của nút vừa được giảm khoảng cách.
+    - 'early_exit': cổ điển, mỗi vòng duyệt mọi cung; dừng ngay khi một vòng không đổi gì.
+    - 'vectorized': mỗi vòng nới lỏng mọi cung cùng lúc trên mảng cung (NumPy);
+      không có NumPy thì chạy như 'early_exit'.
+
+    Bước sinh ra giống Dijkstra ('update_distance' nút, giá trị, cha; 'visit' khi SPFA
+    lấy nút khỏi hàng đợi) cộng thêm ('round', r). Nếu có chu trình âm đi tới được
+    từ nút bắt đầu thì phát các cạnh của chu trình ('negative_cycle_edge') rồi dừng.
+    """
+
+    def __init__(self, mode='spfa'):
+        self.mode = mode
+
+    def cache_options(self, graph):
+        return {'mode': self.mode}
+
+    def iter_steps(self, graph, start_node, mode=None):
+        mode = mode or self.mode
+        if mode not in MODES:
+            raise ValueError(f"Chế độ Bellman-Ford không hợp lệ: '{mode}' "
+                             f"(chọn một trong {', '.join(MODES)})")
+        start = graph.index_of(start_node)
+        if mode == 'spfa':
+            return self._spfa(graph, start)
+        np = get_numpy() if mode == 'vectorized' else None
+        if np is not None:
+            return self._rounds_numpy(np, graph, start)
+        return self._rounds(graph, start)
+
+    # ------------------------------------------------------------------
+    # SPFA (hàng đợi)
+    # ------------------------------------------------------------------
+    def _spfa(self, graph, start):
+        num_nodes = graph.num_nodes
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        inf = float('inf')
+        distances = [inf] * num_nodes
+        parent = array('i', [NO_NODE]) * num_nodes
+        # Số cung của đường đi hiện tại: >= num_nodes nghĩa là đi vòng qua chu trình âm
+        hops = array('i', bytes(4 * num_nodes))
+        in_queue = bytearray(num_nodes)
+        queue = deque([start])
+        in_queue[start] = 1
+        distances[start] = 0
+        # Bộ đếm cho profiler (chỉ báo cáo khi đang bật)
+        pushes, pops, relaxed = 1, 0, 0
+        try:
+            yield Op.UPDATE_DISTANCE, start, NO_NODE, 0
+            while queue:
+                node = queue.popleft()
+                pops += 1
+                in_queue[node] = 0
+                yield Op.VISIT, node
+                base = distances[node]
+                for k in range(offsets[node], offsets[node + 1]):
+                    neighbor = targets[k]
+                    new_distance = base + weights[k]
+                    relaxed += 1
+                    if new_distance < distances[neighbor]:
+                        distances[neighbor] = new_distance
+                        parent[neighbor] = node
+                        hops[neighbor] = hops[node] + 1
+                        yield Op.UPDATE_DISTANCE, neighbor, node, new_distance
+                        if hops[neighbor] >= num_nodes:
+                            yield from self._cycle_steps(parent, neighbor)
+                            return
+                        if not in_queue[neighbor]:
+                            in_queue[neighbor] = 1
+                            queue.append(neighbor)
+                            pushes += 1
+        finally:
+            self._count('queue_push', pushes)
+            self._count('queue_pop', pops)
+            self._count('edges_relaxed', relaxed)
+
+    # ------------------------------------------------------------------
+    # Theo vòng, dừng sớm khi không đổi
+    # ------------------------------------------------------------------
+    def _rounds(self, graph, start):
+        num_nodes = graph.num_nodes
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        inf = float('inf')
+        distances = [inf] * num_nodes
+        parent = array('i', [NO_NODE]) * num_nodes
+        distances[start] = 0
+        rounds, relaxed = 0, 0
+        try:
+            yield Op.UPDATE_DISTANCE, start, NO_NODE, 0
+            # Vòng thứ num_nodes vẫn còn giảm được -> có chu trình âm
+            for rounds in range(1, num_nodes + 1):
+                yield Op.ROUND, NO_NODE, NO_NODE, rounds
+                changed = NO_NODE
+                for node in range(num_nodes):
+                    base = distances[node]
+                    if base == inf:
+                        continue
+                    for k in range(offsets[node], offsets[node + 1]):
+                        neighbor = targets[k]
+                        new_distance = base + weights[k]
+                        relaxed += 1
+                        if new_distance < distances[neighbor]:
+                            distances[neighbor] = new_distance
+                            parent[neighbor] = node
+                            changed = neighbor
+                            yield Op.UPDATE_DISTANCE, neighbor, node, new_distance
+                if changed == NO_NODE:
+                    return
+            yield from self._cycle_steps(parent, changed)
+        finally:
+            self._count('rounds', rounds)
+            self._count('edges_relaxed', relaxed)
+
+    def _rounds_numpy(self, np, graph, start):
+        """
+        Mỗi vòng: ứng viên = dist[nguồn] + trọng số trên toàn bộ mảng cung (đã sắp theo
+        đích), lấy min theo từng đích bằng reduceat. Dùng khoảng cách của vòng trước
+        (kiểu Jacobi) nên có thể cần nhiều vòng hơn bản tuần tự, nhưng mỗi vòng là vài
+        phép toán mảng.
+        """
+        num_nodes = graph.num_nodes
+        offsets = np.asarray(memoryview(graph.offsets))
+        sources = np.repeat(np.arange(num_nodes, dtype=np.intp), np.diff(offsets))
+        targets = np.asarray(memoryview(graph.targets)).astype(np.intp)
+        weights = np.asarray(memoryview(graph.weights)).astype(np.float64)
+        # Sắp các cung theo đích để min theo từng đích là một lần reduceat
+        order = np.argsort(targets, kind='stable')
+        sources, targets, weights = sources[order], targets[order], weights[order]
+        heads, group_starts = np.unique(targets, return_index=True)
+
+        distances = np.full(num_nodes, np.inf)
+        parent = np.full(num_nodes, NO_NODE, dtype=np.int32)
+        distances[start] = 0
+        rounds, relaxed = 0, 0
+        try:
+            yield Op.UPDATE_DISTANCE, start, NO_NODE, 0
+            if not len(targets):
+                return
+            changed = NO_NODE
+            for rounds in range(1, num_nodes + 1):
+                yield Op.ROUND, NO_NODE, NO_NODE, rounds
+                candidates = distances[sources] + weights
+                relaxed += len(candidates)
+                best = np.minimum.reduceat(candidates, group_starts)
+                improved = best < distances[heads]
+                if not improved.any():
+                    return
+                nodes = heads[improved]
+                # Cung đạt min đầu tiên của mỗi đích được cải thiện -> cha
+                hit = (candidates == np.repeat(np.where(improved, best, np.nan),
+                                               np.diff(np.append(group_starts, len(targets)))))
+                arcs = np.flatnonzero(hit)
+                _, first = np.unique(targets[arcs], return_index=True)
+                parents = sources[arcs[first]]
+                distances[nodes] = best[improved]
+                parent[nodes] = parents
+                for node, by, value in zip(nodes.tolist(), parents.tolist(),
+                                           best[improved].tolist()):
+                    yield Op.UPDATE_DISTANCE, node, by, value
+                changed = nodes[0]
+            yield from self._cycle_steps(parent, int(changed))
+        finally:
+            self._count('rounds', rounds)
+            self._count('edges_relaxed', relaxed)
+
+    @staticmethod
+    def _cycle_steps(parent, node):
+        """Các cạnh của chu trình âm mà `node` (vừa được giảm ở vòng/lần thứ n) dẫn tới."""
+        # Lùi theo cha num_nodes lần thì chắc chắn đã nằm trên chu trình
+        for _ in range(len(parent)):
+            node = parent[node]
+            if node == NO_NODE:
+                return
+        current = node
+        while True:
+            previous = parent[current]
+            yield Op.NEGATIVE_CYCLE_EDGE, int(previous), int(current)
+            current = previous
+            if current == node:
+                return
+
+    # ------------------------------------------------------------------
+    # Hiển thị
+    # ------------------------------------------------------------------
+    def create_render_state(self, graph, all_steps):
+        state = RenderState(maps=('node_colors', 'edge_colors', 'node_texts',
+                                  'distances', 'parent', 'status'))
+        for node in graph.nodes:
+            state.maps['node_texts'][node] = "∞"
+            state.maps['distances'][node] = float('inf')
+        return state
+
+    def apply_step(self, state, step):
+        action = step[0]
+        if action == 'update_distance':
+            node = step[1]
+            distance = step[2]
+            state.set('node_texts', node, str(distance))
+            state.set('distances', node, distance)
+            state.set('node_colors', node, 'orange')
+            parent = step[3] if len(step) > 3 else None
+            # Cạnh cây đường đi ngắn nhất: bỏ cạnh tới cha cũ, tô cạnh tới cha mới
+            old_parent = state.get('parent', node)
+            if old_parent is not None:
+                state.remove('edge_colors', tuple(sorted((old_parent, node))))
+            if parent is not None:
+                state.set('parent', node, parent)
+                state.set('edge_colors', tuple(sorted((parent, node))), 'red')
+
+        elif action == 'visit':
+            state.set('node_colors', step[1], 'lightgreen')
+
+        elif action == 'round':
+            state.set('status', 'round', step[1])
+
+        elif action == 'negative_cycle_edge':
+            state.set('status', 'negative_cycle', True)
+            state.set('edge_colors', tuple(sorted((step[1], step[2]))), 'purple')
+            state.set('node_colors', step[2], 'violet')
+
+    def draw_state(self, canvas, graph, state):
+        scene = self.scene_for(canvas, graph)
+        changed = scene.sync(state, node_fill='node_colors', edge_fill='edge_colors',
+                             node_text='node_texts',
+                             text_format=lambda node, dist_text: f"{node}\n{dist_text}")
+
+        canvas_height = 600
+        if changed is None or 'status' in changed:
+            status = state.maps['status']
+            status_text = f"Round: {status.get('round', '-')}"
+            if status.get('negative_cycle'):
+                status_text += "  — phát hiện chu trình âm!"
+            scene.set_info('status', 20, canvas_height-120, status_text, fill="blue")
+        if changed is None or 'distances' in changed:
+            distances = state.maps['distances']
+            dist_text = "Distances: " + ", ".join(
+                [f"{n}={distances[n] if distances[n] != float('inf') else '∞'}" for n in sorted(distances)])
+            scene.set_info('distances', 20, canvas_height-150, dist_text, fill="purple")
+        if changed is None or 'parent' in changed:
+            parent_text = "Parent: " + ", ".join(
+                [f"{child}←{par}" for child, par in state.maps['parent'].items()])
+            scene.set_info('parent', 20, canvas_height-180, parent_text, fill="brown")
+
+    # noinspection PyMethodMayBeStatic
+    def _create_scene(self, canvas, graph):
+        """Vẽ đồ thị có trọng số"""
+        return CanvasScene(canvas, graph, graph.nodes, graph.weighted_edges, weighted=True)
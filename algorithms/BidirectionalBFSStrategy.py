@@ -0,0 +1,73 @@
+from array import array
+
+from .BidirectionalDijkstraStrategy import BidirectionalDijkstraStrategy, bidirectional_path_steps
+from .StepTrace import Op, NO_NODE
+from ui.CanvasScene import CanvasScene
+
+
+class BidirectionalBFSStrategy(BidirectionalDijkstraStrategy):
+    """
+    BFS hai chiều trên bản không trọng số: mỗi lượt mở rộng trọn một tầng của
+    phía có frontier nhỏ hơn; hai phía gặp nhau thì lấy cặp tốt nhất trong tầng
+    đó rồi dừng (đường ít cạnh nhất).
+
+    Cùng loại bước và cách hiển thị với Dijkstra hai chiều, giá trị là số cạnh.
+    """
+
+    def _search(self, graph, start, goal):
+        num_nodes = graph.num_nodes
+        reverse_offsets, reverse_sources, reverse_arcs = graph.reverse_arcs()
+        # Chỉ số 0: phía xuôi (từ start), 1: phía ngược (từ đích); -1: chưa gặp
+        depths = (array('i', [-1]) * num_nodes, array('i', [-1]) * num_nodes)
+        parents = (array('i', [NO_NODE]) * num_nodes, array('i', [NO_NODE]) * num_nodes)
+        frontiers = ([start], [goal])
+        visit_ops = (Op.VISIT, Op.VISIT_REVERSE)
+        update_ops = (Op.UPDATE_DISTANCE, Op.UPDATE_DISTANCE_REVERSE)
+        best, meet = None, (NO_NODE, NO_NODE)
+
+        depths[0][start] = depths[1][goal] = 0
+        scanned = 0
+        try:
+            yield Op.UPDATE_DISTANCE, start, NO_NODE, 0
+            yield Op.UPDATE_DISTANCE_REVERSE, goal, NO_NODE, 0
+            if start == goal:
+                return
+            while frontiers[0] and frontiers[1] and best is None:
+                side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+                mine, other = depths[side], depths[1 - side]
+                next_frontier = []
+                for node in frontiers[side]:
+                    yield visit_ops[side], node
+                    if side == 0:
+                        neighbors = graph.unweighted_neighbors(node)
+                    else:
+                        neighbors = [reverse_sources[p]
+                                     for p in range(reverse_offsets[node], reverse_offsets[node + 1])
+                                     if graph.is_unweighted_arc(reverse_arcs[p])]
+                    scanned += len(neighbors)
+                    for neighbor in neighbors:
+                        if other[neighbor] >= 0:
+                            through = mine[node] + 1 + other[neighbor]
+                            if best is None or through < best:
+                                best = through
+                                meet = (node, neighbor) if side == 0 else (neighbor, node)
+                        if mine[neighbor] >= 0:
+                            continue
+                        mine[neighbor] = mine[node] + 1
+                        parents[side][neighbor] = node
+                        next_frontier.append(neighbor)
+                        if side == 0:
+                            yield Op.EXPLORE, node, neighbor
+                        else:
+                            yield Op.EXPLORE, neighbor, node
+                        yield update_ops[side], neighbor, node, mine[neighbor]
+                frontiers[side][:] = next_frontier
+
+            if best is not None:
+                yield from bidirectional_path_steps(parents, start, goal, *meet)
+        finally:
+            self._count('edges_scanned', scanned)
+
+    # noinspection PyMethodMayBeStatic
+    def _create_scene(self, canvas, graph):
+        return CanvasScene(canvas, graph, graph.nodes, graph.unweighted_edges)
@@ -0,0 +1,161 @@
+from array import array
+
+from core.PriorityQueue import create_priority_queue
+from .IBaseAlgorithmStrategy import IBaseAlgorithmStrategy
+from .RenderState import RenderState
+from .StepTrace import Op, NO_NODE
+from ui.CanvasScene import CanvasScene
+
+
+class BidirectionalDijkstraStrategy(IBaseAlgorithmStrategy):
+    """
+    Dijkstra hai chiều: một lượt tìm từ start theo chiều cung, một lượt từ đích theo
+    chiều ngược (Graph.reverse_arcs), mỗi lần lấy ra từ phía có khóa nhỏ hơn.
+    mu là độ dài đường tốt nhất đã thấy qua một cung nối hai phía; dừng khi
+    khóa nhỏ nhất của hai hàng đợi cộng lại >= mu.
+
+    Bước của phía xuôi giống Dijkstra ('update_distance', 'visit', 'explore'),
+    phía ngược dùng 'update_distance_reverse' / 'visit_reverse'; cuối cùng là
+    các 'path_edge' của đường đi từ start tới đích.
+    """
+
+    def iter_steps(self, graph, start_node, target=None):
+        if target is None:
+            target = graph.default_target_node(start_node)
+        return self._search(graph, graph.index_of(start_node), graph.index_of(target))
+
+    def _search(self, graph, start, goal):
+        num_nodes = graph.num_nodes
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        reverse_offsets, reverse_sources, reverse_arcs = graph.reverse_arcs()
+        inf = float('inf')
+        # Chỉ số 0: phía xuôi (từ start), 1: phía ngược (từ đích)
+        distances = ([inf] * num_nodes, [inf] * num_nodes)
+        parents = (array('i', [NO_NODE]) * num_nodes, array('i', [NO_NODE]) * num_nodes)
+        settled = (bytearray(num_nodes), bytearray(num_nodes))
+        queues = (create_priority_queue('binary', num_nodes),
+                  create_priority_queue('binary', num_nodes))
+        visit_ops = (Op.VISIT, Op.VISIT_REVERSE)
+        update_ops = (Op.UPDATE_DISTANCE, Op.UPDATE_DISTANCE_REVERSE)
+        best, meet = inf, (NO_NODE, NO_NODE)
+
+        distances[0][start] = distances[1][goal] = 0
+        queues[0].push(start, 0)
+        queues[1].push(goal, 0)
+        pops, relaxed = 0, 0
+        try:
+            yield Op.UPDATE_DISTANCE, start, NO_NODE, 0
+            yield Op.UPDATE_DISTANCE_REVERSE, goal, NO_NODE, 0
+            if start == goal:
+                return
+            forward_queue, backward_queue = queues
+            while forward_queue and backward_queue:
+                forward_key, backward_key = forward_queue.peek()[0], backward_queue.peek()[0]
+                if forward_key + backward_key >= best:
+                    break
+                side = 0 if forward_key <= backward_key else 1
+                distance, node = queues[side].pop()
+                pops += 1
+                settled[side][node] = 1
+                yield visit_ops[side], node
+
+                mine, other = distances[side], distances[1 - side]
+                if side == 0:
+                    arcs = ((targets[k], k) for k in range(offsets[node], offsets[node + 1]))
+                else:
+                    arcs = ((reverse_sources[p], reverse_arcs[p])
+                            for p in range(reverse_offsets[node], reverse_offsets[node + 1]))
+                for neighbor, k in arcs:
+                    new_distance = distance + weights[k]
+                    # Cung (node, neighbor) nối hai phía: cập nhật đường tốt nhất
+                    through = new_distance + other[neighbor]
+                    if through < best:
+                        best = through
+                        meet = (node, neighbor) if side == 0 else (neighbor, node)
+                    if settled[side][neighbor]:
+                        continue
+                    if side == 0:
+                        yield Op.EXPLORE, node, neighbor
+                    else:
+                        yield Op.EXPLORE, neighbor, node
+                    relaxed += 1
+                    if new_distance < mine[neighbor]:
+                        mine[neighbor] = new_distance
+                        parents[side][neighbor] = node
+                        queues[side].push(neighbor, new_distance)
+                        yield update_ops[side], neighbor, node, new_distance
+
+            if best < inf:
+                yield from bidirectional_path_steps(parents, start, goal, *meet)
+        finally:
+            self._count('heap_pop', pops)
+            self._count('edges_relaxed', relaxed)
+
+    # ------------------------------------------------------------------
+    # Hiển thị: phía xuôi cam -> xanh lá, phía ngược xanh nhạt -> xanh dương
+    # ------------------------------------------------------------------
+    def create_render_state(self, graph, all_steps):
+        return RenderState(maps=('node_colors', 'edge_colors', 'node_texts',
+                                 'forward', 'backward', 'path'))
+
+    def apply_step(self, state, step):
+        action = step[0]
+        if action == 'update_distance':
+            state.set('node_texts', step[1], f"→{step[2]}")
+            if not state.has('forward', step[1]):
+                state.set('node_colors', step[1], 'orange')
+        elif action == 'update_distance_reverse':
+            state.set('node_texts', step[1], f"←{step[2]}")
+            if not state.has('backward', step[1]):
+                state.set('node_colors', step[1], 'lightblue')
+        elif action == 'visit':
+            state.add('forward', step[1])
+            state.set('node_colors', step[1], 'lightgreen')
+        elif action == 'visit_reverse':
+            state.add('backward', step[1])
+            state.set('node_colors', step[1], 'deepskyblue')
+        elif action == 'explore':
+            state.set('edge_colors', tuple(sorted((step[1], step[2]))), 'red')
+        elif action == 'path_edge':
+            state.add('path', step[2])
+            state.set('edge_colors', tuple(sorted((step[1], step[2]))), 'blue')
+            state.set('node_colors', step[1], 'gold')
+            state.set('node_colors', step[2], 'gold')
+
+    def draw_state(self, canvas, graph, state):
+        scene = self.scene_for(canvas, graph)
+        changed = scene.sync(state, node_fill='node_colors', edge_fill='edge_colors',
+                             node_text='node_texts',
+                             text_format=lambda node, text: f"{node}\n{text}")
+
+        canvas_height = 600
+        if changed is None or 'forward' in changed or 'backward' in changed:
+            frontier_text = (f"Xuôi (từ start): {len(state.maps['forward'])} nút  |  "
+                             f"Ngược (từ đích): {len(state.maps['backward'])} nút")
+            scene.set_info('frontiers', 20, canvas_height-120, frontier_text, fill="blue")
+        if changed is None or 'path' in changed:
+            path_text = f"Đường đi: {len(state.maps['path'])} cạnh" if state.maps['path'] else ""
+            scene.set_info('path', 20, canvas_height-150, path_text, fill="purple")
+
+    # noinspection PyMethodMayBeStatic
+    def _create_scene(self, canvas, graph):
+        """Vẽ đồ thị có trọng số"""
+        return CanvasScene(canvas, graph, graph.nodes, graph.weighted_edges, weighted=True)
+
+
+def bidirectional_path_steps(parents, start, goal, forward_end, backward_start):
+    """
+    'path_edge' theo thứ tự start -> goal: lần cha phía xuôi từ forward_end về start,
+    cung nối (forward_end, backward_start), rồi lần cha phía ngược từ backward_start tới goal.
+    """
+    forward_parent, backward_parent = parents
+    path = [forward_end]
+    while path[-1] != start:
+        path.append(forward_parent[path[-1]])
+    path.reverse()
+    if backward_start != forward_end:
+        path.append(backward_start)
+    while path[-1] != goal:
+        path.append(backward_parent[path[-1]])
+    for a, b in zip(path, path[1:]):
+        yield Op.PATH_EDGE, a, b
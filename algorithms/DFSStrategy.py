@@ -1,119 +1,150 @@
+from array import array
+
 from algorithms.IBaseAlgorithmStrategy import IBaseAlgorithmStrategy
-from collections import deque
+from algorithms.RenderState import RenderState
+from algorithms.StepTrace import Op
+from ui.CanvasScene import CanvasScene
 
 class DFSStrategy(IBaseAlgorithmStrategy):
-    def run(self,graph,start_node):
-        steps = []
-        visited = set()
-        self._dfs_recursive(graph, start_node, visited, steps)
-        return steps
-
-    def _dfs_recursive(self, graph, current_node, visited, steps):
-        # 1. Đánh dấu nút là đã thăm (visit)
-        visited.add(current_node)
-        # Thêm bước 'visit' (sẽ được tô màu cam)
-        steps.append(('visit', current_node))
-
-        # 2. Khám phá (explore) các hàng xóm
-        for neighbor in graph.unweighted_edges.get(current_node, []):
-            if neighbor not in visited:
+    def iter_steps(self, graph, start_node):
+        """
+        DFS dùng ngăn xếp tường minh (không đệ quy) nên không vướng giới hạn
+        đệ quy của Python. Thứ tự các bước visit/explore/process giống hệt bản
+        đệ quy. Thời điểm khám phá/kết thúc của mỗi nút được ghi vào
+        self.discovery_time / self.finish_time (-1 nếu nút chưa tới được);
+        khi trace lấy từ TraceCache thì chúng được dựng lại từ trace.
+        """
+        num_nodes = graph.num_nodes
+        offsets, targets = graph.offsets, graph.targets
+        mask = graph.unweighted_mask
+        visited = bytearray(num_nodes)
+        self.discovery_time = discovery = array('q', [-1]) * num_nodes
+        self.finish_time = finish = array('q', [-1]) * num_nodes
+        clock = 0
+
+        # Bộ đếm cho profiler (chỉ báo cáo khi đang bật)
+        pushes, pops, scanned = 1, 0, 0
+        try:
+            # 1. Đánh dấu nút bắt đầu là đã thăm (visit)
+            start = graph.index_of(start_node)
+            visited[start] = 1
+            discovery[start] = clock
+            clock += 1
+            # Thêm bước 'visit' (sẽ được tô màu cam)
+            yield Op.VISIT, start
+
+            # Mỗi phần tử ngăn xếp: nút và vị trí cung kế tiếp cần xét của nút đó
+            stack_nodes = [start]
+            stack_positions = [offsets[start]]
+            while stack_nodes:
+                current_node = stack_nodes[-1]
+                position = stack_positions[-1]
+                end = offsets[current_node + 1]
+
+                # 2. Khám phá (explore) hàng xóm chưa thăm kế tiếp
+                while position < end:
+                    neighbor = targets[position]
+                    position += 1
+                    if (mask is None or mask[position - 1]) and not visited[neighbor]:
+                        break
+                else:
+                    # 3. Đã thăm xong tất cả các nhánh con,
+                    #    đánh dấu nút này là đã xử lý xong (process)
+                    stack_nodes.pop()
+                    stack_positions.pop()
+                    pops += 1
+                    scanned += end - offsets[current_node]
+                    finish[current_node] = clock
+                    clock += 1
+                    # Thêm bước 'process' (sẽ được tô màu xám)
+                    yield Op.PROCESS, current_node
+                    continue
+
+                stack_positions[-1] = position
                 # Thêm bước 'explore' (cạnh sẽ được tô màu đỏ)
-                steps.append(('explore', current_node, neighbor))
-                # Gọi đệ quy
-                self._dfs_recursive(graph, neighbor, visited, steps)
-
-        # 3. Sau khi đã thăm xong tất cả các nhánh con,
-        #    đánh dấu nút này là đã xử lý xong (process)
-        # Thêm bước 'process' (sẽ được tô màu xám)
-        steps.append(('process', current_node))
-
-    def render_step(self, canvas, graph, all_steps, index):
-        # 1. Vẽ đồ thị cơ sở (màu xám)
-        node_ui, edge_ui, text_ui = self._draw_base_graph(canvas, graph)
-
-        # 2. Tính toán trạng thái màu sắc TÍCH LŨY đến bước 'index'
-        node_colors = {}
-        edge_colors = {}
-        visited = set()
-        stack = []
-
-        for i in range(index + 1):
-            step = all_steps[i]
-            action = step[0]
-
-            # 3. ĐƯA CÁC BƯỚC LOGIC CỦA DFS RA MÀU
-            if action == 'visit':
-                # ('visit', node)
-                node = step[1]
-                node_colors[node] = 'orange'  # DFS 'visit' -> màu cam
-                visited.add(node)
-                stack.append(node)
-
-            elif action == 'process':
-                # ('process', node)
-                node = step[1]
-                node_colors[node] = 'gray'  # DFS 'process' -> màu xám
-
-                if stack and stack[-1] == node:
-                    stack.pop()
-
-            elif action == 'explore':
-                # ('explore', from_node, to_node)
-                edge_key = tuple(sorted((step[1], step[2])))
-                edge_colors[edge_key] = 'red'  # DFS 'explore' -> màu đỏ
-
-        # 4. Áp dụng các màu đã tính toán lên canvas
-        for node, color in node_colors.items():
-            if node in node_ui:
-                canvas.itemconfig(node_ui[node], fill=color)
-
-        for edge_key, color in edge_colors.items():
-            if edge_key in edge_ui:
-                canvas.itemconfig(edge_ui[edge_key], fill=color, width=3)
-
-        canvas.delete("info_text")
-
-        visited_text = "Visited: " + ", ".join(sorted(visited))
-        stack_text = "Stack: " + " → ".join(stack)  # hiển thị theo thứ tự push
-
-        canvas.create_text(
-            20, 20, anchor="w", text=visited_text,
-            font=("Helvetica", 14, "bold"), fill="blue", tags="info_text"
-        )
-        canvas.create_text(
-            20, 50, anchor="w", text=stack_text,
-            font=("Helvetica", 14, "bold"), fill="purple", tags="info_text"
-        )
+                yield Op.EXPLORE, current_node, neighbor
+                visited[neighbor] = 1
+                discovery[neighbor] = clock
+                clock += 1
+                yield Op.VISIT, neighbor
+                # Thay cho lời gọi đệ quy
+                stack_nodes.append(neighbor)
+                stack_positions.append(offsets[neighbor])
+                pushes += 1
+        finally:
+            self._count('stack_push', pushes)
+            self._count('stack_pop', pops)
+            self._count('edges_scanned', scanned)
+
+    def _cached_trace(self, cache, graph, start_node, options):
+        trace = super()._cached_trace(cache, graph, start_node, options)
+        if trace is not None:
+            self.discovery_time, self.finish_time = self.timestamps(graph, trace)
+        return trace
+
+    @staticmethod
+    def timestamps(graph, trace):
+        """
+        (discovery_time, finish_time) đọc lại từ trace đủ bước: đồng hồ tăng một
+        ở mỗi bước visit và process, giống lúc chạy iter_steps.
+        """
+        discovery = array('q', [-1]) * graph.num_nodes
+        finish = array('q', [-1]) * graph.num_nodes
+        visit, process = Op.VISIT, Op.PROCESS
+        clock = 0
+        for index in range(len(trace)):
+            op, node, _, _ = trace.raw(index)
+            if op == visit:
+                discovery[node] = clock
+            elif op == process:
+                finish[node] = clock
+            else:
+                continue
+            clock += 1
+        return discovery, finish
+
+    def create_render_state(self, graph, all_steps):
+        return RenderState(maps=('node_colors', 'edge_colors', 'visited'),
+                           sequences=('stack',))
+
+    def apply_step(self, state, step):
+        action = step[0]
+
+        # ĐƯA CÁC BƯỚC LOGIC CỦA DFS RA MÀU
+        if action == 'visit':
+            # ('visit', node)
+            node = step[1]
+            state.set('node_colors', node, 'orange')  # DFS 'visit' -> màu cam
+            state.add('visited', node)
+            state.push('stack', node)
+
+        elif action == 'process':
+            # ('process', node)
+            node = step[1]
+            state.set('node_colors', node, 'gray')  # DFS 'process' -> màu xám
+
+            stack = state.seqs['stack']
+            if stack and stack[-1] == node:
+                state.pop('stack')
+
+        elif action == 'explore':
+            # ('explore', from_node, to_node)
+            edge_key = tuple(sorted((step[1], step[2])))
+            state.set('edge_colors', edge_key, 'red')  # DFS 'explore' -> màu đỏ
+
+    def draw_state(self, canvas, graph, state):
+        # 1. Cảnh vẽ được tạo một lần; chỉ cập nhật các nút/cạnh đổi màu
+        scene = self.scene_for(canvas, graph)
+        changed = scene.sync(state, node_fill='node_colors', edge_fill='edge_colors')
+
+        # 2. Dòng thông tin chỉ tính lại khi dữ liệu liên quan thay đổi
+        if changed is None or 'visited' in changed:
+            visited_text = "Visited: " + ", ".join(sorted(state.maps['visited']))
+            scene.set_info('visited', 20, 20, visited_text, fill="blue")
+        if changed is None or 'stack' in changed:
+            stack_text = "Stack: " + " → ".join(state.seqs['stack'])  # hiển thị theo thứ tự push
+            scene.set_info('stack', 20, 50, stack_text, fill="purple")
 
     # noinspection PyMethodMayBeStatic
-    def _draw_base_graph(self, canvas, graph):
-        canvas.delete("all")
-        node_ui = {}
-        edge_ui = {}
-        text_ui = {}
-        node_radius = 20
-        default_color = 'lightgray'
-
-        for node, neighbors in graph.unweighted_edges.items():
-            x1, y1 = graph.nodes[node]
-            for neighbor in neighbors:
-                key = tuple(sorted((node, neighbor)))
-                if key not in edge_ui:
-                    x2, y2 = graph.nodes[neighbor]
-                    edge_id = canvas.create_line(
-                        x1, y1, x2, y2, fill=default_color, width=2
-                    )
-                    edge_ui[key] = edge_id
-
-        for node, (x, y) in graph.nodes.items():
-            oval_id = canvas.create_oval(
-                x - node_radius, y - node_radius,
-                x + node_radius, y + node_radius,
-                fill=default_color, outline='black', width=2
-            )
-            text_id = canvas.create_text(x, y, text=node,
-                                         font=('Arial', 12, 'bold'))
-            node_ui[node] = oval_id
-            text_ui[node] = text_id
-
-        return node_ui, edge_ui, text_ui
\ No newline at end of file
+    def _create_scene(self, canvas, graph):
+        return CanvasScene(canvas, graph, graph.nodes, graph.unweighted_edges)
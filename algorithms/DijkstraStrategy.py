@@ -1,145 +1,135 @@
 from .IBaseAlgorithmStrategy import IBaseAlgorithmStrategy
-import heapq
+from .RenderState import RenderState
+from .StepTrace import Op, NO_NODE
+from ui.CanvasScene import CanvasScene
+from core.PriorityQueue import create_priority_queue
+from array import array
 
 class DijkstraStrategy(IBaseAlgorithmStrategy):
-    def run(self, graph, start_node):
-        steps = []
-        distances = {node: float('inf') for node in graph.dijkstra_nodes}
-        parent = {}
-        pq = []
-        visited = set()
-        distances[start_node] = 0
-        heapq.heappush(pq, (0, start_node))
-        steps.append(('update_distance', start_node, 0, None))
-
-        while pq:
-            current_distance, current_node = heapq.heappop(pq)
-            if current_distance > distances[current_node]:
-                continue
-            if current_node in visited:
-                continue
-            visited.add(current_node)
-            steps.append(('visit', current_node))
-
-            for neighbor, weight in graph.dijkstra_weighted_edges.get(current_node, {}).items():
-                if neighbor not in visited:
-                    steps.append(('explore', current_node, neighbor))
-                    new_distance = current_distance + weight
-                    if new_distance < distances[neighbor]:
-                        distances[neighbor] = new_distance
-                        parent[neighbor] = current_node
-                        heapq.heappush(pq, (new_distance, neighbor))
-                        steps.append(('update_distance', neighbor, new_distance, current_node))
-        return steps
-
-    def render_step(self, canvas, graph, all_steps, index):
-        node_ui, edge_ui, text_ui = self._draw_base_graph(canvas, graph)
-
-        node_colors = {}
-        edge_colors = {}
-        node_texts = {node: "∞" for node in graph.nodes}
-        visited = set()
-        pq = []
-        distances = {node: float('inf') for node in graph.nodes}
-        parent = {}
-
-        for i in range(index + 1):
-            step = all_steps[i]
-            action = step[0]
-            if action == 'update_distance':
-                node = step[1]
-                distance = step[2]
-                node_texts[node] = str(distance)
-                distances[node] = distance
-                pq.append((distance, node))
-
-                if len(step) > 3: # có parent
-                    parent[node] = step[3]
-
-                if node not in node_colors or node_colors[node] != 'lightgreen':
-                    node_colors[node] = 'orange'
-
-            elif action == 'visit':
-                node = step[1]
-                node_colors[node] = 'lightgreen'
-                visited.add(node)
-                pq = [(d, n) for (d, n) in pq if n != node]
-            elif action == 'explore':
-                # (step[1], step[2]) == from_node, to_node
-                edge_key = tuple(sorted((step[1], step[2])))
-                edge_colors[edge_key] = 'red'
-
-        # Áp dụng màu và text
-        for node, color in node_colors.items():
-            if node in node_ui:
-                canvas.itemconfig(node_ui[node], fill=color)
-        for edge_key, color in edge_colors.items():
-            if edge_key in edge_ui:
-                canvas.itemconfig(edge_ui[edge_key], fill=color, width=3)
-        for node, dist_text in node_texts.items():
-            if node in text_ui:
-                canvas.itemconfig(text_ui[node], text=f"{node}\n{dist_text}")
-
-        canvas.delete("info_text")
-
-        visited_text = "Visited: " + ", ".join(sorted(visited))
-        pq_text = "Priority Queue: " + ", ".join([f"{n}({d})" for d, n in sorted(pq)])
-        dist_text = "Distances: " + ", ".join(
-            [f"{n}={distances[n] if distances[n] != float('inf') else '∞'}" for n in sorted(distances)])
-        parent_text = "Parent: " + ", ".join([f"{child}←{par}" for child, par in parent.items()])
+    def __init__(self, queue_kind='binary'):
+        # Loại hàng đợi ưu tiên mặc định: 'binary', 'bucket' hoặc 'pairing'
+        self.queue_kind = queue_kind
+
+    def cache_options(self, graph):
+        return {'queue_kind': self.queue_kind}
+
+    def _create_queue(self, graph, queue_kind=None):
+        """Hàng đợi ưu tiên có decrease-key; 'bucket' cần trọng số nguyên không âm."""
+        kind = queue_kind or self.queue_kind
+        max_weight = None
+        if kind == 'bucket':
+            if not graph.has_integer_weights:
+                raise ValueError("Hàng đợi 'bucket' chỉ dùng được với trọng số nguyên")
+            max_weight = max(graph.weights, default=0)
+        return create_priority_queue(kind, graph.num_nodes, max_weight)
+
+    def iter_steps(self, graph, start_node, queue_kind=None):
+        num_nodes = graph.num_nodes
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        inf = float('inf')
+        distances = [inf] * num_nodes
+        parent = array('i', [NO_NODE]) * num_nodes
+        # Mỗi nút có tối đa một mục trong hàng đợi (giảm khóa thay vì đẩy thêm)
+        pq = self._create_queue(graph, queue_kind)
+        visited = bytearray(num_nodes)
+        start = graph.index_of(start_node)
+        distances[start] = 0
+        pq.push(start, 0)
+        # Bộ đếm cho profiler (chỉ báo cáo khi đang bật)
+        pushes, pops, decreases, relaxed = 1, 0, 0, 0
+        try:
+            yield Op.UPDATE_DISTANCE, start, NO_NODE, 0
+
+            while pq:
+                current_distance, current_node = pq.pop()
+                pops += 1
+                visited[current_node] = 1
+                yield Op.VISIT, current_node
+
+                for k in range(offsets[current_node], offsets[current_node + 1]):
+                    neighbor = targets[k]
+                    if not visited[neighbor]:
+                        yield Op.EXPLORE, current_node, neighbor
+                        new_distance = current_distance + weights[k]
+                        relaxed += 1
+                        if new_distance < distances[neighbor]:
+                            if distances[neighbor] == inf:
+                                pushes += 1
+                            else:
+                                decreases += 1
+                            distances[neighbor] = new_distance
+                            parent[neighbor] = current_node
+                            pq.push(neighbor, new_distance)
+                            yield Op.UPDATE_DISTANCE, neighbor, current_node, new_distance
+        finally:
+            self._count('heap_push', pushes)
+            self._count('heap_pop', pops)
+            self._count('decrease_key', decreases)
+            self._count('edges_relaxed', relaxed)
+
+    def create_render_state(self, graph, all_steps):
+        state = RenderState(maps=('node_colors', 'edge_colors', 'node_texts',
+                                  'visited', 'distances', 'parent'),
+                            queues={'pq': self._create_queue(graph)},
+                            labels=graph.labels)
+        for node in graph.nodes:
+            state.maps['node_texts'][node] = "∞"
+            state.maps['distances'][node] = float('inf')
+        return state
+
+    def apply_step(self, state, step):
+        action = step[0]
+        if action == 'update_distance':
+            node = step[1]
+            distance = step[2]
+            state.set('node_texts', node, str(distance))
+            state.set('distances', node, distance)
+            state.queue_push('pq', state.labels.id_of(node), distance)
+
+            if len(step) > 3: # có parent
+                state.set('parent', node, step[3])
+
+            if state.get('node_colors', node) != 'lightgreen':
+                state.set('node_colors', node, 'orange')
+
+        elif action == 'visit':
+            node = step[1]
+            state.set('node_colors', node, 'lightgreen')
+            state.add('visited', node)
+            state.queue_remove('pq', state.labels.id_of(node))
+        elif action == 'explore':
+            # (step[1], step[2]) == from_node, to_node
+            edge_key = tuple(sorted((step[1], step[2])))
+            state.set('edge_colors', edge_key, 'red')
+
+    def draw_state(self, canvas, graph, state):
+        # Áp dụng màu và text (chỉ những nút/cạnh thay đổi)
+        scene = self.scene_for(canvas, graph)
+        changed = scene.sync(state, node_fill='node_colors', edge_fill='edge_colors',
+                             node_text='node_texts',
+                             text_format=lambda node, dist_text: f"{node}\n{dist_text}")
 
         canvas_height = 600
-        canvas.create_text(20, canvas_height-120, anchor="w", text=visited_text,
-                           font=("Helvetica", 14, "bold"), fill="blue", tags="info_text")
-        canvas.create_text(20, canvas_height-150, anchor="w", text=pq_text,
-                           font=("Helvetica", 14, "bold"), fill="green", tags="info_text")
-        canvas.create_text(20, canvas_height-180, anchor="w", text=dist_text,
-                           font=("Helvetica", 14, "bold"), fill="purple", tags="info_text")
-        canvas.create_text(20, canvas_height-210, anchor="w", text=parent_text,
-                           font=("Helvetica", 14, "bold"), fill="brown", tags="info_text")
-
-    def _draw_base_graph(self, canvas, graph):
+        if changed is None or 'visited' in changed:
+            visited_text = "Visited: " + ", ".join(sorted(state.maps['visited']))
+            scene.set_info('visited', 20, canvas_height-120, visited_text, fill="blue")
+        if changed is None or 'pq' in changed:
+            labels = state.labels
+            pq_text = "Priority Queue: " + ", ".join(
+                [f"{labels[n]}({d})" for d, n in state.queues['pq'].sorted_items()])
+            scene.set_info('pq', 20, canvas_height-150, pq_text, fill="green")
+        if changed is None or 'distances' in changed:
+            distances = state.maps['distances']
+            dist_text = "Distances: " + ", ".join(
+                [f"{n}={distances[n] if distances[n] != float('inf') else '∞'}" for n in sorted(distances)])
+            scene.set_info('distances', 20, canvas_height-180, dist_text, fill="purple")
+        if changed is None or 'parent' in changed:
+            parent_text = "Parent: " + ", ".join(
+                [f"{child}←{par}" for child, par in state.maps['parent'].items()])
+            scene.set_info('parent', 20, canvas_height-210, parent_text, fill="brown")
+
+    # noinspection PyMethodMayBeStatic
+    def _create_scene(self, canvas, graph):
         """Vẽ đồ thị có trọng số"""
-        canvas.delete("all")
-        node_ui = {}
-        edge_ui = {}
-        text_ui = {}
-        node_radius = 20
-        default_color = 'lightgray'
-
-        for node, neighbors in graph.dijkstra_weighted_edges.items():
-            x1, y1 = graph.dijkstra_nodes[node]
-            # 'neighbors' là một dict: {'B': 10, 'C': 3}
-            for neighbor, weight in neighbors.items():
-                key = tuple(sorted((node, neighbor)))
-                if key not in edge_ui:
-                    x2, y2 = graph.dijkstra_nodes[neighbor]
-                    edge_id = canvas.create_line(
-                        x1, y1, x2, y2, fill=default_color, width=2
-                    )
-                    edge_ui[key] = edge_id
-
-                    # Vẽ trọng số (weight) ở giữa cạnh
-                    mid_x = (x1 + x2) / 2
-                    mid_y = (y1 + y2) / 2
-                    canvas.create_text(
-                        mid_x, mid_y,
-                        text=str(weight),
-                        font=('Arial', 10, 'bold'),
-                        fill='blue'
-                    )
-
-        # Vẽ các nút (Nodes)
-        for node, (x, y) in graph.dijkstra_nodes.items():
-            oval_id = canvas.create_oval(
-                x - node_radius, y - node_radius,
-                x + node_radius, y + node_radius,
-                fill=default_color, outline='black', width=2
-            )
-            # Text sẽ được cập nhật bởi hàm render_step
-            text_id = canvas.create_text(x, y, text=node,
-                                         font=('Arial', 12, 'bold'))
-            node_ui[node] = oval_id
-            text_ui[node] = text_id
-
-        return node_ui, edge_ui, text_ui
\ No newline at end of file
+        return CanvasScene(canvas, graph, graph.dijkstra_nodes,
+                           graph.dijkstra_weighted_edges, weighted=True)
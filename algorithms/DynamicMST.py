@@ -0,0 +1,172 @@
+from collections import deque
+
+from core.DisjointSet import DisjointSet
+from .StepTrace import Op, StepTrace
+
+
+class DynamicMST:
+    """
+    Cây khung nhỏ nhất (rừng khung nếu đồ thị không liên thông) của một DynamicGraph
+    vô hướng, được sửa dần sau mỗi thay đổi thay vì chạy lại Prim/Kruskal:
+
+    - thêm cạnh (hoặc giảm trọng số cạnh ngoài cây): cạnh mới tạo chu trình với đường
+      đi trên cây; bỏ cạnh nặng nhất của chu trình nếu nó nặng hơn cạnh mới.
+    - xóa cạnh cây (hoặc tăng trọng số cạnh cây): cây tách đôi; tìm cạnh nhẹ nhất
+      nối hai nửa, chỉ duyệt cạnh của nửa nhỏ hơn.
+
+    Trace `steps` chỉ gồm các bước sửa chữa: ('test_edge', u, v) cạnh đang xét,
+    ('add_edge_to_mst', u, v) và ('discard_edge', u, v) (cạnh bị loại hoặc rời cây).
+    Mỗi thao tác trả về lát cắt các bước của riêng nó.
+    """
+
+    def __init__(self, dynamic_graph):
+        if dynamic_graph.directed:
+            raise ValueError("Cây khung nhỏ nhất chỉ định nghĩa cho đồ thị vô hướng")
+        self.graph = dynamic_graph
+        num_nodes = dynamic_graph.num_nodes
+        # Danh sách kề của cây: id nút -> {id nút kề: trọng số}
+        self._tree = [{} for _ in range(num_nodes)]
+        self.total_weight = 0
+        components = DisjointSet(num_nodes)
+        for weight, u, v in sorted((w, u, v) for u, v, w in dynamic_graph.edges()):
+            if components.union(u, v):
+                self._link(u, v, weight)
+        self.steps = StepTrace(dynamic_graph.labels, dynamic_graph.has_integer_weights)
+        dynamic_graph.attach(self)
+
+    def tree_edges(self):
+        """Các cạnh (nhãn u, nhãn v, trọng số) của cây hiện tại, u < v theo id."""
+        labels = self.graph.labels
+        return [(labels[u], labels[v], weight)
+                for u, neighbors in enumerate(self._tree)
+                for v, weight in neighbors.items() if u < v]
+
+    def tree_steps(self):
+        """Trace dựng lại cây hiện tại (mỗi cạnh một 'add_edge_to_mst'), dùng làm trạng thái đầu để vẽ."""
+        trace = StepTrace(self.graph.labels, self.graph.has_integer_weights)
+        for u, neighbors in enumerate(self._tree):
+            for v in neighbors:
+                if u < v:
+                    trace.push(Op.ADD_EDGE_TO_MST, u, v)
+        return trace
+
+    # ------------------------------------------------------------------
+    # Gọi bởi DynamicGraph
+    # ------------------------------------------------------------------
+    def on_add(self, u, v, weight):
+        start = len(self.steps)
+        self._insert(u, v, weight)
+        return self.steps[start:]
+
+    def on_remove(self, u, v, weight):
+        start = len(self.steps)
+        if v in self._tree[u]:
+            self._unlink(u, v)
+            self.steps.push(Op.DISCARD_EDGE, u, v)
+            self._reconnect(u, v)
+        return self.steps[start:]
+
+    def on_weight(self, u, v, old, new):
+        start = len(self.steps)
+        self._sync_integral()
+        if v in self._tree[u]:
+            self._unlink(u, v)
+            if new <= old:
+                self._link(u, v, new)  # nhẹ đi: vẫn là cây nhỏ nhất
+            else:
+                self.steps.push(Op.TEST_EDGE, u, v)
+                replacement = self._lightest_crossing(u, v)
+                self._link(*replacement)
+                if replacement[:2] not in ((u, v), (v, u)):
+                    self.steps.push(Op.DISCARD_EDGE, u, v)
+                    self.steps.push(Op.ADD_EDGE_TO_MST, replacement[0], replacement[1])
+        elif new < old:
+            self._insert(u, v, new)
+        return self.steps[start:]
+
+    # ------------------------------------------------------------------
+    # Sửa cây
+    # ------------------------------------------------------------------
+    def _insert(self, u, v, weight):
+        self._sync_integral()
+        self.steps.push(Op.TEST_EDGE, u, v)
+        path = self._tree_path(u, v)
+        if path is None:
+            # Nối hai cây khác nhau của rừng
+            self._link(u, v, weight)
+            self.steps.push(Op.ADD_EDGE_TO_MST, u, v)
+            return
+        heaviest = max(zip(path, path[1:]), key=lambda edge: self._tree[edge[0]][edge[1]])
+        if self._tree[heaviest[0]][heaviest[1]] > weight:
+            self._unlink(*heaviest)
+            self._link(u, v, weight)
+            self.steps.push(Op.DISCARD_EDGE, *heaviest)
+            self.steps.push(Op.ADD_EDGE_TO_MST, u, v)
+        else:
+            self.steps.push(Op.DISCARD_EDGE, u, v)
+
+    def _reconnect(self, u, v):
+        """u, v vừa bị tách: nối lại bằng cạnh nhẹ nhất giữa hai nửa (nếu có)."""
+        replacement = self._lightest_crossing(u, v)
+        if replacement is not None:
+            self._link(*replacement)
+            self.steps.push(Op.ADD_EDGE_TO_MST, replacement[0], replacement[1])
+
+    def _lightest_crossing(self, u, v):
+        """(a, b, trọng số) nhẹ nhất có a thuộc nửa nhỏ hơn, b thuộc nửa kia; None nếu không có."""
+        side = self._smaller_side(u, v)
+        best = None
+        for a in side:
+            for b, weight in self.graph.neighbors(a).items():
+                if b not in side and (best is None or weight < best[2]):
+                    best = (a, b, weight)
+        return best
+
+    def _smaller_side(self, u, v):
+        """Tập nút của nửa nhỏ hơn: duyệt song song hai nửa, nửa nào hết trước là nửa nhỏ."""
+        seen = ({u}, {v})
+        queues = (deque([u]), deque([v]))
+        tree = self._tree
+        while True:
+            for side in (0, 1):
+                queue = queues[side]
+                if not queue:
+                    return seen[side]
+                node = queue.popleft()
+                for neighbor in tree[node]:
+                    if neighbor not in seen[side]:
+                        seen[side].add(neighbor)
+                        queue.append(neighbor)
+
+    def _tree_path(self, u, v):
+        """Đường đi u -> v trên cây (list id nút), None nếu khác cây."""
+        parent = {u: None}
+        queue = deque([u])
+        tree = self._tree
+        while queue:
+            node = queue.popleft()
+            if node == v:
+                path = [v]
+                while parent[path[-1]] is not None:
+                    path.append(parent[path[-1]])
+                path.reverse()
+                return path
+            for neighbor in tree[node]:
+                if neighbor not in parent:
+                    parent[neighbor] = node
+                    queue.append(neighbor)
+        return None
+
+    def _link(self, u, v, weight):
+        self._tree[u][v] = weight
+        self._tree[v][u] = weight
+        self.total_weight += weight
+
+    def _unlink(self, u, v):
+        weight = self._tree[u].pop(v)
+        del self._tree[v][u]
+        self.total_weight -= weight
+
+    def _sync_integral(self):
+        if not self.graph.has_integer_weights:
+            self.steps.integral_values = False
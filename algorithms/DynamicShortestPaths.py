@@ -0,0 +1,163 @@
+import heapq
+from array import array
+
+from .StepTrace import Op, NO_NODE, StepTrace
+
+
+class DynamicShortestPaths:
+    """
+    Cây đường đi ngắn nhất từ một nút của DynamicGraph, sửa dần sau mỗi thay đổi:
+
+    - cung mới / cung nhẹ đi (u -> v): nếu dist[u] + w < dist[v] thì lan truyền kiểu
+      Dijkstra từ v, chỉ qua các nút thật sự giảm khoảng cách.
+    - xóa / tăng trọng số một cung của cây: chỉ cây con dưới cung đó bị ảnh hưởng;
+      tính lại nó bằng Dijkstra khởi đầu từ các cung vào từ phần còn lại của cây.
+      Cung ngoài cây thì không làm gì.
+
+    Trace `steps` chỉ gồm các ('update_distance', nút, khoảng cách, cha) của các nút đổi
+    khoảng cách hoặc cha (không tới được nữa: khoảng cách inf, không có cha).
+    Trọng số phải không âm. Mỗi thao tác trả về lát cắt các bước của riêng nó.
+    """
+
+    def __init__(self, dynamic_graph, source):
+        self.graph = dynamic_graph
+        self.source = dynamic_graph.index_of(source)
+        num_nodes = dynamic_graph.num_nodes
+        if any(weight < 0 for _, _, weight in dynamic_graph.edges()):
+            raise ValueError("Đường đi ngắn nhất động cần trọng số không âm")
+        self._distances = [float('inf')] * num_nodes
+        self._parent = array('i', [NO_NODE]) * num_nodes
+        self._children = [set() for _ in range(num_nodes)]
+        self.steps = StepTrace(dynamic_graph.labels, dynamic_graph.has_integer_weights)
+        self._propagate([(0, self.source, NO_NODE)])
+        # Lần tính đầu tiên không phải bước sửa chữa (xem tree_steps())
+        self.steps = StepTrace(dynamic_graph.labels, dynamic_graph.has_integer_weights)
+        dynamic_graph.attach(self)
+
+    def distance(self, label):
+        return self._distances[self.graph.index_of(label)]
+
+    def parent(self, label):
+        parent = self._parent[self.graph.index_of(label)]
+        return None if parent == NO_NODE else self.graph.labels[parent]
+
+    def tree_steps(self):
+        """Trace 'update_distance' của mọi nút tới được (theo khoảng cách tăng dần), dùng làm trạng thái đầu."""
+        trace = StepTrace(self.graph.labels, self.graph.has_integer_weights)
+        reachable = [node for node, d in enumerate(self._distances) if d != float('inf')]
+        for node in sorted(reachable, key=self._distances.__getitem__):
+            trace.push(Op.UPDATE_DISTANCE, node, self._parent[node], self._distances[node])
+        return trace
+
+    def check_weight(self, weight):
+        """Gọi bởi DynamicGraph trước khi thay đổi: từ chối trọng số âm."""
+        if weight < 0:
+            raise ValueError("Đường đi ngắn nhất động cần trọng số không âm")
+
+    # ------------------------------------------------------------------
+    # Gọi bởi DynamicGraph
+    # ------------------------------------------------------------------
+    def on_add(self, u, v, weight):
+        start = len(self.steps)
+        self._sync_integral()
+        self._decrease(u, v, weight)
+        if not self.graph.directed:
+            self._decrease(v, u, weight)
+        return self.steps[start:]
+
+    def on_remove(self, u, v, weight):
+        start = len(self.steps)
+        self._increase(u, v)
+        return self.steps[start:]
+
+    def on_weight(self, u, v, old, new):
+        start = len(self.steps)
+        self._sync_integral()
+        if new < old:
+            self.on_add(u, v, new)
+        elif new > old:
+            self._increase(u, v)
+        return self.steps[start:]
+
+    # ------------------------------------------------------------------
+    # Sửa cây
+    # ------------------------------------------------------------------
+    def _decrease(self, u, v, weight):
+        candidate = self._distances[u] + weight
+        if candidate < self._distances[v]:
+            self._propagate([(candidate, v, u)])
+
+    def _propagate(self, heap):
+        """Dijkstra từ các mục (khoảng cách, nút, cha) ban đầu; ghi bước cho mỗi nút được giảm."""
+        distances = self._distances
+        heapq.heapify(heap)
+        while heap:
+            distance, node, parent = heapq.heappop(heap)
+            if distance >= distances[node]:
+                continue
+            self._attach(node, parent, distance)
+            self.steps.push(Op.UPDATE_DISTANCE, node, parent, distance)
+            for neighbor, weight in self.graph.neighbors(node).items():
+                if distance + weight < distances[neighbor]:
+                    heapq.heappush(heap, (distance + weight, neighbor, node))
+
+    def _increase(self, u, v):
+        """Cung u -> v (và v -> u nếu vô hướng) dài ra hoặc biến mất."""
+        roots = []
+        if self._parent[v] == u:
+            roots.append(v)
+        if not self.graph.directed and self._parent[u] == v:
+            roots.append(u)
+        for root in roots:
+            self._repair_subtree(root)
+
+    def _repair_subtree(self, root):
+        distances, parents = self._distances, self._parent
+        affected = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            affected.append(node)
+            stack.extend(self._children[node])
+        before = {node: (distances[node], parents[node]) for node in affected}
+        inf = float('inf')
+        for node in affected:
+            self._detach(node)
+            distances[node] = inf
+
+        # Khởi đầu: cung vào tốt nhất từ phần cây không bị ảnh hưởng
+        heap = []
+        for node in affected:
+            for source, weight in self.graph.in_neighbors(node).items():
+                if source not in before and distances[source] + weight < inf:
+                    heap.append((distances[source] + weight, node, source))
+        heapq.heapify(heap)
+        while heap:
+            distance, node, parent = heapq.heappop(heap)
+            if distance >= distances[node]:
+                continue
+            self._attach(node, parent, distance)
+            for neighbor, weight in self.graph.neighbors(node).items():
+                if neighbor in before and distance + weight < distances[neighbor]:
+                    heapq.heappush(heap, (distance + weight, neighbor, node))
+
+        for node in sorted(affected, key=distances.__getitem__):
+            if (distances[node], parents[node]) != before[node]:
+                self.steps.push(Op.UPDATE_DISTANCE, node, parents[node], distances[node])
+
+    def _attach(self, node, parent, distance):
+        self._detach(node)
+        self._distances[node] = distance
+        self._parent[node] = parent
+        if parent != NO_NODE:
+            self._children[parent].add(node)
+
+    def _detach(self, node):
+        parent = self._parent[node]
+        if parent != NO_NODE:
+            self._children[parent].discard(node)
+            self._parent[node] = NO_NODE
+
+    def _sync_integral(self):
+        if not self.graph.has_integer_weights:
+            self.steps.integral_values = False
@@ -0,0 +1,270 @@
+from .IBaseAlgorithmStrategy import IBaseAlgorithmStrategy
+from .RenderState import RenderState
+from .StepTrace import Op, NO_NODE
+from core.compat import get_numpy
+from ui.CanvasScene import CanvasScene
+
+
+class FloydStrategy(IBaseAlgorithmStrategy):
+    """
+    Floyd–Warshall: đường đi ngắn nhất giữa mọi cặp nút, O(n^3) thời gian, O(n^2) bộ nhớ.
+
+    Trace gọn theo từng pivot k: ('pivot', k, số cặp được cải thiện) rồi các
+    ('update_distance', j, giá trị, cha) của hàng nút bắt đầu, nên độ dài trace
+    là O(n + số lần hàng đó đổi) thay vì O(n^3).
+
+    Có NumPy thì mỗi pivot là một phép min vector hóa trên cả hàng, chia khối
+    `block_size` pivot và từng ô `tile_bytes` dòng để dữ liệu nằm trong cache.
+    """
+    # Số pivot mỗi khối và kích thước (byte) một ô dòng của ma trận khoảng cách
+    block_size = 32
+    tile_bytes = 1 << 18
+    # O(n^2) bộ nhớ, O(n^3) thời gian: quá ngưỡng này thì báo lỗi thay vì treo máy
+    max_nodes = 2000
+
+    def iter_steps(self, graph, start_node):
+        start = graph.index_of(start_node)
+        pivots = self._pivots(graph, start)
+        # Bộ đếm cho profiler (chỉ báo cáo khi đang bật)
+        num_pivots, improved_pairs = 0, 0
+        try:
+            for pivot, improved, changes in pivots:
+                if pivot == NO_NODE:
+                    # Khởi tạo: hàng của nút bắt đầu chỉ gồm các cung đi thẳng
+                    yield Op.UPDATE_DISTANCE, start, NO_NODE, 0
+                else:
+                    num_pivots += 1
+                    improved_pairs += improved
+                    yield Op.PIVOT, pivot, NO_NODE, improved
+                for node, parent, distance in changes:
+                    yield Op.UPDATE_DISTANCE, node, parent, distance
+        finally:
+            pivots.close()
+            self._count('pivots', num_pivots)
+            self._count('pairs_improved', improved_pairs)
+
+    def all_pairs(self, graph):
+        """
+        Ma trận khoảng cách và ma trận cha (cha[i][j]: nút ngay trước j trên đường i -> j).
+        Là mảng NumPy n x n nếu có NumPy, nếu không là list các list.
+        """
+        pivots = self._pivots(graph, None)
+        while True:
+            try:
+                next(pivots)
+            except StopIteration as done:
+                return done.value
+
+    def _pivots(self, graph, start):
+        """
+        Generator: (pivot, số cặp được cải thiện, [(nút, cha, khoảng cách) của hàng `start`]);
+        bản ghi đầu tiên có pivot = NO_NODE là hàng `start` ban đầu. Trả về (dist, parent).
+        """
+        if self.max_nodes is not None and graph.num_nodes > self.max_nodes:
+            raise ValueError(f"Floyd chỉ hỗ trợ đồ thị tối đa {self.max_nodes} nút "
+                             f"(đồ thị có {graph.num_nodes} nút)")
+        np = get_numpy()
+        if np is not None:
+            return self._pivots_numpy(np, graph, start)
+        return self._pivots_python(graph, start)
+
+    # ------------------------------------------------------------------
+    # Bản NumPy: chia khối pivot + ô dòng
+    # ------------------------------------------------------------------
+    def _pivots_numpy(self, np, graph, start):
+        n = graph.num_nodes
+        dist, parent = self._initial_numpy(np, graph)
+        if start is not None:
+            row = np.flatnonzero(np.isfinite(dist[start]))
+            yield NO_NODE, 0, [(j, start, d) for j, d in zip(row.tolist(), dist[start, row].tolist())
+                               if j != start]
+
+        block = max(1, self.block_size)
+        tile = max(1, self.tile_bytes // max(8 * n, 1))
+        for k0 in range(0, n, block):
+            k1 = min(k0 + block, n)
+            improved = [0] * (k1 - k0)
+            changes = [[] for _ in range(k1 - k0)]
+
+            # 1. Các dòng pivot của khối (và dòng start) theo đúng thứ tự Floyd cổ điển;
+            #    giữ lại dòng k tại bước k để các dòng khác cũng được xét đúng như bản cổ
+            #    điển (cùng kết quả, cùng số cặp cải thiện với bản thuần Python)
+            head = list(range(k0, k1))
+            start_row = None
+            if start is not None and not k0 <= start < k1:
+                start_row = len(head)
+                head.append(start)
+            elif start is not None:
+                start_row = start - k0
+            sub_dist, sub_parent = dist[head], parent[head]
+            step_dist, step_parent = [], []
+            for k in range(k0, k1):
+                r = k - k0
+                step_dist.append(sub_dist[r].copy())
+                step_parent.append(sub_parent[r].copy())
+                candidate = sub_dist[:, k, None] + sub_dist[r]
+                better = candidate < sub_dist
+                improved[r] += int(np.count_nonzero(better))
+                np.copyto(sub_dist, candidate, where=better)
+                np.copyto(sub_parent, step_parent[r], where=better)
+                if start_row is not None:
+                    cols = np.flatnonzero(better[start_row])
+                    if len(cols):
+                        changes[r] = list(zip(cols.tolist(),
+                                              sub_parent[start_row, cols].tolist(),
+                                              sub_dist[start_row, cols].tolist()))
+            dist[head], parent[head] = sub_dist, sub_parent
+
+            # 2. Các dòng còn lại, từng ô `tile` dòng: ô nhỏ nằm trong cache suốt cả khối pivot
+            for i0, i1 in self._row_tiles(n, k0, k1, start, tile):
+                tile_dist, tile_parent = dist[i0:i1], parent[i0:i1]
+                for r in range(k1 - k0):
+                    candidate = tile_dist[:, k0 + r, None] + step_dist[r]
+                    better = candidate < tile_dist
+                    improved[r] += int(np.count_nonzero(better))
+                    np.copyto(tile_dist, candidate, where=better)
+                    np.copyto(tile_parent, step_parent[r], where=better)
+
+            if (np.diagonal(dist) < 0).any():
+                raise ValueError("Đồ thị có chu trình âm: Floyd không xác định được khoảng cách")
+            for r in range(k1 - k0):
+                yield k0 + r, improved[r], changes[r]
+        return dist, parent
+
+    @staticmethod
+    def _initial_numpy(np, graph):
+        n = graph.num_nodes
+        offsets = np.asarray(memoryview(graph.offsets))
+        targets = np.asarray(memoryview(graph.targets)).astype(np.intp)
+        weights = np.asarray(memoryview(graph.weights)).astype(np.float64)
+        sources = np.repeat(np.arange(n, dtype=np.intp), np.diff(offsets))
+        dist = np.full((n, n), np.inf)
+        # Nhiều cung cùng cặp nút: giữ trọng số nhỏ nhất
+        np.minimum.at(dist, (sources, targets), weights)
+        diagonal = np.arange(n)
+        dist[diagonal, diagonal] = np.minimum(dist[diagonal, diagonal], 0)
+        parent = np.full((n, n), NO_NODE, dtype=np.int32)
+        parent[sources, targets] = sources
+        parent[diagonal, diagonal] = NO_NODE
+        return dist, parent
+
+    @staticmethod
+    def _row_tiles(n, k0, k1, start, tile):
+        """Các đoạn dòng [i0, i1) độ dài <= tile, bỏ các dòng pivot [k0, k1) và dòng start."""
+        segments = [(0, k0), (k1, n)]
+        if start is not None and not k0 <= start < k1:
+            segments = [part for a, b in segments
+                        for part in (((a, start), (start + 1, b)) if a <= start < b else ((a, b),))]
+        for a, b in segments:
+            for i0 in range(a, b, tile):
+                yield i0, min(i0 + tile, b)
+
+    # ------------------------------------------------------------------
+    # Bản thuần Python (không có NumPy)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _pivots_python(graph, start):
+        n = graph.num_nodes
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        inf = float('inf')
+        dist = [[inf] * n for _ in range(n)]
+        parent = [[NO_NODE] * n for _ in range(n)]
+        for i in range(n):
+            row, parent_row = dist[i], parent[i]
+            for k in range(offsets[i], offsets[i + 1]):
+                j = targets[k]
+                if weights[k] < row[j]:
+                    row[j] = weights[k]
+                    parent_row[j] = i
+            if row[i] > 0:
+                row[i] = 0
+            parent_row[i] = NO_NODE
+        if start is not None:
+            yield NO_NODE, 0, [(j, start, d) for j, d in enumerate(dist[start])
+                               if j != start and d != inf]
+
+        for k in range(n):
+            pivot_row, pivot_parent = dist[k], parent[k]
+            improved = 0
+            changes = []
+            for i in range(n):
+                through = dist[i][k]
+                if through == inf or i == k:
+                    continue
+                row, parent_row = dist[i], parent[i]
+                for j in range(n):
+                    candidate = through + pivot_row[j]
+                    if candidate < row[j]:
+                        row[j] = candidate
+                        parent_row[j] = pivot_parent[j]
+                        improved += 1
+                        if i == start:
+                            changes.append((j, pivot_parent[j], candidate))
+            if dist[k][k] < 0:
+                raise ValueError("Đồ thị có chu trình âm: Floyd không xác định được khoảng cách")
+            yield k, improved, changes
+        return dist, parent
+
+    # ------------------------------------------------------------------
+    # Hiển thị
+    # ------------------------------------------------------------------
+    def create_render_state(self, graph, all_steps):
+        state = RenderState(maps=('node_colors', 'edge_colors', 'node_texts',
+                                  'distances', 'parent', 'pivots'))
+        for node in graph.nodes:
+            state.maps['node_texts'][node] = "∞"
+            state.maps['distances'][node] = float('inf')
+        return state
+
+    def apply_step(self, state, step):
+        action = step[0]
+        if action == 'pivot':
+            # Pivot trước trở thành "đã xét", pivot hiện tại tô vàng
+            previous = state.get('pivots', 'current')
+            if previous is not None:
+                state.set('node_colors', previous, 'lightgreen')
+            state.set('pivots', 'current', step[1])
+            state.set('pivots', 'improved', step[2])
+            state.set('node_colors', step[1], 'gold')
+
+        elif action == 'update_distance':
+            node = step[1]
+            distance = step[2]
+            state.set('node_texts', node, str(distance))
+            state.set('distances', node, distance)
+            parent = step[3] if len(step) > 3 else None
+            # Cạnh cây đường đi ngắn nhất: bỏ cạnh tới cha cũ, tô cạnh tới cha mới
+            old_parent = state.get('parent', node)
+            if old_parent is not None:
+                state.remove('edge_colors', tuple(sorted((old_parent, node))))
+            if parent is not None:
+                state.set('parent', node, parent)
+                state.set('edge_colors', tuple(sorted((parent, node))), 'red')
+
+    def draw_state(self, canvas, graph, state):
+        scene = self.scene_for(canvas, graph)
+        changed = scene.sync(state, node_fill='node_colors', edge_fill='edge_colors',
+                             node_text='node_texts',
+                             text_format=lambda node, dist_text: f"{node}\n{dist_text}")
+
+        canvas_height = 600
+        if changed is None or 'pivots' in changed:
+            pivots = state.maps['pivots']
+            pivot = pivots.get('current')
+            pivot_text = "Pivot: " + ("-" if pivot is None else
+                                      f"{pivot} (cải thiện {pivots['improved']} cặp)")
+            scene.set_info('pivot', 20, canvas_height-120, pivot_text, fill="blue")
+        if changed is None or 'distances' in changed:
+            distances = state.maps['distances']
+            dist_text = "Distances: " + ", ".join(
+                [f"{n}={distances[n] if distances[n] != float('inf') else '∞'}" for n in sorted(distances)])
+            scene.set_info('distances', 20, canvas_height-150, dist_text, fill="purple")
+        if changed is None or 'parent' in changed:
+            parent_text = "Parent: " + ", ".join(
+                [f"{child}←{par}" for child, par in state.maps['parent'].items()])
+            scene.set_info('parent', 20, canvas_height-180, parent_text, fill="brown")
+
+    # noinspection PyMethodMayBeStatic
+    def _create_scene(self, canvas, graph):
+        """Vẽ đồ thị có trọng số"""
+        return CanvasScene(canvas, graph, graph.nodes, graph.weighted_edges, weighted=True)
@@ -1,10 +1,164 @@
+import time
 from abc import ABC, abstractmethod
 
+from .Profiler import Profiler
+from .StepCursor import StepCursor
+from .StepTrace import StepTrace
+from .StreamingTrace import StreamingTrace
+
+
 class IBaseAlgorithmStrategy(ABC):
+    # Profiler đang bật (None: tắt, không tốn thêm chi phí đo)
+    profiler = None
+    # Tăng khi iter_steps đổi kết quả (làm mất hiệu lực các trace trong TraceCache)
+    version = 1
+    # Số nút tối đa strategy chấp nhận (None: không giới hạn); benchmark bỏ qua đồ thị lớn hơn
+    max_nodes = None
+
+    def run(self,graph,start_node, cache=None, **options):
+        """
+        Chạy trọn thuật toán, trả về toàn bộ các bước (StepTrace).
+        `options` được chuyển thẳng cho iter_steps (ví dụ queue_kind của Dijkstra).
+        `cache` (TraceCache): dùng lại trace đã lưu nếu có, nếu không thì lưu lại.
+        """
+        cached = self._cached_trace(cache, graph, start_node, options)
+        if cached is not None:
+            return cached
+        steps = StepTrace.for_graph(graph)
+        steps.extend(self._raw_steps(graph, start_node, options, cache))
+        return steps
+
+    def stream(self, graph, start_node, capacity=1_000_000, spill=True, background=False,
+               cache=None, **options):
+        """
+        Chạy thuật toán theo kiểu lười: các bước chỉ được sinh khi cần,
+        bộ nhớ giữ tối đa `capacity` bước (phần cũ ghi ra đĩa hoặc bỏ đi).
+        background=True: chạy trong luồng nền, các bước về dần qua trace.poll().
+        Nếu `cache` đã có trace thì trả về luôn StepTrace (mmap) đủ bước.
+        """
+        cached = self._cached_trace(cache, graph, start_node, options)
+        if cached is not None:
+            return cached
+        return StreamingTrace(self._raw_steps(graph, start_node, options, cache),
+                              graph.labels, graph.has_integer_weights, capacity, spill,
+                              background)
+
+    def cache_options(self, graph):
+        """
+        Những gì ngoài (đồ thị, nút bắt đầu, options) làm đổi trace: thiết lập của
+        constructor, dữ liệu đồ thị không nằm trong graph.fingerprint() (ví dụ tọa độ).
+        Được đưa vào khóa TraceCache; mặc định không có gì.
+        """
+        return {}
+
+    def _cached_trace(self, cache, graph, start_node, options):
+        # Đang profile thì phải chạy thật để đo
+        if cache is None or self.profiler is not None:
+            return None
+        return cache.load(self, graph, start_node, options)
+
+    def _raw_steps(self, graph, start_node, options, cache=None):
+        raw_steps = self.iter_steps(graph, start_node, **options)
+        if self.profiler is not None:
+            raw_steps = self._timed_steps(raw_steps)
+        if cache is not None:
+            raw_steps = cache.record(self, graph, start_node, options, raw_steps)
+        return raw_steps
+
+    # ------------------------------------------------------------------
+    # Đo hiệu năng
+    # ------------------------------------------------------------------
+    def enable_profiling(self, profiler=None):
+        """Bật đo thời gian và bộ đếm thao tác; trả về Profiler đang dùng."""
+        self.profiler = profiler if profiler is not None else Profiler()
+        return self.profiler
+
+    def disable_profiling(self):
+        self.profiler = None
+
+    def _count(self, name, amount=1):
+        """Cộng bộ đếm (strategy gọi khi kết thúc iter_steps với số đếm cục bộ)."""
+        if self.profiler is not None and amount:
+            self.profiler.count(name, amount)
+
+    def _timed_steps(self, raw_steps):
+        """Đo thời gian chạy của chính generator (không tính thời gian bên đọc bước)."""
+        profiler = self.profiler
+        clock = time.perf_counter
+        elapsed = 0.0
+        count = 0
+        try:
+            while True:
+                started = clock()
+                step = next(raw_steps, None)
+                elapsed += clock() - started
+                if step is None:
+                    break
+                count += 1
+                yield step
+        finally:
+            raw_steps.close()
+            profiler.add_time('run', elapsed)
+            profiler.count('steps', count)
+
     @abstractmethod
-    def run(self,graph,start_node):
+    def iter_steps(self, graph, start_node, **options):
+        """Generator sinh từng bước dạng số: (op, a[, b[, value]])."""
         pass
 
-    @abstractmethod
     def render_step(self, canvas, graph, all_steps, index):
-        pass
\ No newline at end of file
+        """
+        Vẽ trạng thái sau bước 'index'. Trạng thái tích lũy được lấy từ
+        StepCursor (checkpoint + áp dụng/hoàn tác từng bước), không chạy lại từ đầu.
+        """
+        profiler = self.profiler
+        if profiler is None:
+            state = self.cursor_for(graph, all_steps).seek(index)
+            self.draw_state(canvas, graph, state)
+            return
+        started = time.perf_counter()
+        state = self.cursor_for(graph, all_steps).seek(index)
+        seeked = time.perf_counter()
+        self.draw_state(canvas, graph, state)
+        finished = time.perf_counter()
+        profiler.add_time('render_step.seek', seeked - started)
+        profiler.add_time('render_step.draw', finished - seeked)
+        profiler.add_time('render_step', finished - started)
+
+    def cursor_for(self, graph, all_steps):
+        """StepCursor dùng chung cho cùng một cặp (graph, all_steps)."""
+        cursor = getattr(self, '_cursor', None)
+        if cursor is None or cursor.graph is not graph or cursor.all_steps is not all_steps:
+            # Trace đang sinh dần chưa biết độ dài: dùng khoảng checkpoint cố định
+            interval = 256 if isinstance(all_steps, StreamingTrace) else None
+            cursor = StepCursor(self, graph, all_steps, interval)
+            self._cursor = cursor
+        return cursor
+
+    def scene_for(self, canvas, graph):
+        """CanvasScene dùng chung cho cùng một cặp (canvas, graph): chỉ tạo item một lần."""
+        scene = getattr(self, '_scene', None)
+        if scene is None or scene.canvas is not canvas or scene.graph is not graph:
+            scene = self._create_scene(canvas, graph)
+            self._scene = scene
+        return scene
+
+    @abstractmethod
+    def _create_scene(self, canvas, graph):
+        """Tạo CanvasScene (các item của đồ thị) cho strategy này."""
+        pass
+
+    @abstractmethod
+    def create_render_state(self, graph, all_steps):
+        """Trạng thái hiển thị ban đầu (trước bước 0)."""
+        pass
+
+    @abstractmethod
+    def apply_step(self, state, step):
+        """Cập nhật trạng thái hiển thị theo một bước (chỉ qua API của RenderState)."""
+        pass
+
+    @abstractmethod
+    def draw_state(self, canvas, graph, state):
+        """Vẽ trạng thái hiển thị lên canvas."""
+        pass
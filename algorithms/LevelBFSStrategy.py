@@ -0,0 +1,309 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from core.compat import get_numpy
+from .IBaseAlgorithmStrategy import IBaseAlgorithmStrategy
+from .RenderState import RenderState
+from .StepTrace import Op, NO_NODE, StepTrace
+from ui.CanvasScene import CanvasScene
+
+# Màu nút theo tầng (lặp lại khi hết)
+LEVEL_COLORS = ('orange', 'gold', 'lightgreen', 'skyblue', 'plum', 'salmon')
+
+
+class LevelBFSStrategy(IBaseAlgorithmStrategy):
+    """
+    BFS theo tầng: frontier là một mảng id nút, mỗi lượt mở rộng trọn một tầng.
+
+    - Top-down: gom mọi cung ra của frontier (gather trên CSR), giữ các đích chưa thăm.
+    - Bottom-up: mỗi nút chưa thăm tìm một cung vào từ frontier. Đổi chiều theo
+      Beamer: sang bottom-up khi số cung của frontier > số cung còn lại / alpha,
+      về top-down khi frontier < num_nodes / beta.
+    - Có NumPy thì mỗi tầng là vài phép toán mảng; workers > 1 thì frontier lớn
+      (top-down) được chia cho một process pool.
+
+    Cha của mỗi nút luôn là nút có id nhỏ nhất của tầng trước kề với nó, nên trace
+    không phụ thuộc chiều duyệt hay số worker. Bước sinh ra: ('visit', start), rồi
+    mỗi tầng ('level', d) và các ('explore', cha, nút) của tầng đó, cuối cùng 'finish'.
+    """
+    alpha = 14
+    beta = 24
+    # Số cung tối thiểu của frontier để chia cho process pool
+    parallel_arcs = 1 << 20
+
+    def __init__(self, workers=None):
+        self.workers = workers
+
+    def cache_options(self, graph):
+        return {'workers': self.workers}
+
+    def iter_steps(self, graph, start_node, workers=None):
+        start = graph.index_of(start_node)
+        levels = self._levels(graph, start, workers or self.workers)
+        try:
+            yield Op.VISIT, start
+            for depth, nodes, parents in levels:
+                yield Op.LEVEL, NO_NODE, NO_NODE, depth
+                if hasattr(nodes, 'tolist'):
+                    nodes, parents = nodes.tolist(), parents.tolist()
+                for parent, node in zip(parents, nodes):
+                    yield Op.EXPLORE, parent, node
+            yield (Op.FINISH,)
+        finally:
+            levels.close()
+
+    def run(self, graph, start_node, cache=None, **options):
+        """Như run() gốc nhưng mỗi tầng được ghi thẳng vào các cột của StepTrace."""
+        if cache is not None or self.profiler is not None:
+            return super().run(graph, start_node, cache=cache, **options)
+        workers = options.pop('workers', None)
+        if options:
+            raise TypeError(f"Tùy chọn không hợp lệ: {', '.join(options)}")
+        start = graph.index_of(start_node)
+        steps = StepTrace.for_graph(graph)
+        steps.push(Op.VISIT, start)
+        for depth, nodes, parents in self._levels(graph, start, workers or self.workers):
+            steps.push(Op.LEVEL, NO_NODE, NO_NODE, depth)
+            steps.extend_columns(Op.EXPLORE, parents, nodes)
+        steps.push(Op.FINISH)
+        return steps
+
+    def _levels(self, graph, start, workers=None):
+        """Generator: (độ sâu, các nút mới theo id tăng dần, cha tương ứng) cho từng tầng."""
+        np = get_numpy()
+        if np is not None:
+            return self._levels_numpy(np, graph, start, workers)
+        return self._levels_python(graph, start)
+
+    # ------------------------------------------------------------------
+    # Bản NumPy
+    # ------------------------------------------------------------------
+    def _levels_numpy(self, np, graph, start, workers):
+        offsets, targets, reverse_offsets, reverse_sources = self._adjacency(np, graph)
+        num_nodes = graph.num_nodes
+        degrees = np.diff(offsets)
+        in_degrees = np.diff(reverse_offsets)
+        visited = np.zeros(num_nodes, dtype=bool)
+        visited[start] = True
+        frontier = np.array([start], dtype=np.intp)
+        # Số cung vào của các nút chưa thăm (chi phí một tầng bottom-up)
+        unexplored = int(in_degrees.sum()) - int(in_degrees[start])
+        bottom_up = False
+        pool = None
+        depth, bottom_up_levels, scanned = 0, 0, 0
+        try:
+            while len(frontier):
+                frontier_arcs = int(degrees[frontier].sum())
+                if not bottom_up and frontier_arcs > unexplored / self.alpha:
+                    bottom_up = True
+                elif bottom_up and len(frontier) < num_nodes / self.beta:
+                    bottom_up = False
+
+                if bottom_up:
+                    bottom_up_levels += 1
+                    scanned += unexplored
+                    nodes, parents = _bottom_up(np, reverse_offsets, reverse_sources,
+                                                frontier, visited)
+                elif workers and workers > 1 and frontier_arcs >= self.parallel_arcs:
+                    scanned += frontier_arcs
+                    if pool is None:
+                        pool = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                                   initargs=(offsets, targets))
+                    nodes, parents = self._top_down_parallel(np, pool, workers, frontier, visited)
+                else:
+                    scanned += frontier_arcs
+                    nodes, parents = _top_down(np, offsets, targets, frontier, visited)
+                if not len(nodes):
+                    return
+                depth += 1
+                visited[nodes] = True
+                unexplored -= int(in_degrees[nodes].sum())
+                yield depth, nodes, parents
+                frontier = nodes
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            self._count('levels', depth)
+            self._count('levels_bottom_up', bottom_up_levels)
+            self._count('edges_scanned', scanned)
+
+    @staticmethod
+    def _top_down_parallel(np, pool, workers, frontier, visited):
+        # Các đoạn liên tiếp của frontier (id tăng dần): ghép kết quả theo thứ tự đoạn rồi
+        # lấy lần xuất hiện đầu tiên là được đúng cha nhỏ nhất như bản tuần tự
+        chunks = np.array_split(frontier, workers)
+        results = list(pool.map(_expand_chunk, chunks, [visited] * len(chunks)))
+        nodes = np.concatenate([found for found, _ in results])
+        parents = np.concatenate([by for _, by in results])
+        nodes, first = np.unique(nodes, return_index=True)
+        return nodes, parents[first]
+
+    def _adjacency(self, np, graph):
+        """
+        (offsets, targets, reverse_offsets, reverse_sources) của bản không trọng số dạng
+        mảng NumPy; tính một lần cho mỗi đồ thị.
+        """
+        cached = getattr(self, '_adjacency_cache', None)
+        if cached is not None and cached[0] is graph:
+            return cached[1]
+        offsets = np.asarray(memoryview(graph.offsets)).astype(np.int64)
+        targets = np.asarray(memoryview(graph.targets)).astype(np.intp)
+        reverse_offsets, reverse_sources, reverse_arcs = graph.reverse_arcs()
+        reverse_offsets = np.asarray(memoryview(reverse_offsets)).astype(np.int64)
+        reverse_sources = np.asarray(memoryview(reverse_sources)).astype(np.intp)
+        mask = graph.unweighted_mask
+        if mask is not None:
+            keep = np.asarray(memoryview(mask)).astype(bool)
+            offsets, targets = _filter_csr(np, offsets, targets, keep)
+            reverse_keep = keep[np.asarray(memoryview(reverse_arcs))]
+            reverse_offsets, reverse_sources = _filter_csr(np, reverse_offsets, reverse_sources,
+                                                           reverse_keep)
+        arrays = offsets, targets, reverse_offsets, reverse_sources
+        self._adjacency_cache = graph, arrays
+        return arrays
+
+    # ------------------------------------------------------------------
+    # Bản thuần Python (không có NumPy)
+    # ------------------------------------------------------------------
+    def _levels_python(self, graph, start):
+        num_nodes = graph.num_nodes
+        reverse_offsets, reverse_sources, reverse_arcs = graph.reverse_arcs()
+        visited = bytearray(num_nodes)
+        visited[start] = 1
+        frontier = [start]
+        unexplored = sum(1 for p in range(len(reverse_sources))
+                         if graph.is_unweighted_arc(reverse_arcs[p]))
+        unexplored -= sum(1 for p in range(reverse_offsets[start], reverse_offsets[start + 1])
+                          if graph.is_unweighted_arc(reverse_arcs[p]))
+        bottom_up = False
+        depth, bottom_up_levels, scanned = 0, 0, 0
+        try:
+            while frontier:
+                frontier_arcs = sum(len(graph.unweighted_neighbors(u)) for u in frontier)
+                if not bottom_up and frontier_arcs > unexplored / self.alpha:
+                    bottom_up = True
+                elif bottom_up and len(frontier) < num_nodes / self.beta:
+                    bottom_up = False
+
+                found = {}
+                if bottom_up:
+                    bottom_up_levels += 1
+                    in_frontier = bytearray(num_nodes)
+                    for u in frontier:
+                        in_frontier[u] = 1
+                    for v in range(num_nodes):
+                        if visited[v]:
+                            continue
+                        for p in range(reverse_offsets[v], reverse_offsets[v + 1]):
+                            scanned += 1
+                            # Nguồn của các cung vào đã tăng dần: gặp đầu tiên là cha nhỏ nhất
+                            if in_frontier[reverse_sources[p]] and graph.is_unweighted_arc(reverse_arcs[p]):
+                                found[v] = reverse_sources[p]
+                                break
+                else:
+                    scanned += frontier_arcs
+                    for u in frontier:
+                        for v in graph.unweighted_neighbors(u):
+                            if not visited[v] and v not in found:
+                                found[v] = u
+                if not found:
+                    return
+                depth += 1
+                nodes = sorted(found)
+                for v in nodes:
+                    visited[v] = 1
+                    unexplored -= sum(1 for p in range(reverse_offsets[v], reverse_offsets[v + 1])
+                                      if graph.is_unweighted_arc(reverse_arcs[p]))
+                yield depth, array('i', nodes), array('i', [found[v] for v in nodes])
+                frontier = nodes
+        finally:
+            self._count('levels', depth)
+            self._count('levels_bottom_up', bottom_up_levels)
+            self._count('edges_scanned', scanned)
+
+    # ------------------------------------------------------------------
+    # Hiển thị: mỗi tầng một màu
+    # ------------------------------------------------------------------
+    def create_render_state(self, graph, all_steps):
+        return RenderState(maps=('node_colors', 'edge_colors', 'status'))
+
+    def apply_step(self, state, step):
+        action = step[0]
+        if action == 'visit':
+            state.set('node_colors', step[1], LEVEL_COLORS[0])
+            state.set('status', 'level', 0)
+            state.set('status', 'visited', 1)
+        elif action == 'level':
+            state.set('status', 'level', step[1])
+        elif action == 'explore':
+            depth = state.get('status', 'level', 0)
+            state.set('edge_colors', tuple(sorted((step[1], step[2]))), 'red')
+            state.set('node_colors', step[2], LEVEL_COLORS[depth % len(LEVEL_COLORS)])
+            state.set('status', 'visited', state.get('status', 'visited', 0) + 1)
+
+    def draw_state(self, canvas, graph, state):
+        scene = self.scene_for(canvas, graph)
+        changed = scene.sync(state, node_fill='node_colors', edge_fill='edge_colors')
+
+        if changed is None or 'status' in changed:
+            status = state.maps['status']
+            status_text = f"Level: {status.get('level', '-')}  |  Visited: {status.get('visited', 0)}"
+            scene.set_info('status', 20, 20, status_text, fill="blue")
+
+    # noinspection PyMethodMayBeStatic
+    def _create_scene(self, canvas, graph):
+        return CanvasScene(canvas, graph, graph.nodes, graph.unweighted_edges)
+
+
+def _filter_csr(np, offsets, values, keep):
+    """CSR chỉ giữ các phần tử có keep[k] == True."""
+    kept_before = np.zeros(len(keep) + 1, dtype=np.int64)
+    np.cumsum(keep, out=kept_before[1:])
+    return kept_before[offsets], values[keep]
+
+
+def _gather(np, offsets, nodes):
+    """Chỉ số các phần tử CSR của `nodes` (ghép liền) và số phần tử của từng nút."""
+    starts = offsets[nodes]
+    counts = offsets[nodes + 1] - starts
+    total = int(counts.sum())
+    # starts[i] + (0..counts[i]-1) cho từng nút, không có vòng lặp Python
+    shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return shift + np.arange(total), counts
+
+
+def _top_down(np, offsets, targets, frontier, visited):
+    arcs, counts = _gather(np, offsets, frontier)
+    neighbors = targets[arcs]
+    parents = np.repeat(frontier, counts)
+    fresh = ~visited[neighbors]
+    # np.unique lấy lần xuất hiện đầu tiên: cha có id nhỏ nhất vì frontier tăng dần
+    nodes, first = np.unique(neighbors[fresh], return_index=True)
+    return nodes, parents[fresh][first]
+
+
+def _bottom_up(np, reverse_offsets, reverse_sources, frontier, visited):
+    in_frontier = np.zeros(len(visited), dtype=bool)
+    in_frontier[frontier] = True
+    candidates = np.flatnonzero(~visited)
+    arcs, counts = _gather(np, reverse_offsets, candidates)
+    sources = reverse_sources[arcs]
+    hit = in_frontier[sources]
+    owners = np.repeat(candidates, counts)[hit]
+    # Nguồn các cung vào của mỗi nút tăng dần: lần đầu tiên là cha nhỏ nhất
+    nodes, first = np.unique(owners, return_index=True)
+    return nodes, sources[hit][first]
+
+
+# Dữ liệu đồ thị của từng process trong pool (gửi một lần qua initializer)
+_worker_adjacency = None
+
+
+def _init_worker(offsets, targets):
+    global _worker_adjacency
+    _worker_adjacency = offsets, targets
+
+
+def _expand_chunk(frontier, visited):
+    offsets, targets = _worker_adjacency
+    return _top_down(get_numpy(), offsets, targets, frontier, visited)
@@ -0,0 +1,50 @@
+class Profiler:
+    """
+    Bộ đếm thao tác và đồng hồ của một strategy.
+
+    - counters: tên -> số lần (heap_push, find, edges_relaxed, ...)
+    - timers: tên -> [số lần đo, tổng giây, lâu nhất] (run, render_step, ...)
+    Bật bằng strategy.enable_profiling(); khi tắt, strategy không gọi tới đây.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.timers = {}
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_time(self, name, seconds):
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [1, seconds, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+            if seconds > timer[2]:
+                timer[2] = seconds
+
+    def reset(self):
+        self.counters.clear()
+        self.timers.clear()
+
+    def as_dict(self):
+        """Dạng dict (ghi được ra JSON), thời gian tính bằng mili giây."""
+        return {
+            'counters': dict(self.counters),
+            'timers': {
+                name: {'calls': calls, 'total_ms': total * 1000,
+                       'mean_ms': total * 1000 / calls, 'max_ms': longest * 1000}
+                for name, (calls, total, longest) in self.timers.items()
+            },
+        }
+
+    def format_lines(self):
+        """Các dòng chữ để hiển thị (panel trong VisualizerView, in ra terminal)."""
+        lines = []
+        for name, (calls, total, longest) in sorted(self.timers.items()):
+            lines.append(f"{name}: {calls} lần, tổng {total * 1000:.1f} ms, "
+                         f"tb {total * 1000 / calls:.3f} ms, max {longest * 1000:.3f} ms")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name}: {value}")
+        return lines
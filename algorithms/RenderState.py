@@ -0,0 +1,159 @@
+from collections import deque
+
+_MISSING = object()
+
+
+class RenderState:
+    """
+    Trạng thái hiển thị tích lũy (màu nút, màu cạnh, hàng đợi, ...) của một strategy.
+
+    - maps: các dict tên -> {khóa: giá trị} (tập hợp được lưu như dict {khóa: True})
+    - seqs: các deque tên -> dãy (hàng đợi BFS, ngăn xếp DFS, ...)
+    - queues: các hàng đợi ưu tiên (core.PriorityQueue) theo id nút
+
+    Mọi thay đổi đi qua các hàm bên dưới để được ghi nhật ký, nhờ đó
+    StepCursor có thể lùi lại một bước (Prev) mà không phải chạy lại từ đầu.
+    Các khóa bị thay đổi cũng được đánh dấu trong `dirty` để CanvasScene
+    chỉ cập nhật đúng những item cần vẽ lại.
+    """
+
+    def __init__(self, maps=(), sequences=(), queues=None, labels=None):
+        self.maps = {name: {} for name in maps}
+        self.seqs = {name: deque() for name in sequences}
+        self.queues = dict(queues or {})
+        # Bảng nhãn của đồ thị (đổi nhãn <-> id cho các hàng đợi ưu tiên)
+        self.labels = labels
+        self._journal = None
+        # tên map/seq -> tập khóa đã đổi kể từ lần vẽ trước
+        self.dirty = {}
+
+    def copy(self):
+        """Bản sao độc lập (dùng làm checkpoint)."""
+        clone = RenderState(labels=self.labels)
+        clone.maps = {name: dict(values) for name, values in self.maps.items()}
+        clone.seqs = {name: deque(values) for name, values in self.seqs.items()}
+        clone.queues = {name: queue.copy() for name, queue in self.queues.items()}
+        return clone
+
+    def size(self):
+        """Số phần tử phải chép khi copy() (ước lượng bộ nhớ của một checkpoint)."""
+        return (sum(len(values) for values in self.maps.values())
+                + sum(len(values) for values in self.seqs.values())
+                + sum(queue.capacity for queue in self.queues.values()))
+
+    # ------------------------------------------------------------------
+    # Ghi nhật ký
+    # ------------------------------------------------------------------
+    def begin_step(self):
+        self._journal = []
+
+    def end_step(self):
+        journal, self._journal = self._journal, None
+        return journal
+
+    def undo(self, journal):
+        """Hoàn tác các thay đổi của một bước (theo thứ tự ngược)."""
+        for entry in reversed(journal):
+            kind, name = entry[0], entry[1]
+            changed = self.dirty.setdefault(name, set())
+            if kind == 'set':
+                key, old = entry[2], entry[3]
+                changed.add(key)
+                if old is _MISSING:
+                    self.maps[name].pop(key, None)
+                else:
+                    self.maps[name][key] = old
+            elif kind == 'push':
+                self.seqs[name].pop()
+            elif kind == 'pop':
+                self.seqs[name].append(entry[2])
+            elif kind == 'popleft':
+                self.seqs[name].appendleft(entry[2])
+            elif kind == 'clear':
+                self.seqs[name].extend(entry[2])
+            elif kind == 'queue':
+                node, old = entry[2], entry[3]
+                if old is None:
+                    self.queues[name].remove(node)
+                else:
+                    self.queues[name].update(node, old)
+
+    def take_dirty(self):
+        """Lấy và xóa danh sách thay đổi (gọi bởi CanvasScene sau mỗi lần vẽ)."""
+        dirty, self.dirty = self.dirty, {}
+        return dirty
+
+    def _record(self, entry):
+        if self._journal is not None:
+            self._journal.append(entry)
+        name = entry[1]
+        changed = self.dirty.get(name)
+        if changed is None:
+            changed = self.dirty[name] = set()
+        if entry[0] == 'set':
+            changed.add(entry[2])
+
+    # ------------------------------------------------------------------
+    # Thao tác trên maps
+    # ------------------------------------------------------------------
+    def get(self, name, key, default=None):
+        return self.maps[name].get(key, default)
+
+    def set(self, name, key, value):
+        values = self.maps[name]
+        old = values.get(key, _MISSING)
+        if old is value or old == value:
+            return
+        self._record(('set', name, key, old))
+        values[key] = value
+
+    def remove(self, name, key):
+        values = self.maps[name]
+        if key in values:
+            self._record(('set', name, key, values.pop(key)))
+
+    def add(self, name, key):
+        self.set(name, key, True)
+
+    def has(self, name, key):
+        return key in self.maps[name]
+
+    # ------------------------------------------------------------------
+    # Thao tác trên seqs
+    # ------------------------------------------------------------------
+    def push(self, name, value):
+        self.seqs[name].append(value)
+        self._record(('push', name))
+
+    def pop(self, name):
+        value = self.seqs[name].pop()
+        self._record(('pop', name, value))
+        return value
+
+    def popleft(self, name):
+        value = self.seqs[name].popleft()
+        self._record(('popleft', name, value))
+        return value
+
+    def clear(self, name):
+        values = self.seqs[name]
+        if values:
+            self._record(('clear', name, list(values)))
+            values.clear()
+
+    # ------------------------------------------------------------------
+    # Thao tác trên queues
+    # ------------------------------------------------------------------
+    def queue_push(self, name, node, key):
+        """Thêm nút / giảm khóa trong hàng đợi ưu tiên (node là id số nguyên)."""
+        queue = self.queues[name]
+        old = queue.key_of(node)
+        if queue.push(node, key):
+            self._record(('queue', name, node, old))
+
+    def queue_remove(self, name, node):
+        queue = self.queues[name]
+        old = queue.key_of(node)
+        if old is not None:
+            queue.remove(node)
+            self._record(('queue', name, node, old))
@@ -0,0 +1,111 @@
+from collections import deque
+from math import isqrt
+
+
+class StepCursor:
+    """
+    Con trỏ trên danh sách bước, giữ trạng thái hiển thị tại bước hiện tại.
+
+    - Cứ mỗi `interval` bước lưu một checkpoint (bản sao trạng thái).
+    - Tiến: áp dụng tiếp các bước (apply_step).
+    - Lùi: hoàn tác bằng nhật ký của các bước vừa áp dụng.
+    - Nhảy xa: khôi phục checkpoint gần nhất rồi áp dụng tối đa `interval` bước.
+    Vì vậy mỗi lần seek tốn O(interval) thay vì O(index).
+
+    Checkpoint của đồ thị lớn tốn nhiều bộ nhớ, nên khi vượt `max_checkpoints`
+    checkpoint hoặc `max_checkpoint_entries` phần tử (RenderState.size()),
+    cứ hai checkpoint bỏ một và khoảng cách tăng gấp đôi.
+    """
+    max_checkpoints = 256
+    max_checkpoint_entries = 4_000_000
+
+    def __init__(self, strategy, graph, all_steps, interval=None):
+        self.strategy = strategy
+        self.graph = graph
+        self.all_steps = all_steps
+        if interval is None:
+            interval = max(64, isqrt(len(all_steps)))
+        self.interval = interval
+
+        self.state = strategy.create_render_state(graph, all_steps)
+        # Chỉ số bước đã áp dụng gần nhất (-1: chưa áp dụng bước nào)
+        self.index = -1
+        # _checkpoints[c] = trạng thái ngay trước bước c * interval
+        self._checkpoints = [self.state.copy()]
+        self._checkpoint_entries = self.state.size()
+        # Nhật ký các bước vừa áp dụng (tối đa interval bước) để lùi lại
+        self._undo = deque(maxlen=interval)
+
+    def min_index(self):
+        """
+        Bước nhỏ nhất còn tới được. Với trace bỏ bớt bước cũ (spill=False),
+        chỉ lùi được tới checkpoint đầu tiên mà các bước sau nó vẫn còn.
+        """
+        first = getattr(self.all_steps, 'first_index', 0)
+        if first == 0:
+            return 0
+        # Lùi bằng nhật ký hoàn tác
+        reachable = self.index - len(self._undo)
+        # Hoặc khôi phục checkpoint đầu tiên có các bước phía sau còn giữ
+        checkpoint = -(-first // self.interval)
+        if checkpoint < len(self._checkpoints):
+            reachable = min(reachable, checkpoint * self.interval - 1)
+        return max(reachable, 0)
+
+    def seek(self, index):
+        """Đưa trạng thái về đúng sau bước `index` và trả về trạng thái đó."""
+        self._seek(index)
+        keep_from = getattr(self.all_steps, 'keep_from', None)
+        if keep_from is not None:
+            # Các bước sau vị trí hiện tại chưa được áp dụng: trace phải giữ lại
+            keep_from(self.index + 1)
+        return self.state
+
+    def _seek(self, index):
+        if index == self.index:
+            return
+
+        if self.index < index <= self.index + self.interval:
+            self._forward_to(index)
+        elif index < self.index and self.index - index <= len(self._undo):
+            while self.index > index:
+                self.state.undo(self._undo.pop())
+                self.index -= 1
+        else:
+            checkpoint = min((index + 1) // self.interval, len(self._checkpoints) - 1)
+            if self.index < index and self.index >= checkpoint * self.interval - 1:
+                # Chưa có checkpoint nào gần hơn vị trí hiện tại: đi tiếp
+                self._forward_to(index)
+                return
+            self.state = self._checkpoints[checkpoint].copy()
+            self.index = checkpoint * self.interval - 1
+            self._undo.clear()
+            self._forward_to(index)
+
+    def _forward_to(self, index):
+        state = self.state
+        all_steps = self.all_steps
+        apply_step = self.strategy.apply_step
+        interval = self.interval
+        while self.index < index:
+            step_index = self.index + 1
+            if step_index % interval == 0 and step_index // interval == len(self._checkpoints):
+                self._checkpoints.append(state.copy())
+                self._checkpoint_entries += state.size()
+                if (len(self._checkpoints) > self.max_checkpoints
+                        or self._checkpoint_entries > self.max_checkpoint_entries):
+                    self._thin_checkpoints()
+                    interval = self.interval
+            state.begin_step()
+            apply_step(state, all_steps[step_index])
+            self._undo.append(state.end_step())
+            self.index = step_index
+
+    def _thin_checkpoints(self):
+        """Giữ checkpoint chẵn (trước bước 0, 2K, 4K, ...) và gấp đôi khoảng cách K."""
+        if len(self._checkpoints) < 2:
+            return
+        self._checkpoints = self._checkpoints[::2]
+        self._checkpoint_entries = sum(state.size() for state in self._checkpoints)
+        self.interval *= 2
+        self._undo = deque(self._undo, maxlen=self.interval)
@@ -0,0 +1,246 @@
+from array import array
+from enum import IntEnum
+import math
+
+NO_NODE = -1
+
+
+class Op(IntEnum):
+    """Mã thao tác của một bước (tên viết thường trùng với chuỗi dùng trong tuple cũ)."""
+    VISIT = 1
+    PROCESS = 2
+    EXPLORE = 3
+    FINISH = 4
+    UPDATE_DISTANCE = 5
+    ADD_NODE_TO_MST = 6
+    ADD_EDGE_TO_MST = 7
+    EXPLORE_EDGE = 8
+    TEST_EDGE = 9
+    DISCARD_EDGE = 10
+    PIVOT = 11
+    ROUND = 12
+    NEGATIVE_CYCLE_EDGE = 13
+    VISIT_REVERSE = 14
+    UPDATE_DISTANCE_REVERSE = 15
+    PATH_EDGE = 16
+    LEVEL = 17
+
+
+# Cách giải mã mỗi op về dạng tuple cũ:
+#   'node'  -> (tên, nút a)
+#   'edge'  -> (tên, nút a, nút b)
+#   'dist'  -> (tên, nút a, giá trị, nút b hoặc None)
+#   'count' -> (tên, nút a, số nguyên)
+#   'number'-> (tên, số nguyên)
+#   'none'  -> (tên, None, None)
+_OP_SHAPES = {
+    Op.VISIT: 'node',
+    Op.PROCESS: 'node',
+    Op.ADD_NODE_TO_MST: 'node',
+    Op.EXPLORE: 'edge',
+    Op.ADD_EDGE_TO_MST: 'edge',
+    Op.EXPLORE_EDGE: 'edge',
+    Op.TEST_EDGE: 'edge',
+    Op.DISCARD_EDGE: 'edge',
+    Op.UPDATE_DISTANCE: 'dist',
+    Op.FINISH: 'none',
+    Op.PIVOT: 'count',
+    Op.ROUND: 'number',
+    Op.NEGATIVE_CYCLE_EDGE: 'edge',
+    Op.VISIT_REVERSE: 'node',
+    Op.UPDATE_DISTANCE_REVERSE: 'dist',
+    Op.PATH_EDGE: 'edge',
+    Op.LEVEL: 'number',
+}
+_OP_NAMES = {op: op.name.lower() for op in Op}
+_OPS_BY_NAME = {name: op for op, name in _OP_NAMES.items()}
+
+
+def register_op(op, shape):
+    """Đăng ký cách giải mã cho op mới (dùng khi strategy thêm loại bước riêng)."""
+    _OP_SHAPES[op] = shape
+    _OP_NAMES[op] = op.name.lower()
+    _OPS_BY_NAME[op.name.lower()] = op
+
+
+def decode_step(labels, integral_values, op, a, b, value):
+    """Giải mã một bước dạng số về tuple cũ, ví dụ ('explore', 'A', 'B')."""
+    shape = _OP_SHAPES[op]
+    name = _OP_NAMES[op]
+    if shape == 'node':
+        return name, labels[a]
+    if shape == 'edge':
+        return name, labels[a], labels[b]
+    if shape == 'dist':
+        if integral_values and value.is_integer():
+            value = int(value)
+        return name, labels[a], value, None if b == NO_NODE else labels[b]
+    if shape == 'count':
+        return name, labels[a], int(value)
+    if shape == 'number':
+        return name, int(value)
+    return name, None, None
+
+
+def _extend_column(column, values):
+    if hasattr(values, 'dtype'):
+        column.frombytes(values.astype(column.typecode, copy=False).tobytes())
+    elif isinstance(values, array) and values.typecode != column.typecode:
+        column.extend(values.tolist())
+    else:
+        column.extend(values)
+
+
+class StepTrace:
+    """
+    Danh sách bước nén: các mảng song song có kiểu
+    (op: uint8, a/b: id nút int32, value: float64) thay cho list các tuple chuỗi.
+
+    Truy cập trace[i] trả về tuple giống hệt dạng cũ, ví dụ ('explore', 'A', 'B'),
+    nên code render_step/apply_step hiện có vẫn chạy được. Cắt lát (trace[i:j])
+    là view O(1) dùng chung mảng với trace gốc.
+
+    Trace đã đủ bước nên có sẵn exhausted/running/ensure/poll/close giống
+    StreamingTrace: VisualizerView dùng được cả hai (ví dụ trace lấy từ TraceCache).
+    """
+    exhausted = True
+    running = False
+
+    def __init__(self, labels, integral_values=False):
+        self.labels = labels
+        # True nếu giá trị (khoảng cách, ...) là số nguyên: giải mã thành int
+        self.integral_values = integral_values
+        self.op = array('B')
+        self.a = array('i')
+        self.b = array('i')
+        self.value = array('d')
+        self._start = 0
+        self._stop = None  # None: trace gốc, dài theo mảng
+
+    @classmethod
+    def for_graph(cls, graph):
+        return cls(graph.labels, integral_values=graph.has_integer_weights)
+
+    @classmethod
+    def from_columns(cls, labels, integral_values, op, a, b, value):
+        """Trace chỉ đọc trên các cột có sẵn (array hoặc memoryview, ví dụ vùng mmap)."""
+        trace = cls(labels, integral_values)
+        trace.op, trace.a, trace.b, trace.value = op, a, b, value
+        return trace
+
+    # ------------------------------------------------------------------
+    # Ghi
+    # ------------------------------------------------------------------
+    def push(self, op, a=NO_NODE, b=NO_NODE, value=math.nan):
+        """Thêm một bước ở dạng số nguyên (đường nhanh cho các thuật toán)."""
+        self.op.append(op)
+        self.a.append(a)
+        self.b.append(b)
+        self.value.append(value)
+
+    def append(self, step):
+        """Thêm một bước ở dạng tuple cũ, ví dụ ('visit', 'A')."""
+        op = _OPS_BY_NAME[step[0]]
+        shape = _OP_SHAPES[op]
+        id_of = self.labels.id_of
+        if shape == 'node':
+            self.push(op, id_of(step[1]))
+        elif shape == 'edge':
+            self.push(op, id_of(step[1]), id_of(step[2]))
+        elif shape == 'dist':
+            parent = step[3] if len(step) > 3 else None
+            self.push(op, id_of(step[1]),
+                      NO_NODE if parent is None else id_of(parent), step[2])
+        elif shape == 'count':
+            self.push(op, id_of(step[1]), NO_NODE, step[2])
+        elif shape == 'number':
+            self.push(op, NO_NODE, NO_NODE, step[1])
+        else:
+            self.push(op)
+
+    def extend(self, raw_steps):
+        """Nối các bước số (op, a[, b[, value]]) — ví dụ từ iter_steps()."""
+        push = self.push
+        for step in raw_steps:
+            push(*step)
+
+    def extend_columns(self, op, a, b=None, value=None):
+        """
+        Nối len(a) bước cùng một op: a, b, value là các dãy cùng độ dài (list, array
+        hoặc mảng NumPy); b bỏ trống là NO_NODE, value bỏ trống là nan.
+        Mảng NumPy được chép thẳng theo byte, không tạo tuple cho từng bước.
+        """
+        count = len(a)
+        self.op.frombytes(bytes((op,)) * count)
+        _extend_column(self.a, a)
+        if b is None:
+            self.b.extend(array('i', [NO_NODE]) * count)
+        else:
+            _extend_column(self.b, b)
+        if value is None:
+            self.value.extend(array('d', [math.nan]) * count)
+        else:
+            _extend_column(self.value, value)
+
+    # ------------------------------------------------------------------
+    # Đọc
+    # ------------------------------------------------------------------
+    def __len__(self):
+        stop = len(self.op) if self._stop is None else self._stop
+        return stop - self._start
+
+    def raw(self, index):
+        """Bước thứ index ở dạng số: (op, a, b, value)."""
+        i = self._start + index
+        return self.op[i], self.a[i], self.b[i], self.value[i]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._slice(index)
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('StepTrace index out of range')
+        return self._decode(self._start + index)
+
+    def _decode(self, i):
+        return decode_step(self.labels, self.integral_values,
+                           self.op[i], self.a[i], self.b[i], self.value[i])
+
+    def _slice(self, index):
+        start, stop, stride = index.indices(len(self))
+        if stride != 1:
+            return [self[i] for i in range(start, stop, stride)]
+        view = StepTrace.__new__(StepTrace)
+        view.labels = self.labels
+        view.integral_values = self.integral_values
+        view.op, view.a, view.b, view.value = self.op, self.a, self.b, self.value
+        view._start = self._start + start
+        view._stop = self._start + max(start, stop)
+        return view
+
+    def __iter__(self):
+        for i in range(self._start, self._start + len(self)):
+            yield self._decode(i)
+
+    def ensure(self, index):
+        return index < len(self)
+
+    def poll(self, max_steps=None):
+        return 0
+
+    def close(self):
+        pass
+
+    def __eq__(self, other):
+        if isinstance(other, StepTrace):
+            return len(self) == len(other) and all(
+                self.raw(i) == other.raw(i) or self[i] == other[i]
+                for i in range(len(self)))
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"<StepTrace {len(self)} steps>"
@@ -0,0 +1,134 @@
+import importlib
+import json
+import os
+import sys
+from collections.abc import Mapping
+
+from .TraceCache import default_cache_dir
+
+# Nhóm entry point để gói ngoài đăng ký strategy, ví dụ trong pyproject.toml:
+#   [project.entry-points."graph_illustration.strategies"]
+#   "Johnson" = "my_package.johnson:JohnsonStrategy"
+ENTRY_POINT_GROUP = 'graph_illustration.strategies'
+
+
+class StrategyRegistry(Mapping):
+    """
+    Tên hiển thị -> Strategy class, nhưng chỉ lưu đường dẫn import ('module:Class'):
+    module của strategy chỉ được import khi lấy class lần đầu (registry[name]),
+    nên liệt kê tên (menu, --help) không phải import NumPy hay các strategy nặng.
+
+    Strategy của gói ngoài được tìm qua entry point ENTRY_POINT_GROUP ở lần đầu cần
+    danh sách tên; trùng tên với strategy có sẵn thì bị bỏ qua. Quét entry point
+    (importlib.metadata) tốn vài chục ms nên kết quả được lưu ở `cache_path`, dùng
+    lại khi các thư mục cài gói trong sys.path không đổi (không cài/gỡ gói nào).
+    """
+
+    def __init__(self, paths=(), entry_point_group=ENTRY_POINT_GROUP, cache_path=None):
+        # Tên -> 'module:Class' hoặc class đã import
+        self._entries = dict(paths)
+        self._entry_point_group = entry_point_group
+        self._discovered = entry_point_group is None
+        self.cache_path = cache_path or os.path.join(os.path.dirname(default_cache_dir()),
+                                                     'entry_points.json')
+
+    def register(self, name, target):
+        """Đăng ký (hoặc thay) một strategy: target là 'module:Class' hoặc chính class."""
+        self._entries[name] = target
+
+    def path_of(self, name):
+        """Đường dẫn 'module:Class' của strategy (không import)."""
+        target = self._names()[name]
+        return target if isinstance(target, str) else f"{target.__module__}:{target.__qualname__}"
+
+    def is_loaded(self, name):
+        return not isinstance(self._names()[name], str)
+
+    def __getitem__(self, name):
+        target = self._names()[name]
+        if isinstance(target, str):
+            target = self._entries[name] = _load(target)
+        return target
+
+    def __iter__(self):
+        return iter(self._names())
+
+    def __len__(self):
+        return len(self._names())
+
+    def __contains__(self, name):
+        return name in self._names()
+
+    def _names(self):
+        if not self._discovered:
+            self._discovered = True
+            for name, path in self._discover():
+                self._entries.setdefault(name, path)
+        return self._entries
+
+    def _discover(self):
+        """[(tên, 'module:Class')] của các entry point, lấy từ file cache nếu còn đúng."""
+        group = self._entry_point_group
+        stamp = [sys.version, group, _path_stamp()]
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached['stamp'] == stamp:
+                return cached['entry_points']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        found = [[entry_point.name, entry_point.value] for entry_point in _entry_points(group)]
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'stamp': stamp, 'entry_points': found}, f)
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            pass  # Không ghi được cache: lần sau quét lại
+        return found
+
+
+def _load(path):
+    module_name, _, attribute = path.partition(':')
+    target = importlib.import_module(module_name)
+    for part in attribute.split('.') if attribute else ():
+        target = getattr(target, part)
+    return target
+
+
+def _path_stamp():
+    """
+    Thời điểm sửa của các thư mục cài gói trong sys.path: đổi khi cài hoặc gỡ gói.
+    Bỏ qua '' và thư mục của script (sys.path[0]): sửa file trong thư mục làm việc
+    không làm mất cache; chỉ tính site-packages và các thư mục có *.dist-info.
+    """
+    script_dir = sys.path[0] if sys.path else ''
+    stamp = []
+    for path in sys.path:
+        if not path or path == script_dir or not _is_install_dir(path):
+            continue
+        try:
+            stamp.append([path, os.stat(path).st_mtime_ns])
+        except OSError:
+            pass
+    return stamp
+
+
+def _is_install_dir(path):
+    if os.path.basename(os.path.normpath(path)) in ('site-packages', 'dist-packages'):
+        return True
+    try:
+        with os.scandir(path) as entries:
+            return any(entry.name.endswith(('.dist-info', '.egg-info')) for entry in entries)
+    except OSError:  # không tồn tại, hoặc là file zip
+        return False
+
+
+def _entry_points(group):
+    # Import importlib.metadata mất vài chục ms: chỉ import khi phải quét lại
+    from importlib.metadata import entry_points
+    try:
+        return entry_points(group=group)
+    except TypeError:  # Python < 3.10: dict theo nhóm
+        return entry_points().get(group, ())
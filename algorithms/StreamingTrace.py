@@ -0,0 +1,195 @@
+import struct
+import tempfile
+
+from .StepTrace import StepTrace, decode_step
+from .TraceWorker import TraceWorker
+
+# Mỗi bước khi ghi ra đĩa: op (uint8), a, b (int32), value (float64)
+_RECORD = struct.Struct('<Biid')
+# Số bản ghi đọc một lần khi truy cập phần đã ghi ra đĩa
+_READ_BLOCK = 4096
+
+
+class StreamingTrace:
+    """
+    Danh sách bước được sinh dần từ generator iter_steps() của strategy.
+
+    - Chỉ kéo thêm bước khi có người cần (trace[i] hoặc ensure(i)),
+      nên có thể hiển thị bước 0 ngay mà không chờ chạy xong thuật toán.
+    - Trong bộ nhớ chỉ giữ tối đa `capacity` bước gần nhất; phần cũ hơn
+      được ghi ra file tạm (spill=True) hoặc bỏ đi (spill=False).
+    - len(trace) là số bước đã sinh được; `exhausted` cho biết đã hết chưa.
+    - background=True: generator chạy trong luồng nền (TraceWorker); ensure()
+      không chờ mà chỉ nhận các bước đã có, bên dùng gọi poll() định kỳ.
+    """
+
+    def __init__(self, raw_steps, labels, integral_values=False,
+                 capacity=1_000_000, spill=True, background=False):
+        if background:
+            self._worker = TraceWorker(raw_steps)
+            self._source = None
+        else:
+            self._worker = None
+            self._source = iter(raw_steps)
+        self.labels = labels
+        self.integral_values = integral_values
+        self.capacity = max(capacity, 2)
+        self.spill = spill
+        self.exhausted = False
+
+        self._window = StepTrace(labels, integral_values)
+        # Chỉ số (tuyệt đối) của bước đầu tiên đang nằm trong _window
+        self._window_start = 0
+        self._spill_file = None
+        self._spilled = 0
+        self._block_start = -1
+        self._block = b''
+        # Không bỏ các bước từ chỉ số này trở đi (người đọc chưa dùng tới)
+        self._keep_from = 0
+
+    # ------------------------------------------------------------------
+    # Kéo thêm bước từ generator
+    # ------------------------------------------------------------------
+    def ensure(self, index):
+        """Kéo thêm bước cho tới khi có bước `index` (hoặc hết). Trả về True nếu có."""
+        if self._worker is not None:
+            if index >= len(self):
+                self.poll()
+            return index < len(self)
+        window = self._window
+        push = window.push
+        source = self._source
+        while not self.exhausted and self._window_start + len(window) <= index:
+            step = next(source, None)
+            if step is None:
+                self.exhausted = True
+                self._source = None
+                break
+            push(*step)
+            if len(window) > self.capacity:
+                self._evict()
+        return index < len(self)
+
+    def pull(self, count):
+        """Kéo thêm tối đa `count` bước; trả về số bước thực sự kéo được."""
+        before = len(self)
+        self.ensure(before + count - 1)
+        return len(self) - before
+
+    def poll(self, max_steps=None):
+        """
+        Nhận các bước luồng nền đã sinh (không chờ); trả về số bước nhận được.
+        Ở chế độ bỏ bước chỉ nhận tới khi cửa sổ đầy, để luồng nền tự dừng chờ người xem.
+        """
+        worker = self._worker
+        if worker is None:
+            return 0
+        if not self.spill:
+            room = self._keep_from + self.capacity - len(self)
+            if room <= 0:
+                return 0
+            max_steps = room if max_steps is None else min(max_steps, room)
+        steps, done = worker.drain(max_steps)
+        window = self._window
+        push = window.push
+        for step in steps:
+            push(*step)
+            if len(window) > self.capacity:
+                self._evict()
+        if done:
+            self.exhausted = True
+            self._worker = None
+            if worker.error is not None:
+                raise worker.error
+        return len(steps)
+
+    @property
+    def running(self):
+        """Luồng nền còn đang sinh bước."""
+        return self._worker is not None
+
+    def keep_from(self, index):
+        """Báo rằng người đọc vẫn cần các bước từ `index`; chế độ bỏ bước sẽ không xóa chúng."""
+        self._keep_from = max(index, 0)
+
+    def _evict(self):
+        """Đưa nửa cũ của cửa sổ ra đĩa (hoặc bỏ đi) để giữ bộ nhớ trong giới hạn."""
+        window = self._window
+        count = len(window) // 2
+        if not self.spill:
+            # Chưa được dùng tới thì chưa bỏ (cửa sổ tạm thời vượt capacity)
+            count = min(count, self._keep_from - self._window_start)
+            if count <= 0:
+                return
+        else:
+            if self._spill_file is None:
+                self._spill_file = tempfile.TemporaryFile(prefix='trace-', suffix='.bin')
+            pack = _RECORD.pack
+            self._spill_file.seek(0, 2)
+            self._spill_file.write(b''.join(
+                pack(window.op[i], window.a[i], window.b[i], window.value[i])
+                for i in range(count)))
+            self._spilled += count
+            self._block_start = -1  # khối đọc dở có thể đã thiếu bản ghi mới
+        for column in (window.op, window.a, window.b, window.value):
+            del column[:count]
+        self._window_start += count
+
+    # ------------------------------------------------------------------
+    # Đọc
+    # ------------------------------------------------------------------
+    def __len__(self):
+        return self._window_start + len(self._window)
+
+    @property
+    def first_index(self):
+        """Chỉ số nhỏ nhất còn đọc lại được (0 nếu có ghi ra đĩa)."""
+        return 0 if self.spill else self._window_start
+
+    def __getitem__(self, index):
+        if index < 0:
+            self.ensure(float('inf'))
+            index += len(self)
+        if not self.ensure(index) or index < 0:
+            raise IndexError('StreamingTrace index out of range')
+        if index >= self._window_start:
+            return self._window[index - self._window_start]
+        if not self.spill:
+            raise IndexError(f'Bước {index} đã bị bỏ khỏi bộ nhớ (spill=False)')
+        return decode_step(self.labels, self.integral_values, *self._read_spilled(index))
+
+    def _read_spilled(self, index):
+        block_start = index - index % _READ_BLOCK
+        if block_start != self._block_start:
+            count = min(_READ_BLOCK, self._spilled - block_start)
+            self._spill_file.seek(block_start * _RECORD.size)
+            self._block = self._spill_file.read(count * _RECORD.size)
+            self._block_start = block_start
+        return _RECORD.unpack_from(self._block, (index - block_start) * _RECORD.size)
+
+    def __iter__(self):
+        i = 0
+        while self.ensure(i):
+            yield self[i]
+            i += 1
+
+    def close(self):
+        """Dừng generator (hoặc luồng nền) và xóa file tạm."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self._source is not None:
+            # Chạy các khối finally của generator ngay (bộ đếm profiler, file tạm của
+            # TraceCache) thay vì đợi bộ thu gom rác
+            close = getattr(self._source, 'close', None)
+            if close is not None:
+                close()
+            self._source = None
+        self.exhausted = True
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def __repr__(self):
+        state = 'done' if self.exhausted else 'streaming'
+        return f"<StreamingTrace {len(self)} steps, {state}>"
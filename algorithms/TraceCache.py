@@ -0,0 +1,218 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from .StepTrace import StepTrace
+
+TRACE_MAGIC = b'STEPTRC1'
+# magic, byteorder, integral_values, (pad), số bước
+_TRACE_HEADER = struct.Struct('<8scB6xq')
+# Thứ tự và kiểu các cột trong file (mỗi cột căn lề 8 byte để cast được memoryview)
+_COLUMNS = (('op', 'B'), ('a', 'i'), ('b', 'i'), ('value', 'd'))
+# Số bước gom lại trước khi ghi ra file tạm của từng cột
+_FLUSH_STEPS = 1 << 16
+
+
+def default_cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'graph_illustration', 'traces')
+
+
+def _padded(size):
+    return (size + 7) & ~7
+
+
+def _byteorder():
+    return b'L' if sys.byteorder == 'little' else b'B'
+
+
+class TraceCache:
+    """
+    Cache trace trên đĩa, đánh địa chỉ theo nội dung:
+    khóa = băm(graph.fingerprint(), tên strategy, strategy.version, nút bắt đầu, options,
+    strategy.cache_options(graph)).
+
+    - Mỗi trace là một file nhị phân dạng cột (op, a, b, value), mở lại bằng mmap
+      nên chạy lại đồ thị lớn không phải sinh lại hay đọc hết trace vào RAM.
+    - Tổng dung lượng giới hạn bởi `max_bytes`: vượt quá thì xóa các file lâu
+      không dùng nhất (LRU theo mtime, được cập nhật mỗi lần đọc trúng).
+    - Trace chỉ được ghi khi generator chạy hết; bị hủy giữa chừng thì bỏ đi.
+    """
+
+    def __init__(self, directory=None, max_bytes=1 << 30):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key_for(strategy, graph, start_node, options=None):
+        cache_options = getattr(strategy, 'cache_options', None)
+        settings = cache_options(graph) if cache_options is not None else {}
+        parts = [graph.fingerprint(), type(strategy).__name__,
+                 str(getattr(strategy, 'version', 0)), repr(start_node),
+                 repr(sorted((options or {}).items())), repr(sorted(settings.items()))]
+        return hashlib.blake2b('\0'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key + '.trace')
+
+    # ------------------------------------------------------------------
+    # Đọc
+    # ------------------------------------------------------------------
+    def load(self, strategy, graph, start_node, options=None):
+        """StepTrace chỉ đọc (mmap) nếu có trong cache, ngược lại None."""
+        path = self.path_for(self.key_for(strategy, graph, start_node, options))
+        try:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # không có file, hoặc file rỗng (ValueError của mmap)
+            return None
+        trace = self._open(mapped, graph.labels)
+        if trace is None:
+            mapped.close()
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # đánh dấu vừa dùng (LRU)
+        except OSError:
+            pass
+        return trace
+
+    @staticmethod
+    def _open(mapped, labels):
+        view = memoryview(mapped)
+        if len(view) < _TRACE_HEADER.size:
+            return None
+        magic, byteorder, integral_values, count = _TRACE_HEADER.unpack_from(view)
+        if magic != TRACE_MAGIC or byteorder != _byteorder():
+            return None
+        position = _padded(_TRACE_HEADER.size)
+        columns = []
+        for _, typecode in _COLUMNS:
+            size = count * struct.calcsize(typecode)
+            if position + size > len(view):
+                return None  # file ghi dở / bị cắt
+            columns.append(view[position:position + size].cast(typecode))
+            position += _padded(size)
+        trace = StepTrace.from_columns(labels, bool(integral_values), *columns)
+        # Giữ tham chiếu để vùng mmap sống cùng trace
+        trace._mmap = mapped
+        return trace
+
+    # ------------------------------------------------------------------
+    # Ghi
+    # ------------------------------------------------------------------
+    def record(self, strategy, graph, start_node, options, raw_steps):
+        """
+        Bọc generator các bước số: chuyển tiếp từng bước, đồng thời ghi ra file
+        tạm theo cột; khi generator hết thì ghép thành file trace trong cache.
+        """
+        key = self.key_for(strategy, graph, start_node, options)
+        os.makedirs(self.directory, exist_ok=True)
+        files = [tempfile.TemporaryFile(dir=self.directory) for _ in _COLUMNS]
+        buffers = [array(typecode) for _, typecode in _COLUMNS]
+        op, a, b, value = buffers
+        count = 0
+        completed = False
+        try:
+            for step in raw_steps:
+                op.append(step[0])
+                a.append(step[1] if len(step) > 1 else -1)
+                b.append(step[2] if len(step) > 2 else -1)
+                value.append(step[3] if len(step) > 3 else float('nan'))
+                count += 1
+                if len(op) >= _FLUSH_STEPS:
+                    self._flush(files, buffers)
+                yield step
+            completed = True
+        finally:
+            close = getattr(raw_steps, 'close', None)
+            if close is not None:
+                close()
+            try:
+                if completed:
+                    self._flush(files, buffers)
+                    self._write(key, files, count, graph.has_integer_weights)
+            finally:
+                for f in files:
+                    f.close()
+
+    @staticmethod
+    def _flush(files, buffers):
+        for f, buffer in zip(files, buffers):
+            buffer.tofile(f)
+            del buffer[:]
+
+    def _write(self, key, files, count, integral_values):
+        path = self.path_for(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                header = _TRACE_HEADER.pack(TRACE_MAGIC, _byteorder(), int(integral_values), count)
+                out.write(header)
+                out.write(bytes(_padded(len(header)) - len(header)))
+                for f in files:
+                    f.seek(0)
+                    size = 0
+                    while True:
+                        block = f.read(1 << 20)
+                        if not block:
+                            break
+                        out.write(block)
+                        size += len(block)
+                    out.write(bytes(_padded(size) - size))
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(tmp_path)
+            return
+        self.evict()
+
+    # ------------------------------------------------------------------
+    # Dọn dẹp
+    # ------------------------------------------------------------------
+    def entries(self):
+        """Danh sách (mtime, kích thước, đường dẫn) các trace trong cache."""
+        found = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return found
+        for name in names:
+            if not name.endswith('.trace'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            found.append((stat.st_mtime, stat.st_size, path))
+        return found
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes=None):
+        """Xóa các trace lâu không dùng nhất cho tới khi tổng dung lượng <= max_bytes."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            # File đang được mmap trên Windows không xóa được: bỏ qua, lần sau thử lại
+            if self._remove(path):
+                total -= size
+
+    def clear(self):
+        self.evict(0)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
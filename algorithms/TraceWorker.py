@@ -0,0 +1,70 @@
+import queue
+import threading
+
+
+class TraceWorker:
+    """
+    Chạy generator iter_steps() trong một luồng nền, gửi các bước về theo
+    từng lô qua hàng đợi. Luồng giao diện chỉ gọi drain() (không bao giờ chờ),
+    nên cửa sổ Tk không bị treo khi thuật toán chạy lâu.
+
+    Hàng đợi có giới hạn `max_chunks` lô: nếu bên nhận không lấy kịp thì luồng
+    nền tạm dừng, bộ nhớ không tăng vô hạn. cancel() dừng luồng ở lô kế tiếp.
+    """
+
+    def __init__(self, raw_steps, chunk=2048, max_chunks=64):
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._cancelled = threading.Event()
+        # Lỗi xảy ra trong generator (được ném lại ở luồng chính qua StreamingTrace.poll)
+        self.error = None
+        self._thread = threading.Thread(target=self._run, args=(raw_steps, chunk),
+                                        name='trace-worker', daemon=True)
+        self._thread.start()
+
+    def _run(self, raw_steps, chunk):
+        batch = []
+        try:
+            for step in raw_steps:
+                batch.append(step)
+                if len(batch) >= chunk:
+                    if not self._put(batch):
+                        return
+                    batch = []
+        except Exception as e:
+            self.error = e
+        finally:
+            close = getattr(raw_steps, 'close', None)
+            if close is not None:
+                close()
+        if not batch or self._put(batch):
+            # None: báo đã hết bước
+            self._put(None)
+
+    def _put(self, item):
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def drain(self, max_steps=None):
+        """Lấy các bước đã sẵn sàng, không chờ. Trả về (danh sách bước, đã hết chưa)."""
+        steps = []
+        while max_steps is None or len(steps) < max_steps:
+            try:
+                batch = self._queue.get_nowait()
+            except queue.Empty:
+                return steps, False
+            if batch is None:
+                return steps, True
+            steps.extend(batch)
+        return steps, False
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def cancel(self):
+        self._cancelled.set()
@@ -1,5 +1,22 @@
-from .BFSStrategy import BFSStrategy
-from .DFSStrategy import DFSStrategy
-from .DijkstraStrategy import DijkstraStrategy
-from .PrimStrategy import PrimStrategy
-from .KruskalStrategy import KruskalStrategy
\ No newline at end of file
+from .StrategyRegistry import StrategyRegistry, ENTRY_POINT_GROUP
+
+# Strategy có sẵn: tên hiển thị -> đường dẫn import 'module:Class'
+BUILTIN_STRATEGIES = {
+    "BFS": "algorithms.BFSStrategy:BFSStrategy",
+    "DFS": "algorithms.DFSStrategy:DFSStrategy",
+    "Dijkstra": "algorithms.DijkstraStrategy:DijkstraStrategy",
+    "Prim": "algorithms.PrimStrategy:PrimStrategy",
+    "Kruskal": "algorithms.KruskalStrategy:KruskalStrategy",
+    "Floyd": "algorithms.FloydStrategy:FloydStrategy",
+    "Bellman-Ford": "algorithms.BellmanFordStrategy:BellmanFordStrategy",
+    "A*": "algorithms.AStarStrategy:AStarStrategy",
+    "Bidirectional Dijkstra": "algorithms.BidirectionalDijkstraStrategy:BidirectionalDijkstraStrategy",
+    "Bidirectional BFS": "algorithms.BidirectionalBFSStrategy:BidirectionalBFSStrategy",
+    "Level BFS": "algorithms.LevelBFSStrategy:LevelBFSStrategy",
+}
+
+# Key: tên hiển thị, Value: Strategy class (dùng chung cho App và headless runner).
+# Module của strategy chỉ được import khi được chọn lần đầu; có thêm strategy của
+# các gói ngoài đăng ký qua entry point.
+STRATEGIES = StrategyRegistry(BUILTIN_STRATEGIES)
+
@@ -1,7 +1,10 @@
+import os
 import tkinter as tk
+from tkinter import messagebox
+from core.Graph import Graph
 from ui.MainMenuView import MainMenuView
-from ui.VisualizerView import VisualizerView
-from algorithms import BFSStrategy,DFSStrategy,DijkstraStrategy,PrimStrategy,KruskalStrategy
+from algorithms import STRATEGIES
+from algorithms.TraceCache import TraceCache
 
 
 class App(tk.Tk):
@@ -13,14 +16,16 @@ class App(tk.Tk):
         # Lưu trữ frame đang hiển thị
         self._current_view = None
 
-        # Key: tên hiển thị, Value: Strategy class
-        self.strategies = {
-            "BFS": BFSStrategy,
-            "DFS": DFSStrategy,
-            "Dijkstra": DijkstraStrategy,
-            "Prim": PrimStrategy,
-            "Kruskal": KruskalStrategy,
-        }
+        # Đồ thị đang dùng (mặc định là đồ thị mẫu A–E)
+        self.graph = Graph()
+        self.graph_name = "Đồ thị mẫu"
+        # Bật profiler cho các strategy (checkbox "Profile" trong trang minh họa)
+        self.profiling = False
+        # Trace đã chạy được lưu trên đĩa, mở lại strategy/đồ thị cũ là có ngay
+        self.trace_cache = TraceCache()
+
+        # Key: tên hiển thị, Value: Strategy class (StrategyRegistry: import khi được chọn)
+        self.strategies = STRATEGIES
 
         # Hiển thị menu chính
         self.show_main_menu()
@@ -34,15 +39,34 @@ class App(tk.Tk):
         self._current_view = MainMenuView(self, self)
         self._current_view.pack(fill="both", expand=True)
 
+    def load_graph(self, path):
+        """Đọc đồ thị từ file (edge list, DIMACS, Matrix Market, snapshot)."""
+        try:
+            self.graph = Graph.from_file(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Lỗi", f"Không đọc được đồ thị:\n{e}")
+            return
+        self.graph_name = os.path.basename(path)
+        self.show_main_menu()
+
     def show_visualizer(self, strategy_name):
         """Dọn dẹp menu và hiển thị trang minh họa."""
         if self._current_view:
             self._current_view.destroy()
 
-        # Lấy strategy class từ tên
-        StrategyClass = self.strategies.get(strategy_name)
+        # Lấy strategy class từ tên (lần đầu: import module của strategy)
+        try:
+            StrategyClass = self.strategies.get(strategy_name)
+        except (ImportError, AttributeError) as e:
+            # Ví dụ strategy của gói ngoài thiếu thư viện
+            messagebox.showerror("Lỗi", f"Không nạp được '{strategy_name}':\n{e}")
+            self.show_main_menu()
+            return
 
         if StrategyClass:
+            # Trang minh họa kéo theo trace/luồng nền: chỉ import khi mở lần đầu
+            from ui.VisualizerView import VisualizerView
+
             # Khởi tạo một đối tượng chiến lược mới
             strategy_instance = StrategyClass()
 
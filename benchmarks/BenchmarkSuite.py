@@ -0,0 +1,164 @@
+import gc
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from algorithms import STRATEGIES
+from core.compat import get_numpy
+from core.GraphGenerators import erdos_renyi_graph
+
+from .StubCanvas import StubCanvas
+
+# Số cạnh (vô hướng) của các đồ thị đo mặc định; 10^7 chỉ chạy khi chỉ định --sizes
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+# Các chỉ số so sánh với baseline (càng nhỏ càng tốt)
+COMPARED_METRICS = ('run_seconds', 'peak_bytes', 'render_ms_per_step')
+
+
+def benchmark_graph(num_edges, seed=0):
+    """Đồ thị ngẫu nhiên G(n, m) có `num_edges` cạnh, bậc trung bình 4, trọng số 1..100."""
+    return erdos_renyi_graph(max(num_edges // 2, 3), num_edges=num_edges, seed=seed)
+
+
+def _best_time(func, min_total=0.2, max_repeats=5):
+    """Thời gian nhỏ nhất của func() (lặp lại với phép đo ngắn để bớt nhiễu)."""
+    best, total, repeats = float('inf'), 0.0, 0
+    while repeats < max_repeats and (repeats == 0 or total < min_total):
+        gc.collect()
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best, total, repeats = min(best, elapsed), total + elapsed, repeats + 1
+    return best, result
+
+
+def measure_run(strategy_class, graph, start):
+    """Thời gian run(), số bước, thông lượng và bộ nhớ đỉnh (tracemalloc, chạy riêng)."""
+    seconds, steps = _best_time(lambda: strategy_class().run(graph, start))
+    num_steps = len(steps)
+    del steps
+
+    gc.collect()
+    tracemalloc.start()
+    steps = strategy_class().run(graph, start)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del steps
+    return {
+        'run_seconds': seconds,
+        'steps': num_steps,
+        'steps_per_second': num_steps / seconds if seconds > 0 else None,
+        'peak_bytes': peak,
+    }
+
+
+def measure_render(strategy_class, graph, start, canvas, forward=2000, backward=200,
+                   seeks=50, seed=0):
+    """
+    Thời gian trung bình mỗi render_step: đi tiến `forward` bước, lùi `backward`
+    bước rồi nhảy ngẫu nhiên `seeks` lần (giống người dùng kéo thanh trượt).
+    Lần vẽ đầu (tạo item cho cả đồ thị) được đo riêng.
+    """
+    strategy = strategy_class()
+    steps = strategy.run(graph, start)
+    if not len(steps):
+        return {}
+    started = time.perf_counter()
+    strategy.render_step(canvas, graph, steps, 0)
+    first_ms = (time.perf_counter() - started) * 1000
+
+    last = len(steps) - 1
+    forward_to = min(forward, last)
+    rng = random.Random(seed)
+    order = list(range(1, forward_to + 1))
+    order += range(forward_to - 1, max(forward_to - backward, 0) - 1, -1)
+    order += [rng.randint(0, last) for _ in range(seeks)]
+    started = time.perf_counter()
+    for index in order:
+        strategy.render_step(canvas, graph, steps, index)
+    elapsed = time.perf_counter() - started
+    return {
+        'first_render_ms': first_ms,
+        'render_ms_per_step': elapsed * 1000 / max(len(order), 1),
+    }
+
+
+def make_canvas(use_tk=False):
+    """Canvas Tk ẩn nếu có màn hình và được yêu cầu, nếu không thì StubCanvas."""
+    if use_tk:
+        try:
+            import tkinter as tk
+            root = tk.Tk()
+            root.withdraw()
+            return tk.Canvas(root, width=800, height=600)
+        except (ImportError, RuntimeError) as e:  # TclError là RuntimeError
+            print(f"Không tạo được canvas Tk ({e}), dùng StubCanvas", file=sys.stderr)
+    return StubCanvas()
+
+
+def run_suite(sizes=DEFAULT_SIZES, strategies=None, render_max_edges=100_000,
+              use_tk=False, seed=0, log=None):
+    """Chạy toàn bộ phép đo; trả về dict có thể ghi ra JSON."""
+    strategies = strategies or list(STRATEGIES)
+    results = {}
+    for num_edges in sizes:
+        graph = benchmark_graph(num_edges, seed)
+        start = graph.default_start_node()
+        for name in strategies:
+            key = f"{name}/{num_edges}"
+            strategy_class = STRATEGIES[name]
+            max_nodes = getattr(strategy_class, 'max_nodes', None)
+            if max_nodes is not None and graph.num_nodes > max_nodes:
+                if log is not None:
+                    log(f"{key:<20} bỏ qua: {graph.num_nodes} nút > max_nodes = {max_nodes}")
+                continue
+            entry = measure_run(strategy_class, graph, start)
+            if num_edges <= render_max_edges:
+                entry.update(measure_render(strategy_class, graph, start,
+                                            make_canvas(use_tk), seed=seed))
+            entry['nodes'] = graph.num_nodes
+            entry['edges'] = num_edges
+            results[key] = entry
+            if log is not None:
+                log(format_entry(key, entry))
+        del graph
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': get_numpy() is not None,
+            'canvas': 'tk' if use_tk else 'stub',
+        },
+        'results': results,
+    }
+
+
+def format_entry(key, entry):
+    text = (f"{key:<20} run {entry['run_seconds'] * 1000:10.2f} ms"
+            f"  {entry['steps']:>10} steps"
+            f"  peak {entry['peak_bytes'] / 2**20:8.2f} MiB")
+    if 'render_ms_per_step' in entry:
+        text += f"  render {entry['render_ms_per_step']:.3f} ms/step"
+    return text
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    So sánh với baseline; trả về danh sách (key, metric, cũ, mới, tỉ lệ)
+    của các chỉ số tệ hơn quá `threshold` (0.2 = chậm/tốn hơn 20%).
+    """
+    regressions = []
+    old_results = baseline.get('results', {})
+    for key, entry in current.get('results', {}).items():
+        old = old_results.get(key)
+        if old is None:
+            continue
+        for metric in COMPARED_METRICS:
+            if metric not in entry or not old.get(metric):
+                continue
+            ratio = entry[metric] / old[metric]
+            if ratio > 1 + threshold:
+                regressions.append((key, metric, old[metric], entry[metric], ratio))
+    return regressions
@@ -0,0 +1,54 @@
+class StubCanvas:
+    """
+    Canvas giả (không cần Tk/màn hình) có đủ các hàm CanvasScene dùng.
+    Lưu thuộc tính item trong dict để chi phí gần với chi phí phía Python thật.
+    """
+
+    def __init__(self, width=800, height=600):
+        self.width = width
+        self.height = height
+        self.items = {}
+        self._next_id = 0
+
+    def _create(self, kind, coords, options):
+        self._next_id += 1
+        options['kind'] = kind
+        options['coords'] = coords
+        self.items[self._next_id] = options
+        return self._next_id
+
+    def create_line(self, *coords, **options):
+        return self._create('line', coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self._create('oval', coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create('text', coords, options)
+
+    def itemconfig(self, item, **options):
+        self.items[item].update(options)
+
+    itemconfigure = itemconfig
+
+    def coords(self, item, *coords):
+        self.items[item]['coords'] = coords
+
+    def delete(self, *items):
+        for item in items:
+            if item == 'all':
+                self.items.clear()
+            else:
+                self.items.pop(item, None)
+
+    def tag_lower(self, *args):
+        pass
+
+    def tag_raise(self, *args):
+        pass
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
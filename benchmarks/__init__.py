@@ -0,0 +1,6 @@
+"""
+Bộ đo hiệu năng cho các strategy: thời gian run(), render_step() và bộ nhớ đỉnh.
+
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json --threshold 0.2
+"""
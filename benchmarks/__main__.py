@@ -0,0 +1,51 @@
+import argparse
+import json
+import sys
+
+from algorithms import STRATEGIES
+
+from .BenchmarkSuite import DEFAULT_SIZES, compare, run_suite
+
+
+def _sizes(text):
+    return [int(float(size)) for size in text.split(',') if size]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Đo hiệu năng các strategy.")
+    parser.add_argument('--sizes', type=_sizes, default=list(DEFAULT_SIZES),
+                        help="Số cạnh, cách nhau bởi dấu phẩy (ví dụ 1e3,1e5,1e7)")
+    parser.add_argument('-s', '--strategy', action='append', choices=list(STRATEGIES),
+                        help="Chỉ đo strategy này (lặp lại được; mặc định: tất cả)")
+    parser.add_argument('--render-max-edges', type=int, default=100_000,
+                        help="Chỉ đo render_step với đồ thị có tối đa chừng này cạnh")
+    parser.add_argument('--tk', action='store_true',
+                        help="Đo render trên canvas Tk ẩn thay vì StubCanvas")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', metavar='FILE', help="Ghi kết quả ra file JSON (baseline)")
+    parser.add_argument('--compare', metavar='FILE', help="So sánh với baseline JSON")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Mức tệ hơn cho phép khi so sánh (mặc định 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.sizes, args.strategy, args.render_max_edges,
+                        args.tk, args.seed, log=print)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        for key, metric, old, new, ratio in regressions:
+            print(f"REGRESSION {key} {metric}: {old:.6g} -> {new:.6g} (x{ratio:.2f})")
+        if regressions:
+            return 1
+        print(f"Không có chỉ số nào tệ hơn quá {args.threshold:.0%} so với {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+from array import array
+
+
+class DisjointSet:
+    """
+    Union-Find trên mảng số nguyên (nút 0..n-1).
+
+    - find: nén đường đi kiểu "path halving" (không đệ quy).
+    - union: gộp theo kích thước (cây nhỏ treo dưới cây lớn).
+    Mỗi thao tác có chi phí khấu hao gần như hằng số.
+    """
+
+    def __init__(self, size):
+        self.parent = array('i', range(size))
+        self.size = array('q', [1]) * size
+        # Số tập hợp rời nhau hiện có
+        self.count = size
+
+    def __len__(self):
+        return len(self.parent)
+
+    def find(self, node):
+        """Hàm 'Find' (Tìm): Tìm nút đại diện cho tập hợp chứa 'node'."""
+        parent = self.parent
+        while parent[node] != node:
+            # Trỏ nút về ông của nó: rút ngắn đường đi một nửa
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(self, node1, node2):
+        """
+        Hàm 'Union' (Gộp): Gộp hai tập hợp chứa 'node1' và 'node2'.
+        Trả về False nếu chúng đã cùng 1 tập (cạnh nối chúng tạo chu trình).
+        """
+        root1 = self.find(node1)
+        root2 = self.find(node2)
+        if root1 == root2:
+            return False
+        size = self.size
+        if size[root1] < size[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        size[root1] += size[root2]
+        self.count -= 1
+        return True
+
+    def connected(self, node1, node2):
+        return self.find(node1) == self.find(node2)
@@ -0,0 +1,142 @@
+from array import array
+from numbers import Integral
+
+from .Graph import Graph
+
+
+class DynamicGraph:
+    """
+    Đồ thị có trọng số thay đổi được: add_edge / remove_edge / set_weight.
+
+    Giữ danh sách kề dạng dict (id nút -> {id nút kề: trọng số}) thay cho CSR bất biến
+    của Graph; tập nút (nhãn, tọa độ) giữ nguyên như đồ thị gốc. Vô hướng (mặc định)
+    thì mỗi cạnh là hai cung.
+
+    Các bộ duy trì (DynamicMST, DynamicShortestPaths) gắn vào bằng attach(); mỗi thao
+    tác gọi lại chúng và trả về list các trace sửa chữa (mỗi bộ một trace, theo thứ tự gắn).
+    to_graph() cho Graph (CSR) của trạng thái hiện tại để vẽ hoặc chạy lại từ đầu.
+    """
+
+    def __init__(self, graph, directed=False):
+        self.labels = graph.labels
+        self.directed = directed
+        self._xs, self._ys = graph.xs, graph.ys
+        num_nodes = graph.num_nodes
+        self._out = [{} for _ in range(num_nodes)]
+        # Vô hướng: cung vào trùng cung ra
+        self._in = self._out if not directed else [{} for _ in range(num_nodes)]
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        for u in range(num_nodes):
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                if u == v:
+                    continue
+                # Nhiều cung cùng cặp nút: giữ trọng số nhỏ nhất
+                weight = weights[k]
+                if weight < self._out[u].get(v, weight + 1):
+                    self._link(u, v, weight)
+        self.has_integer_weights = graph.has_integer_weights
+        self._maintainers = []
+        self._graph = None
+
+    # ------------------------------------------------------------------
+    # Truy vấn
+    # ------------------------------------------------------------------
+    @property
+    def num_nodes(self):
+        return len(self.labels)
+
+    def index_of(self, label):
+        return self.labels.id_of(label)
+
+    def neighbors(self, node_id):
+        """{id nút kề: trọng số} của các cung đi ra (chỉ đọc)."""
+        return self._out[node_id]
+
+    def in_neighbors(self, node_id):
+        """{id nút nguồn: trọng số} của các cung đi vào (chỉ đọc)."""
+        return self._in[node_id]
+
+    def weight(self, u_label, v_label):
+        return self._out[self.index_of(u_label)].get(self.index_of(v_label))
+
+    def edges(self):
+        """Các cạnh (u, v, trọng số) theo id; vô hướng thì mỗi cạnh một lần với u < v."""
+        for u, neighbors in enumerate(self._out):
+            for v, weight in neighbors.items():
+                if self.directed or u < v:
+                    yield u, v, weight
+
+    def to_graph(self):
+        """Graph (CSR) của trạng thái hiện tại; chỉ dựng lại sau khi có thay đổi."""
+        if self._graph is None:
+            sources, targets, weights = array('i'), array('i'), []
+            for u, neighbors in enumerate(self._out):
+                for v, weight in neighbors.items():
+                    sources.append(u)
+                    targets.append(v)
+                    weights.append(weight)
+            weights = array('q' if self.has_integer_weights else 'd', weights)
+            self._graph = Graph.from_arcs(self.labels, sources, targets, weights,
+                                          self._xs, self._ys)
+        return self._graph
+
+    # ------------------------------------------------------------------
+    # Thay đổi
+    # ------------------------------------------------------------------
+    def attach(self, maintainer):
+        """
+        Gắn một bộ duy trì (có on_add/on_remove/on_weight, tùy chọn check_weight);
+        trả về chính nó.
+        """
+        self._maintainers.append(maintainer)
+        return maintainer
+
+    def add_edge(self, u_label, v_label, weight):
+        u, v = self.index_of(u_label), self.index_of(v_label)
+        if u == v:
+            raise ValueError(f"Không thêm được khuyên tại '{u_label}'")
+        if v in self._out[u]:
+            raise ValueError(f"Đã có cạnh {u_label}-{v_label}")
+        self._check(weight)
+        self._changed(weight)
+        self._link(u, v, weight)
+        return [maintainer.on_add(u, v, weight) for maintainer in self._maintainers]
+
+    def remove_edge(self, u_label, v_label):
+        u, v = self.index_of(u_label), self.index_of(v_label)
+        weight = self._existing(u, v, u_label, v_label)
+        self._changed()
+        del self._out[u][v]
+        del self._in[v][u]
+        return [maintainer.on_remove(u, v, weight) for maintainer in self._maintainers]
+
+    def set_weight(self, u_label, v_label, weight):
+        u, v = self.index_of(u_label), self.index_of(v_label)
+        old = self._existing(u, v, u_label, v_label)
+        self._check(weight)
+        self._changed(weight)
+        self._link(u, v, weight)
+        return [maintainer.on_weight(u, v, old, weight) for maintainer in self._maintainers]
+
+    def _check(self, weight):
+        # Bộ duy trì có thể từ chối trọng số trước khi đồ thị bị đổi (ví dụ trọng số âm)
+        for maintainer in self._maintainers:
+            check = getattr(maintainer, 'check_weight', None)
+            if check is not None:
+                check(weight)
+
+    def _link(self, u, v, weight):
+        self._out[u][v] = weight
+        self._in[v][u] = weight
+
+    def _existing(self, u, v, u_label, v_label):
+        weight = self._out[u].get(v)
+        if weight is None:
+            raise ValueError(f"Không có cạnh {u_label}-{v_label}")
+        return weight
+
+    def _changed(self, weight=0):
+        self._graph = None
+        if not isinstance(weight, Integral):
+            self.has_integer_weights = False
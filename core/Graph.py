@@ -1,37 +1,565 @@
+import hashlib
+from array import array
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from core.compat import get_numpy
+
+
 class Graph:
+    """
+    Đồ thị lưu một lần duy nhất dưới dạng CSR (Compressed Sparse Row).
+
+    - Nhãn nút ('A', 'B', ...) được ánh xạ sang số nguyên 0..n-1.
+    - Các cung đi ra từ nút i nằm trong targets[offsets[i]:offsets[i + 1]],
+      trọng số tương ứng nằm cùng vị trí trong weights.
+    - nodes, unweighted_edges, weighted_edges, dijkstra_nodes,
+      dijkstra_weighted_edges chỉ là các view CHỈ ĐỌC trên các mảng này.
+    """
+
     def __init__(self):
-        self.nodes = {
-            'A': (100, 100),
-            'B': (250, 100),
-            'C': (100, 250),
-            'D': (250, 250),
-            'E': (400, 250),
-        }
-        self.unweighted_edges = {
-            'A': ['B', 'C'],
-            'B': ['A', 'D'],
-            'C': ['A', 'D'],
-            'D': ['B', 'C', 'E'],
-            'E': ['D']
-        }
-        self.weighted_edges = {
-            'A': {'B': 10, 'C': 3},
-            'B': {'A': 10, 'D': 2},
-            'C': {'A': 3, 'D': 8, 'E': 20},
-            'D': {'B': 2, 'C': 8, 'E': 4},
-            'E': {'C': 20, 'D': 4}
-        }
-        self.dijkstra_nodes = {
-            'A': (100, 100),
-            'C': (250, 100),
-            'B': (100, 250),
-            'D': (250, 250),
-            'E': (400, 170)
-        }
-        self.dijkstra_weighted_edges = {
-            'A': {'B': 10, 'C': 3},
-            'C': {'A': 3, 'D': 8, 'E': 20},
-            'B': {'A': 10, 'D': 2},
-            'D': {'B': 2, 'C': 8, 'E': 4},
-            'E': {'C': 20, 'D': 4}
-        }
\ No newline at end of file
+        # Đồ thị mẫu 5 nút (A–E) dùng cho phần minh họa
+        self._assign_adjacency(
+            nodes={
+                'A': (100, 100),
+                'B': (250, 100),
+                'C': (100, 250),
+                'D': (250, 250),
+                'E': (400, 250),
+            },
+            weighted_edges={
+                'A': {'B': 10, 'C': 3},
+                'B': {'A': 10, 'D': 2},
+                'C': {'A': 3, 'D': 8, 'E': 20},
+                'D': {'B': 2, 'C': 8, 'E': 4},
+                'E': {'C': 20, 'D': 4}
+            },
+            # Bản không trọng số là tập con của bản có trọng số (thiếu cạnh C-E)
+            unweighted_edges={
+                'A': ['B', 'C'],
+                'B': ['A', 'D'],
+                'C': ['A', 'D'],
+                'D': ['B', 'C', 'E'],
+                'E': ['D']
+            },
+            # Bố cục riêng cho Dijkstra (cùng cạnh, khác vị trí)
+            dijkstra_nodes={
+                'A': (100, 100),
+                'C': (250, 100),
+                'B': (100, 250),
+                'D': (250, 250),
+                'E': (400, 170)
+            },
+        )
+
+    @classmethod
+    def from_adjacency(cls, nodes, weighted_edges, unweighted_edges=None,
+                       dijkstra_nodes=None):
+        """Tạo đồ thị từ dạng dict-of-dicts cũ (nodes, weighted_edges, ...)."""
+        graph = cls.__new__(cls)
+        graph._assign_adjacency(nodes, weighted_edges, unweighted_edges,
+                                dijkstra_nodes)
+        return graph
+
+    @classmethod
+    def from_arcs(cls, labels, sources, targets, weights, xs=None, ys=None):
+        """
+        Tạo đồ thị từ danh sách cung dạng mảng song song (sources[k] -> targets[k]).
+        Thứ tự các cung trong cùng một nút nguồn được giữ nguyên.
+        """
+        num_nodes = len(labels)
+        np = get_numpy()
+        if np is not None and len(sources) > 0:
+            offsets, csr_targets, csr_weights = _csr_from_arcs_numpy(
+                np, num_nodes, sources, targets, weights)
+        else:
+            offsets, csr_targets, csr_weights = _csr_from_arcs(
+                num_nodes, sources, targets, weights)
+
+        graph = cls.__new__(cls)
+        graph._assign_csr(labels, offsets, csr_targets, csr_weights, xs, ys)
+        return graph
+
+    @classmethod
+    def from_file(cls, path, fmt=None, directed=None):
+        """
+        Đọc đồ thị từ file. Định dạng đoán theo phần mở rộng nếu không chỉ rõ:
+        .gr (DIMACS), .mtx (Matrix Market), .gsnap (snapshot nhị phân),
+        còn lại là edge list.
+        """
+        from core import GraphLoader
+        return GraphLoader.load(path, fmt=fmt, directed=directed)
+
+    @classmethod
+    def from_edge_list(cls, path, directed=False):
+        from core import GraphLoader
+        return GraphLoader.load_edge_list(path, directed=directed)
+
+    @classmethod
+    def from_dimacs(cls, path, coordinates_path=None):
+        from core import GraphLoader
+        return GraphLoader.load_dimacs(path, coordinates_path=coordinates_path)
+
+    @classmethod
+    def from_matrix_market(cls, path):
+        from core import GraphLoader
+        return GraphLoader.load_matrix_market(path)
+
+    @classmethod
+    def load_snapshot(cls, path):
+        """Mở snapshot nhị phân bằng mmap (không phân tích lại văn bản)."""
+        from core import GraphLoader
+        return GraphLoader.load_snapshot(path)
+
+    def save_snapshot(self, path):
+        from core import GraphLoader
+        GraphLoader.save_snapshot(self, path)
+
+    def __getstate__(self):
+        """
+        Pickle (gửi sang process khác): các cột đang là memoryview trên mmap của
+        snapshot được chép thành array; vùng mmap không đi kèm.
+        """
+        state = dict(self.__dict__)
+        state.pop('_mmap', None)
+        for name, value in state.items():
+            if isinstance(value, memoryview):
+                copy = array(value.format)
+                copy.frombytes(value.cast('B'))
+                state[name] = copy
+        return state
+
+    # ------------------------------------------------------------------
+    # Khởi tạo biểu diễn nội bộ
+    # ------------------------------------------------------------------
+    def _assign_adjacency(self, nodes, weighted_edges, unweighted_edges=None,
+                          dijkstra_nodes=None):
+        labels = list(nodes)
+        index = {label: i for i, label in enumerate(labels)}
+
+        all_ints = all(isinstance(w, int)
+                       for neighbors in weighted_edges.values()
+                       for w in neighbors.values())
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = array('q' if all_ints else 'd')
+        mask = array('B') if unweighted_edges is not None else None
+
+        for label in labels:
+            neighbors = weighted_edges.get(label, {})
+            plain = set(unweighted_edges.get(label, [])) if mask is not None else ()
+            for neighbor, weight in neighbors.items():
+                targets.append(index[neighbor])
+                weights.append(weight)
+                if mask is not None:
+                    mask.append(1 if neighbor in plain else 0)
+            offsets.append(len(targets))
+
+        xs = array('d', (nodes[label][0] for label in labels))
+        ys = array('d', (nodes[label][1] for label in labels))
+        self._assign_csr(labels, offsets, targets, weights, xs, ys, mask)
+
+        if dijkstra_nodes is not None:
+            self._dijkstra_xs = array('d', (dijkstra_nodes[label][0] for label in labels))
+            self._dijkstra_ys = array('d', (dijkstra_nodes[label][1] for label in labels))
+
+    def _assign_csr(self, labels, offsets, targets, weights, xs=None, ys=None,
+                    unweighted_mask=None):
+        if not isinstance(labels, (ExplicitLabels, RangeLabels)):
+            labels = ExplicitLabels(labels)
+        self._labels = labels
+        self._offsets = offsets
+        self._targets = targets
+        self._weights = weights
+        num_nodes = len(labels)
+        self._xs = xs if xs is not None else array('d', bytes(8 * num_nodes))
+        self._ys = ys if ys is not None else array('d', bytes(8 * num_nodes))
+        # None nghĩa là mọi cung đều thuộc bản không trọng số
+        self._unweighted_mask = unweighted_mask
+        self._dijkstra_xs = None
+        self._dijkstra_ys = None
+
+    # ------------------------------------------------------------------
+    # API số nguyên (dùng cho các thuật toán cần tốc độ)
+    # ------------------------------------------------------------------
+    @property
+    def num_nodes(self):
+        return len(self._labels)
+
+    @property
+    def num_arcs(self):
+        return len(self._targets)
+
+    @property
+    def labels(self):
+        """Dãy nhãn theo chỉ số nút (chỉ đọc)."""
+        return self._labels
+
+    @property
+    def offsets(self):
+        return self._offsets
+
+    @property
+    def targets(self):
+        return self._targets
+
+    @property
+    def weights(self):
+        return self._weights
+
+    @property
+    def has_integer_weights(self):
+        weights = self._weights
+        typecode = weights.typecode if isinstance(weights, array) else weights.format
+        return typecode in 'bBhHiIlLqQ'
+
+    @property
+    def xs(self):
+        return self._xs
+
+    @property
+    def ys(self):
+        return self._ys
+
+    @property
+    def unweighted_mask(self):
+        """Mảng 0/1 theo từng cung (1: thuộc bản không trọng số), hoặc None nếu mọi cung đều thuộc."""
+        return self._unweighted_mask
+
+    def fingerprint(self):
+        """
+        Băm nội dung đồ thị (nhãn, CSR, trọng số; không gồm tọa độ vẽ) dạng hex.
+        Hai đồ thị giống hệt nhau cho cùng giá trị dù đọc từ file nào (dùng làm khóa cache).
+        """
+        cached = getattr(self, '_fingerprint', None)
+        if cached is not None:
+            return cached
+        digest = hashlib.blake2b(digest_size=16)
+        labels = self._labels
+        if isinstance(labels, RangeLabels):
+            digest.update(f"R{len(labels)}:{labels.base}".encode())
+        else:
+            digest.update(b"E" + "\n".join(labels).encode('utf-8'))
+        weight_code = 'q' if self.has_integer_weights else 'd'
+        mask = self._unweighted_mask
+        for data, typecode in ((self._offsets, 'q'), (self._targets, 'i'),
+                               (self._weights, weight_code), (mask, 'B')):
+            if data is None:
+                digest.update(b"-")
+                continue
+            current = data.typecode if isinstance(data, array) else getattr(data, 'format', None)
+            if current != typecode:
+                data = array(typecode, data)
+            digest.update(typecode.encode())
+            digest.update(data)
+        self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def geometry_fingerprint(self):
+        """Băm tọa độ các nút (xs, ys) dạng hex; dùng cùng fingerprint() cho thuật toán đọc tọa độ."""
+        cached = getattr(self, '_geometry_fingerprint', None)
+        if cached is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for data in (self._xs, self._ys):
+                digest.update(data if isinstance(data, array) and data.typecode == 'd'
+                              else array('d', data))
+            cached = self._geometry_fingerprint = digest.hexdigest()
+        return cached
+
+    def index_of(self, label):
+        return self._labels.id_of(label)
+
+    def label_of(self, node_id):
+        return self._labels[node_id]
+
+    def default_start_node(self):
+        """Nút bắt đầu mặc định: 'A' nếu có, nếu không thì nút đầu tiên."""
+        if 'A' in self._labels:
+            return 'A'
+        return self._labels[0] if self.num_nodes else None
+
+    def default_target_node(self, start_node=None):
+        """Nút đích mặc định cho tìm đường hai đầu (A*, hai chiều): nút cuối cùng khác start."""
+        if not self.num_nodes:
+            return None
+        last = self._labels[self.num_nodes - 1]
+        return self._labels[0] if last == start_node else last
+
+    def reverse_arcs(self):
+        """
+        CSR của đồ thị đảo chiều: (offsets, sources, arc_ids). Các cung đi VÀO nút j nằm
+        ở vị trí offsets[j]:offsets[j + 1]; sources[p] là nút nguồn, arc_ids[p] là chỉ số
+        của cung đó trong targets/weights gốc. Tính một lần rồi giữ lại.
+        """
+        cached = getattr(self, '_reverse_arcs', None)
+        if cached is not None:
+            return cached
+        num_nodes = self.num_nodes
+        np = get_numpy()
+        if np is not None:
+            targets = np.asarray(memoryview(self._targets))
+            # Sắp theo (đích, chỉ số cung): khóa không trùng nên quicksort cho đúng thứ tự
+            # của sắp xếp ổn định mà nhanh hơn nhiều so với kind='stable' trên int32
+            num_arcs = len(targets)
+            order = np.argsort(targets.astype(np.int64) * num_arcs
+                               + np.arange(num_arcs, dtype=np.int64))
+            arc_sources = np.repeat(np.arange(num_nodes, dtype=np.int32),
+                                    np.diff(np.asarray(memoryview(self._offsets))))
+            offsets = array('q', bytes(8))
+            offsets.frombytes(np.cumsum(np.bincount(targets, minlength=num_nodes),
+                                        dtype=np.int64).tobytes())
+            sources = array('i')
+            sources.frombytes(arc_sources[order].tobytes())
+            arc_ids = array('q')
+            arc_ids.frombytes(order.astype(np.int64).tobytes())
+        else:
+            offsets = array('q', bytes(8 * (num_nodes + 1)))
+            for v in self._targets:
+                offsets[v + 1] += 1
+            for i in range(num_nodes):
+                offsets[i + 1] += offsets[i]
+            sources = array('i', bytes(4 * len(self._targets)))
+            arc_ids = array('q', bytes(8 * len(self._targets)))
+            cursor = array('q', offsets[:-1])
+            for u in range(num_nodes):
+                for k in range(self._offsets[u], self._offsets[u + 1]):
+                    pos = cursor[self._targets[k]]
+                    sources[pos] = u
+                    arc_ids[pos] = k
+                    cursor[self._targets[k]] = pos + 1
+        self._reverse_arcs = offsets, sources, arc_ids
+        return self._reverse_arcs
+
+    def arc_range(self, node_id):
+        """Trả về (start, end): các cung của nút nằm trong targets[start:end]."""
+        return self._offsets[node_id], self._offsets[node_id + 1]
+
+    def unweighted_neighbors(self, node_id):
+        """Id các nút kề của node_id theo bản không trọng số."""
+        start, end = self._offsets[node_id], self._offsets[node_id + 1]
+        mask = self._unweighted_mask
+        if mask is None:
+            return self._targets[start:end]
+        targets = self._targets
+        return [targets[k] for k in range(start, end) if mask[k]]
+
+    def is_unweighted_arc(self, arc_id):
+        return self._unweighted_mask is None or self._unweighted_mask[arc_id] == 1
+
+    # ------------------------------------------------------------------
+    # Các view tương thích với cấu trúc dict cũ
+    # ------------------------------------------------------------------
+    @property
+    def nodes(self):
+        return NodePositionView(self, self._xs, self._ys)
+
+    @property
+    def dijkstra_nodes(self):
+        if self._dijkstra_xs is None:
+            return self.nodes
+        return NodePositionView(self, self._dijkstra_xs, self._dijkstra_ys)
+
+    @property
+    def unweighted_edges(self):
+        return UnweightedAdjacencyView(self)
+
+    @property
+    def weighted_edges(self):
+        return WeightedAdjacencyView(self)
+
+    @property
+    def dijkstra_weighted_edges(self):
+        return WeightedAdjacencyView(self)
+
+
+def _csr_from_arcs(num_nodes, sources, targets, weights):
+    offsets = array('q', bytes(8 * (num_nodes + 1)))
+    for u in sources:
+        offsets[u + 1] += 1
+    for i in range(num_nodes):
+        offsets[i + 1] += offsets[i]
+
+    # Counting sort ổn định theo nút nguồn
+    csr_targets = array('i', bytes(4 * len(targets)))
+    csr_weights = array(weights.typecode, bytes(weights.itemsize * len(weights)))
+    cursor = array('q', offsets[:-1])
+    for k in range(len(sources)):
+        u = sources[k]
+        pos = cursor[u]
+        csr_targets[pos] = targets[k]
+        csr_weights[pos] = weights[k]
+        cursor[u] = pos + 1
+    return offsets, csr_targets, csr_weights
+
+
+def _csr_from_arcs_numpy(np, num_nodes, sources, targets, weights):
+    src = np.frombuffer(sources, dtype=sources.typecode)
+    order = np.argsort(src, kind='stable')
+    counts = np.bincount(src, minlength=num_nodes)
+    offsets = array('q', bytes(8))
+    offsets.frombytes(np.cumsum(counts, dtype=np.int64).tobytes())
+    csr_targets = array('i')
+    csr_targets.frombytes(
+        np.frombuffer(targets, dtype=targets.typecode)[order].astype(np.int32).tobytes())
+    csr_weights = array(weights.typecode)
+    csr_weights.frombytes(np.frombuffer(weights, dtype=weights.typecode)[order].tobytes())
+    return offsets, csr_targets, csr_weights
+
+
+class ExplicitLabels:
+    """Bảng nhãn tường minh (chuỗi bất kỳ); chỉ mục ngược được tạo khi cần."""
+    __slots__ = ('_labels', '_blob', '_index')
+
+    def __init__(self, labels=None, blob=None):
+        self._labels = list(labels) if labels is not None else None
+        # blob: các nhãn UTF-8 nối bằng '\n' (đọc từ snapshot, tách khi cần)
+        self._blob = blob
+        self._index = None
+
+    def __reduce__(self):
+        # blob có thể là memoryview trên mmap (không pickle được): gửi list nhãn
+        return ExplicitLabels, (self._materialize(),)
+
+    def _materialize(self):
+        if self._labels is None:
+            text = bytes(self._blob).decode('utf-8')
+            self._labels = text.split('\n') if text else []
+            self._blob = None
+        return self._labels
+
+    def id_of(self, label):
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self._materialize())}
+        return self._index[label]
+
+    def __getitem__(self, node_id):
+        return self._materialize()[node_id]
+
+    def __len__(self):
+        return len(self._materialize())
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __contains__(self, label):
+        try:
+            self.id_of(label)
+        except KeyError:
+            return False
+        return True
+
+
+class RangeLabels:
+    """Nhãn ngầm định 'base', 'base+1', ... (DIMACS, Matrix Market): không tốn bộ nhớ."""
+    __slots__ = ('_count', 'base')
+
+    def __init__(self, count, base=1):
+        self._count = count
+        self.base = base
+
+    def id_of(self, label):
+        try:
+            node_id = int(label) - self.base
+        except (TypeError, ValueError):
+            raise KeyError(label) from None
+        if not 0 <= node_id < self._count or str(node_id + self.base) != str(label):
+            raise KeyError(label)
+        return node_id
+
+    def __getitem__(self, node_id):
+        if node_id < 0:
+            node_id += self._count
+        if not 0 <= node_id < self._count:
+            raise IndexError(node_id)
+        return str(node_id + self.base)
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return (str(i + self.base) for i in range(self._count))
+
+    def __contains__(self, label):
+        try:
+            self.id_of(label)
+        except KeyError:
+            return False
+        return True
+
+
+class NodePositionView(Mapping):
+    """View chỉ đọc: nhãn nút -> (x, y)."""
+    __slots__ = ('_graph', '_xs', '_ys')
+
+    def __init__(self, graph, xs, ys):
+        self._graph = graph
+        self._xs = xs
+        self._ys = ys
+
+    def __getitem__(self, label):
+        i = self._graph._labels.id_of(label)
+        return self._xs[i], self._ys[i]
+
+    def __iter__(self):
+        return iter(self._graph._labels)
+
+    def __len__(self):
+        return len(self._graph._labels)
+
+    def __contains__(self, label):
+        return label in self._graph._labels
+
+
+class UnweightedAdjacencyView(Mapping):
+    """View chỉ đọc: nhãn nút -> tuple nhãn các nút kề."""
+    __slots__ = ('_graph',)
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __getitem__(self, label):
+        graph = self._graph
+        i = graph._labels.id_of(label)
+        labels = graph._labels
+        targets = graph._targets
+        mask = graph._unweighted_mask
+        start, end = graph._offsets[i], graph._offsets[i + 1]
+        if mask is None:
+            return tuple(labels[targets[k]] for k in range(start, end))
+        return tuple(labels[targets[k]] for k in range(start, end) if mask[k])
+
+    def __iter__(self):
+        return iter(self._graph._labels)
+
+    def __len__(self):
+        return len(self._graph._labels)
+
+    def __contains__(self, label):
+        return label in self._graph._labels
+
+
+class WeightedAdjacencyView(Mapping):
+    """View chỉ đọc: nhãn nút -> {nhãn nút kề: trọng số}."""
+    __slots__ = ('_graph',)
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __getitem__(self, label):
+        graph = self._graph
+        i = graph._labels.id_of(label)
+        labels = graph._labels
+        targets = graph._targets
+        weights = graph._weights
+        start, end = graph._offsets[i], graph._offsets[i + 1]
+        return MappingProxyType(
+            {labels[targets[k]]: weights[k] for k in range(start, end)})
+
+    def __iter__(self):
+        return iter(self._graph._labels)
+
+    def __len__(self):
+        return len(self._graph._labels)
+
+    def __contains__(self, label):
+        return label in self._graph._labels
@@ -0,0 +1,346 @@
+"""
+Sinh đồ thị lớn để thử thuật toán và giao diện với dữ liệu cỡ thật.
+
+Mọi hàm trả về Graph vô hướng (mỗi cạnh là hai cung), nhãn 0..n-1,
+trọng số nguyên (dùng được cả hàng đợi 'bucket') và tọa độ đã co vào canvas.
+Có NumPy thì sinh theo kiểu vector hóa (triệu nút trong vài giây), không có thì
+dùng vòng lặp Python. Cùng seed cho cùng đồ thị trên cùng một backend.
+"""
+import math
+import random
+from array import array
+
+from .compat import get_numpy
+from .Graph import Graph, RangeLabels
+from .Layout import circle_layout, fit_to_canvas, CANVAS_WIDTH, CANVAS_HEIGHT, MARGIN
+
+
+def grid_graph(rows, cols=None, seed=0, min_weight=1, max_weight=100):
+    """Lưới 2D rows x cols, mỗi nút nối với nút trái/phải/trên/dưới."""
+    cols = rows if cols is None else cols
+    num_nodes = rows * cols
+    np = get_numpy()
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        ids = np.arange(num_nodes, dtype=np.int64).reshape(rows, cols)
+        sources = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+        targets = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+        weights = rng.integers(min_weight, max_weight, size=len(sources), endpoint=True)
+        xs = (ids % cols).ravel().astype(np.float64)
+        ys = (ids // cols).ravel().astype(np.float64)
+        return _build(np, num_nodes, sources, targets, weights, xs, ys)
+
+    rng = random.Random(seed)
+    sources, targets = array('i'), array('i')
+    for r in range(rows):
+        for c in range(cols):
+            u = r * cols + c
+            if c + 1 < cols:
+                sources.append(u); targets.append(u + 1)
+            if r + 1 < rows:
+                sources.append(u); targets.append(u + cols)
+    weights = array('q', (rng.randint(min_weight, max_weight) for _ in range(len(sources))))
+    xs = array('d', (float(i % cols) for i in range(num_nodes)))
+    ys = array('d', (float(i // cols) for i in range(num_nodes)))
+    return _build(None, num_nodes, sources, targets, weights, xs, ys)
+
+
+def erdos_renyi_graph(num_nodes, p=None, num_edges=None, seed=0, min_weight=1, max_weight=100):
+    """
+    Đồ thị ngẫu nhiên G(n, m): `num_edges` cạnh khác nhau chọn đều (không khuyên).
+    Nếu cho `p` thì m = p * n(n-1)/2; mặc định bậc trung bình 4.
+    """
+    max_edges = num_nodes * (num_nodes - 1) // 2
+    if num_edges is None:
+        num_edges = round(p * max_edges) if p is not None else 2 * num_nodes
+    num_edges = min(num_edges, max_edges)
+    np = get_numpy()
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        keys = np.empty(0, dtype=np.int64)
+        while len(keys) < num_edges:
+            # Lấy dư một chút vì sẽ bỏ khuyên và cạnh trùng
+            count = int((num_edges - len(keys)) * 1.05) + 16
+            u = rng.integers(0, num_nodes, size=count)
+            v = rng.integers(0, num_nodes, size=count)
+            keep = u != v
+            lo, hi = np.minimum(u, v)[keep], np.maximum(u, v)[keep]
+            keys = np.concatenate([keys, lo * num_nodes + hi])
+            _, first = np.unique(keys, return_index=True)
+            keys = keys[np.sort(first)]
+        keys = keys[:num_edges]
+        weights = rng.integers(min_weight, max_weight, size=num_edges, endpoint=True)
+        xs, ys = circle_layout(num_nodes)
+        return _build(np, num_nodes, keys // num_nodes, keys % num_nodes, weights,
+                      xs, ys, fit=False)
+
+    rng = random.Random(seed)
+    seen = set()
+    sources, targets, weights = array('i'), array('i'), array('q')
+    while len(seen) < num_edges:
+        u, v = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        key = (min(u, v), max(u, v))
+        if u == v or key in seen:
+            continue
+        seen.add(key)
+        sources.append(key[0]); targets.append(key[1])
+        weights.append(rng.randint(min_weight, max_weight))
+    xs, ys = circle_layout(num_nodes)
+    return _build(None, num_nodes, sources, targets, weights, xs, ys, fit=False)
+
+
+def barabasi_albert_graph(num_nodes, m=2, seed=0, min_weight=1, max_weight=100):
+    """
+    Đồ thị phi tỉ lệ (gắn kết ưu tiên): mỗi nút mới nối tới m nút cũ với xác suất
+    tỉ lệ theo bậc. Dùng thuật toán Batagelj–Brandes; bỏ khuyên và cạnh trùng.
+    """
+    total = num_nodes * m
+    np = get_numpy()
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        # Cạnh k ghi vào M[2k] = nguồn, M[2k+1] = M[r] với r đều trong [0, 2k]
+        k = np.arange(total, dtype=np.int64)
+        choice = (rng.random(total) * (2 * k + 1)).astype(np.int64)
+        slot = choice.copy()
+        # M[r] với r lẻ lại trỏ tới một ô trước đó: nhảy con trỏ tới khi gặp ô chẵn
+        odd = np.flatnonzero(slot & 1)
+        while len(odd):
+            slot[odd] = choice[slot[odd] >> 1]
+            odd = odd[(slot[odd] & 1) == 1]
+        sources = k // m
+        targets = (slot >> 1) // m
+    else:
+        rng = random.Random(seed)
+        endpoints = array('i', bytes(4 * 2 * total))
+        for k in range(total):
+            endpoints[2 * k] = k // m
+            endpoints[2 * k + 1] = endpoints[rng.randint(0, 2 * k)]
+        sources, targets = endpoints[0::2], endpoints[1::2]
+    return _simple_graph(np, num_nodes, sources, targets, seed, min_weight, max_weight)
+
+
+def random_geometric_graph(num_nodes, radius=None, seed=0, weight_scale=1000):
+    """
+    n điểm ngẫu nhiên trong hình vuông đơn vị, nối hai điểm cách nhau không quá
+    `radius` (mặc định cho bậc trung bình ~6). Trọng số = khoảng cách * weight_scale.
+    """
+    if radius is None:
+        radius = math.sqrt(6 / (math.pi * max(num_nodes, 1)))
+    cells = max(1, int(1 / radius))
+    np = get_numpy()
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        xs, ys = rng.random(num_nodes), rng.random(num_nodes)
+        cx = np.minimum((xs * cells).astype(np.int64), cells - 1)
+        cy = np.minimum((ys * cells).astype(np.int64), cells - 1)
+        order = np.argsort(cx * cells + cy, kind='stable')
+        sorted_cell = (cx * cells + cy)[order]
+        starts = np.searchsorted(sorted_cell, np.arange(cells * cells + 1))
+        sx, sy = cx[order], cy[order]
+        found_u, found_v = [], []
+        # Nửa lân cận (ô hiện tại + 4 ô) để mỗi cặp chỉ được xét một lần
+        for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+            nx, ny = sx + dx, sy + dy
+            valid = (nx < cells) & (ny >= 0) & (ny < cells)
+            a = np.flatnonzero(valid)
+            neighbor_cell = nx[a] * cells + ny[a]
+            begin, end = starts[neighbor_cell], starts[neighbor_cell + 1]
+            if dx == 0 and dy == 0:
+                begin = np.maximum(begin, a + 1)
+            counts = np.maximum(end - begin, 0)
+            left = np.repeat(a, counts)
+            right = np.repeat(begin - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            u, v = order[left], order[right]
+            close = (xs[u] - xs[v]) ** 2 + (ys[u] - ys[v]) ** 2 <= radius * radius
+            found_u.append(u[close])
+            found_v.append(v[close])
+        sources, targets = np.concatenate(found_u), np.concatenate(found_v)
+        lengths = np.hypot(xs[sources] - xs[targets], ys[sources] - ys[targets])
+        weights = np.maximum(np.rint(lengths * weight_scale), 1).astype(np.int64)
+        return _build(np, num_nodes, sources, targets, weights, xs, ys)
+
+    rng = random.Random(seed)
+    xs = array('d', (rng.random() for _ in range(num_nodes)))
+    ys = array('d', (rng.random() for _ in range(num_nodes)))
+    buckets = {}
+    for i in range(num_nodes):
+        cell = (min(int(xs[i] * cells), cells - 1), min(int(ys[i] * cells), cells - 1))
+        buckets.setdefault(cell, []).append(i)
+    sources, targets, weights = array('i'), array('i'), array('q')
+    for (cx, cy), members in buckets.items():
+        for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+            others = buckets.get((cx + dx, cy + dy))
+            if not others:
+                continue
+            for i in members:
+                for j in others:
+                    if dx == 0 and dy == 0 and j <= i:
+                        continue
+                    length = math.hypot(xs[i] - xs[j], ys[i] - ys[j])
+                    if length <= radius:
+                        sources.append(i); targets.append(j)
+                        weights.append(max(round(length * weight_scale), 1))
+    return _build(None, num_nodes, sources, targets, weights, xs, ys)
+
+
+def road_like_graph(rows, cols=None, seed=0, keep=0.6, diagonal=0.1, jitter=0.3):
+    """
+    Đồ thị phẳng giống mạng đường: lưới bị xô lệch (jitter), luôn giữ một cây
+    khung ngẫu nhiên (mỗi nút nối về nút trái hoặc trên) nên luôn liên thông,
+    các cạnh lưới còn lại giữ với xác suất `keep`, thêm đường chéo một chiều
+    trong ô với xác suất `diagonal`. Trọng số = độ dài * hệ số loại đường (1..3).
+    """
+    cols = rows if cols is None else cols
+    num_nodes = rows * cols
+    np = get_numpy()
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        ids = np.arange(num_nodes, dtype=np.int64).reshape(rows, cols)
+        xs = (ids % cols).ravel() + rng.uniform(-jitter, jitter, num_nodes)
+        ys = (ids // cols).ravel() + rng.uniform(-jitter, jitter, num_nodes)
+        # Cạnh ngang: (r, c) - (r, c+1); cạnh dọc: (r, c) - (r+1, c)
+        horizontal_u, horizontal_v = ids[:, :-1].ravel(), ids[:, 1:].ravel()
+        vertical_u, vertical_v = ids[:-1, :].ravel(), ids[1:, :].ravel()
+        # Cây khung: nút (r, c) chọn nối trái (ngang) hoặc lên (dọc)
+        go_left = rng.random((rows, cols)) < 0.5
+        go_left[0, :] = True
+        go_left[:, 0] = False
+        tree_horizontal = go_left[:, 1:].ravel()
+        tree_vertical = ~go_left[1:, :].ravel()
+        keep_horizontal = tree_horizontal | (rng.random(len(horizontal_u)) < keep)
+        keep_vertical = tree_vertical | (rng.random(len(vertical_u)) < keep)
+        cell = ids[:-1, :-1].ravel()
+        has_diagonal = rng.random(len(cell)) < diagonal
+        flip = rng.random(len(cell)) < 0.5
+        diagonal_u = np.where(flip, cell, cell + 1)[has_diagonal]
+        diagonal_v = np.where(flip, cell + cols + 1, cell + cols)[has_diagonal]
+        sources = np.concatenate([horizontal_u[keep_horizontal], vertical_u[keep_vertical], diagonal_u])
+        targets = np.concatenate([horizontal_v[keep_horizontal], vertical_v[keep_vertical], diagonal_v])
+        lengths = np.hypot(xs[sources] - xs[targets], ys[sources] - ys[targets])
+        factors = rng.uniform(1.0, 3.0, len(sources))
+        weights = np.maximum(np.rint(lengths * factors * 100), 1).astype(np.int64)
+        return _build(np, num_nodes, sources, targets, weights, xs, ys)
+
+    rng = random.Random(seed)
+    xs = array('d', (i % cols + rng.uniform(-jitter, jitter) for i in range(num_nodes)))
+    ys = array('d', (i // cols + rng.uniform(-jitter, jitter) for i in range(num_nodes)))
+    sources, targets = array('i'), array('i')
+    for r in range(rows):
+        for c in range(cols):
+            u = r * cols + c
+            if r == 0 and c == 0:
+                parent = None
+            elif r == 0 or (c > 0 and rng.random() < 0.5):
+                parent = u - 1
+            else:
+                parent = u - cols
+            if c > 0 and (parent == u - 1 or rng.random() < keep):
+                sources.append(u - 1); targets.append(u)
+            if r > 0 and (parent == u - cols or rng.random() < keep):
+                sources.append(u - cols); targets.append(u)
+            if r + 1 < rows and c + 1 < cols and rng.random() < diagonal:
+                if rng.random() < 0.5:
+                    sources.append(u); targets.append(u + cols + 1)
+                else:
+                    sources.append(u + 1); targets.append(u + cols)
+    weights = array('q')
+    for u, v in zip(sources, targets):
+        length = math.hypot(xs[u] - xs[v], ys[u] - ys[v])
+        weights.append(max(round(length * rng.uniform(1.0, 3.0) * 100), 1))
+    return _build(None, num_nodes, sources, targets, weights, xs, ys)
+
+
+# Tên -> hàm sinh (dùng cho dòng lệnh, ví dụ 'grid:rows=300,cols=300')
+GENERATORS = {
+    'grid': grid_graph,
+    'erdos_renyi': erdos_renyi_graph,
+    'barabasi_albert': barabasi_albert_graph,
+    'geometric': random_geometric_graph,
+    'road': road_like_graph,
+}
+
+
+def from_spec(spec):
+    """Sinh đồ thị từ chuỗi 'tên:khóa=giá trị,...', ví dụ 'road:rows=1000,seed=3'."""
+    name, _, params = spec.partition(':')
+    generator = GENERATORS.get(name)
+    if generator is None:
+        raise ValueError(f"Không có bộ sinh '{name}' (chọn một trong {', '.join(GENERATORS)})")
+    kwargs = {}
+    for item in filter(None, params.split(',')):
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f"Tham số phải có dạng khóa=giá trị: '{item}'")
+        try:
+            kwargs[key] = int(value)
+        except ValueError:
+            kwargs[key] = float(value)
+    return generator(**kwargs)
+
+
+# ----------------------------------------------------------------------
+# Ghép kết quả thành Graph
+# ----------------------------------------------------------------------
+def _simple_graph(np, num_nodes, sources, targets, seed, min_weight, max_weight):
+    """Bỏ khuyên và cạnh trùng, gán trọng số ngẫu nhiên, xếp nút trên đường tròn."""
+    xs, ys = circle_layout(num_nodes)
+    if np is not None:
+        keep = sources != targets
+        lo = np.minimum(sources, targets)[keep]
+        hi = np.maximum(sources, targets)[keep]
+        _, first = np.unique(lo * num_nodes + hi, return_index=True)
+        first.sort()
+        rng = np.random.default_rng(seed + 1)
+        weights = rng.integers(min_weight, max_weight, size=len(first), endpoint=True)
+        return _build(np, num_nodes, lo[first], hi[first], weights, xs, ys, fit=False)
+
+    rng = random.Random(seed + 1)
+    seen = set()
+    unique_sources, unique_targets, weights = array('i'), array('i'), array('q')
+    for u, v in zip(sources, targets):
+        key = (min(u, v), max(u, v))
+        if u == v or key in seen:
+            continue
+        seen.add(key)
+        unique_sources.append(key[0]); unique_targets.append(key[1])
+        weights.append(rng.randint(min_weight, max_weight))
+    return _build(None, num_nodes, unique_sources, unique_targets, weights, xs, ys, fit=False)
+
+
+def _build(np, num_nodes, sources, targets, weights, xs, ys, fit=True):
+    """Tạo Graph vô hướng (mỗi cạnh thành hai cung) với nhãn 0..n-1."""
+    if np is not None:
+        sources = np.asarray(sources, dtype=np.int32)
+        targets = np.asarray(targets, dtype=np.int32)
+        weights = np.asarray(weights, dtype=np.int64)
+        arc_sources = _to_array('i', np.concatenate([sources, targets]))
+        arc_targets = _to_array('i', np.concatenate([targets, sources]))
+        arc_weights = _to_array('q', np.concatenate([weights, weights]))
+        if fit:
+            xs, ys = _fit_numpy(np, np.asarray(xs, dtype=np.float64),
+                                np.asarray(ys, dtype=np.float64))
+    else:
+        arc_sources = sources + targets
+        arc_targets = targets + sources
+        arc_weights = weights + weights
+        if fit:
+            xs, ys = fit_to_canvas(xs, ys)
+    return Graph.from_arcs(RangeLabels(num_nodes, base=0), arc_sources, arc_targets,
+                           arc_weights, xs, ys)
+
+
+def _to_array(typecode, values):
+    result = array(typecode)
+    result.frombytes(values.tobytes())
+    return result
+
+
+def _fit_numpy(np, xs, ys):
+    """Giống Layout.fit_to_canvas nhưng vector hóa."""
+    if len(xs) == 0:
+        return array('d'), array('d')
+    min_x, min_y = xs.min(), ys.min()
+    span = max(xs.max() - min_x, ys.max() - min_y) or 1.0
+    scale = min(CANVAS_WIDTH - 2 * MARGIN, CANVAS_HEIGHT - 2 * MARGIN) / span
+    return (_to_array('d', (xs - min_x) * scale + MARGIN),
+            _to_array('d', (ys.max() - ys) * scale + MARGIN))
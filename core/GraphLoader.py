@@ -0,0 +1,352 @@
+import gzip
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from core.Graph import Graph, ExplicitLabels, RangeLabels
+from core.Layout import circle_layout, fit_to_canvas
+
+# Kích thước mỗi khối đọc từ file (byte)
+CHUNK_SIZE = 1 << 20
+
+SNAPSHOT_MAGIC = b'GRAPHCSR'
+SNAPSHOT_VERSION = 1
+# magic, version, byteorder, weight typecode, label kind, has_mask,
+# has_dijkstra_layout, (pad), num_nodes, num_arcs, label_base, label_blob_size
+_SNAPSHOT_HEADER = struct.Struct('<8sBcccBB2xqqqq')
+
+
+def load(path, fmt=None, directed=None):
+    """Chọn trình đọc theo định dạng (hoặc theo phần mở rộng của file)."""
+    if fmt is None:
+        fmt = _guess_format(path)
+    if fmt == 'dimacs':
+        return load_dimacs(path)
+    if fmt == 'mtx':
+        return load_matrix_market(path)
+    if fmt == 'snapshot':
+        return load_snapshot(path)
+    if fmt == 'edgelist':
+        return load_edge_list(path, directed=bool(directed))
+    raise ValueError(f"Định dạng đồ thị không hỗ trợ: '{fmt}'")
+
+
+def _guess_format(path):
+    name = path[:-3] if path.endswith('.gz') else path
+    ext = os.path.splitext(name)[1].lower()
+    if ext == '.gr':
+        return 'dimacs'
+    if ext == '.mtx':
+        return 'mtx'
+    if ext == '.gsnap':
+        return 'snapshot'
+    return 'edgelist'
+
+
+def iter_lines(path, chunk_size=CHUNK_SIZE):
+    """
+    Đọc file theo từng khối nhị phân và trả về từng dòng (bytes),
+    không bao giờ giữ toàn bộ nội dung file trong bộ nhớ.
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        tail = b''
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            lines = (tail + chunk).split(b'\n')
+            tail = lines.pop()
+            yield from lines
+        if tail:
+            yield tail
+
+
+def _parse_weight(token):
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+
+def _node_id(token, num_nodes, line):
+    """Id 0..n-1 của nút đánh số từ 1 (DIMACS, Matrix Market); ngoài 1..n thì báo lỗi."""
+    node = int(token)
+    if not 1 <= node <= num_nodes:
+        raise ValueError(f"Nút {node} nằm ngoài khoảng 1..{num_nodes}: {line!r}")
+    return node - 1
+
+
+class _ArcBuffer:
+    """Ba mảng song song (nguồn, đích, trọng số) được nối dần trong lúc đọc."""
+
+    def __init__(self):
+        self.sources = array('i')
+        self.targets = array('i')
+        self.weights = array('q')
+
+    def add(self, u, v, weight):
+        if type(weight) is float and self.weights.typecode == 'q':
+            # Gặp trọng số thực đầu tiên: chuyển cả mảng sang float một lần
+            self.weights = array('d', self.weights)
+        self.sources.append(u)
+        self.targets.append(v)
+        self.weights.append(weight)
+
+
+def load_edge_list(path, directed=False):
+    """
+    Edge list: mỗi dòng 'u v [w]' (cách nhau bởi khoảng trắng hoặc dấu phẩy).
+    Dòng bắt đầu bằng '#' hoặc '%' là chú thích. Thiếu trọng số thì w = 1.
+    """
+    index = {}
+    labels = []
+    arcs = _ArcBuffer()
+
+    def intern(token):
+        label = token.decode('utf-8')
+        node_id = index.get(label)
+        if node_id is None:
+            node_id = len(labels)
+            index[label] = node_id
+            labels.append(label)
+        return node_id
+
+    for line in iter_lines(path):
+        line = line.strip()
+        if not line or line[:1] in (b'#', b'%'):
+            continue
+        parts = line.replace(b',', b' ').split()
+        if len(parts) < 2:
+            raise ValueError(f"Dòng edge list không hợp lệ: {line!r}")
+        u = intern(parts[0])
+        v = intern(parts[1])
+        weight = _parse_weight(parts[2]) if len(parts) > 2 else 1
+        arcs.add(u, v, weight)
+        if not directed and u != v:
+            arcs.add(v, u, weight)
+
+    xs, ys = circle_layout(len(labels))
+    return Graph.from_arcs(ExplicitLabels(labels), arcs.sources, arcs.targets,
+                           arcs.weights, xs, ys)
+
+
+def load_dimacs(path, coordinates_path=None):
+    """
+    DIMACS shortest-path (.gr): 'p sp n m' rồi các cung có hướng 'a u v w'
+    (đánh số từ 1). Nếu có file tọa độ .co cùng tên thì đọc luôn.
+    """
+    num_nodes = None
+    arcs = _ArcBuffer()
+    for line in iter_lines(path):
+        if not line or line[:1] == b'c':
+            continue
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == b'a':
+            if num_nodes is None:
+                raise ValueError(f"Cung nằm trước dòng 'p sp n m': {line!r}")
+            if len(parts) < 4:
+                raise ValueError(f"Dòng DIMACS không hợp lệ: {line!r}")
+            arcs.add(_node_id(parts[1], num_nodes, line), _node_id(parts[2], num_nodes, line),
+                     _parse_weight(parts[3]))
+        elif parts[0] == b'p':
+            if len(parts) < 3:
+                raise ValueError(f"Dòng DIMACS không hợp lệ: {line!r}")
+            num_nodes = int(parts[2])
+    if num_nodes is None:
+        raise ValueError(f"File DIMACS thiếu dòng 'p sp n m': {path}")
+
+    if coordinates_path is None:
+        base = path[:-3] if path.endswith('.gz') else path
+        candidate = os.path.splitext(base)[0] + '.co'
+        if os.path.exists(candidate):
+            coordinates_path = candidate
+
+    if coordinates_path is not None:
+        xs, ys = _load_dimacs_coordinates(coordinates_path, num_nodes)
+        xs, ys = fit_to_canvas(xs, ys)
+    else:
+        xs, ys = circle_layout(num_nodes)
+    return Graph.from_arcs(RangeLabels(num_nodes, base=1), arcs.sources,
+                           arcs.targets, arcs.weights, xs, ys)
+
+
+def _load_dimacs_coordinates(path, num_nodes):
+    xs = array('d', bytes(8 * num_nodes))
+    ys = array('d', bytes(8 * num_nodes))
+    for line in iter_lines(path):
+        if line[:2] == b'v ':
+            parts = line.split()
+            if len(parts) < 4:
+                raise ValueError(f"Dòng tọa độ DIMACS không hợp lệ: {line!r}")
+            _, node, x, y = parts[:4]
+            node_id = _node_id(node, num_nodes, line)
+            xs[node_id] = float(x)
+            ys[node_id] = float(y)
+    return xs, ys
+
+
+def load_matrix_market(path):
+    """
+    Matrix Market dạng coordinate (ma trận kề vuông, đánh số từ 1).
+    Hỗ trợ real/integer/pattern và general/symmetric/skew-symmetric (cung đối xứng
+    mang trọng số -w); complex và hermitian không được hỗ trợ.
+    """
+    lines = iter_lines(path)
+    header = next(lines, b'').lower().split()
+    if len(header) < 5 or header[0] != b'%%matrixmarket' or header[2] != b'coordinate':
+        raise ValueError(f"Chỉ hỗ trợ Matrix Market dạng coordinate: {path}")
+    field, symmetry = header[3], header[4]
+    if field not in (b'real', b'integer', b'pattern'):
+        raise ValueError(f"Kiểu giá trị Matrix Market không hỗ trợ: '{field.decode()}'")
+    if symmetry not in (b'general', b'symmetric', b'skew-symmetric'):
+        raise ValueError(f"Kiểu đối xứng Matrix Market không hỗ trợ: '{symmetry.decode()}'")
+    pattern = field == b'pattern'
+    symmetric = symmetry != b'general'
+    # Phần tử đối xứng của ma trận phản đối xứng là -w
+    mirror_sign = -1 if symmetry == b'skew-symmetric' else 1
+
+    num_nodes = None
+    arcs = _ArcBuffer()
+    for line in lines:
+        line = line.strip()
+        if not line or line[:1] == b'%':
+            continue
+        parts = line.split()
+        if num_nodes is None:
+            if len(parts) < 2:
+                raise ValueError(f"Dòng kích thước Matrix Market không hợp lệ: {line!r}")
+            rows, cols = int(parts[0]), int(parts[1])
+            if rows != cols:
+                raise ValueError(f"Ma trận kề phải vuông, nhận {rows}x{cols}")
+            num_nodes = rows
+            continue
+        if len(parts) < (2 if pattern else 3):
+            raise ValueError(f"Dòng Matrix Market không hợp lệ: {line!r}")
+        u = _node_id(parts[0], num_nodes, line)
+        v = _node_id(parts[1], num_nodes, line)
+        weight = 1 if pattern else _parse_weight(parts[2])
+        arcs.add(u, v, weight)
+        if symmetric and u != v:
+            arcs.add(v, u, mirror_sign * weight)
+    if num_nodes is None:
+        raise ValueError(f"File Matrix Market thiếu dòng kích thước: {path}")
+
+    xs, ys = circle_layout(num_nodes)
+    return Graph.from_arcs(RangeLabels(num_nodes, base=1), arcs.sources,
+                           arcs.targets, arcs.weights, xs, ys)
+
+
+# ----------------------------------------------------------------------
+# Snapshot nhị phân (mở lại bằng mmap)
+# ----------------------------------------------------------------------
+def _padded(size):
+    return (size + 7) & ~7
+
+
+def save_snapshot(graph, path):
+    """
+    Ghi đồ thị ra snapshot nhị phân: header cố định rồi các mảng CSR thô,
+    mỗi phần căn lề 8 byte để có thể ánh xạ thẳng bằng mmap khi đọc lại.
+    """
+    labels = graph.labels
+    if isinstance(labels, RangeLabels):
+        label_kind, label_base, blob = b'R', labels.base, b''
+    else:
+        label_kind, label_base = b'E', 0
+        blob = '\n'.join(labels).encode('utf-8')
+
+    mask = graph._unweighted_mask
+    has_layout = graph._dijkstra_xs is not None
+    weights = graph.weights
+    weight_code = b'q' if _typecode(weights) == 'q' else b'd'
+    sections = [
+        (graph.offsets, 'q'),
+        (graph.targets, 'i'),
+        (weights, weight_code.decode()),
+        (graph.xs, 'd'),
+        (graph.ys, 'd'),
+    ]
+    if mask is not None:
+        sections.append((mask, 'B'))
+    if has_layout:
+        sections.append((graph._dijkstra_xs, 'd'))
+        sections.append((graph._dijkstra_ys, 'd'))
+
+    header = _SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+        b'L' if sys.byteorder == 'little' else b'B',
+        weight_code, label_kind, int(mask is not None), int(has_layout),
+        graph.num_nodes, graph.num_arcs, label_base, len(blob))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(bytes(_padded(len(header)) - len(header)))
+        for data, typecode in sections:
+            raw = _as_bytes(data, typecode)
+            f.write(raw)
+            f.write(bytes(_padded(len(raw)) - len(raw)))
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+
+def _typecode(data):
+    return data.typecode if isinstance(data, array) else data.format
+
+
+def _as_bytes(data, typecode):
+    if _typecode(data) != typecode:
+        data = array(typecode, data)
+    return data.tobytes()
+
+
+def load_snapshot(path):
+    """Mở snapshot bằng mmap: các mảng là memoryview chỉ đọc, không sao chép."""
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+
+    (magic, version, byteorder, weight_code, label_kind, has_mask, has_layout,
+     num_nodes, num_arcs, label_base, blob_size) = _SNAPSHOT_HEADER.unpack_from(view)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f"Không phải snapshot đồ thị hợp lệ: {path}")
+    if byteorder != (b'L' if sys.byteorder == 'little' else b'B'):
+        raise ValueError(f"Snapshot được ghi trên máy khác thứ tự byte: {path}")
+
+    position = _padded(_SNAPSHOT_HEADER.size)
+
+    def take(count, typecode):
+        nonlocal position
+        size = count * struct.calcsize(typecode)
+        section = view[position:position + size].cast(typecode)
+        position += _padded(size)
+        return section
+
+    offsets = take(num_nodes + 1, 'q')
+    targets = take(num_arcs, 'i')
+    weights = take(num_arcs, weight_code.decode())
+    xs = take(num_nodes, 'd')
+    ys = take(num_nodes, 'd')
+    mask = take(num_arcs, 'B') if has_mask else None
+    if has_layout:
+        dijkstra_xs = take(num_nodes, 'd')
+        dijkstra_ys = take(num_nodes, 'd')
+
+    if label_kind == b'R':
+        labels = RangeLabels(num_nodes, base=label_base)
+    else:
+        labels = ExplicitLabels(blob=view[position:position + blob_size])
+
+    graph = Graph.__new__(Graph)
+    graph._assign_csr(labels, offsets, targets, weights, xs, ys, mask)
+    if has_layout:
+        graph._dijkstra_xs = dijkstra_xs
+        graph._dijkstra_ys = dijkstra_ys
+    # Giữ tham chiếu để vùng mmap sống cùng đồ thị
+    graph._mmap = mapped
+    return graph
@@ -0,0 +1,33 @@
+import math
+from array import array
+
+CANVAS_WIDTH = 800
+CANVAS_HEIGHT = 600
+MARGIN = 40
+
+
+def circle_layout(num_nodes, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, margin=MARGIN):
+    """Xếp các nút đều trên một đường tròn (dùng khi file không có tọa độ)."""
+    cx, cy = width / 2, height / 2
+    radius = max(min(width, height) / 2 - margin, 1)
+    xs = array('d', bytes(8 * num_nodes))
+    ys = array('d', bytes(8 * num_nodes))
+    for i in range(num_nodes):
+        angle = 2 * math.pi * i / max(num_nodes, 1)
+        xs[i] = cx + radius * math.cos(angle)
+        ys[i] = cy + radius * math.sin(angle)
+    return xs, ys
+
+
+def fit_to_canvas(xs, ys, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, margin=MARGIN):
+    """Co giãn tọa độ gốc (kinh độ/vĩ độ, mét, ...) vào khung canvas, giữ tỉ lệ."""
+    if len(xs) == 0:
+        return xs, ys
+    min_x, max_x = min(xs), max(xs)
+    min_y, max_y = min(ys), max(ys)
+    span = max(max_x - min_x, max_y - min_y) or 1.0
+    scale = min(width - 2 * margin, height - 2 * margin) / span
+    fitted_xs = array('d', ((x - min_x) * scale + margin for x in xs))
+    # Trục y của canvas hướng xuống, nên lật lại để bắc ở trên
+    fitted_ys = array('d', ((max_y - y) * scale + margin for y in ys))
+    return fitted_xs, fitted_ys
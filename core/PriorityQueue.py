@@ -0,0 +1,417 @@
+from abc import ABC, abstractmethod
+from array import array
+
+NO_NODE = -1
+
+
+class PriorityQueue(ABC):
+    """
+    Hàng đợi ưu tiên có chỉ mục theo id nút (0..capacity-1): mỗi nút xuất hiện
+    tối đa một lần, nên kích thước luôn O(V) và có decrease-key thật sự.
+    Khi hai nút cùng khóa, nút có id nhỏ hơn ra trước (giống heapq với (khóa, nút)).
+    """
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    @abstractmethod
+    def __contains__(self, node):
+        pass
+
+    @abstractmethod
+    def push(self, node, key):
+        """Thêm nút, hoặc giảm khóa nếu nút đã có và key nhỏ hơn. Trả về True nếu có thay đổi."""
+        pass
+
+    @abstractmethod
+    def pop(self):
+        """Lấy ra (khóa, nút) nhỏ nhất."""
+        pass
+
+    @abstractmethod
+    def peek(self):
+        """(khóa, nút) nhỏ nhất, không lấy ra."""
+        pass
+
+    @abstractmethod
+    def remove(self, node):
+        pass
+
+    @abstractmethod
+    def key_of(self, node):
+        """Khóa hiện tại của nút, hoặc None nếu nút không có trong hàng đợi."""
+        pass
+
+    @abstractmethod
+    def items(self):
+        """Các cặp (khóa, nút) đang có trong hàng đợi (không theo thứ tự)."""
+        pass
+
+    @abstractmethod
+    def copy(self):
+        pass
+
+    @property
+    def capacity(self):
+        """Số nút tối đa (id hợp lệ là 0..capacity-1)."""
+        return len(self._keys)
+
+    def update(self, node, key):
+        """Đặt khóa bất kỳ (tăng hoặc giảm) cho nút."""
+        if node in self:
+            self.remove(node)
+        self.push(node, key)
+
+    def sorted_items(self):
+        return sorted(self.items())
+
+
+class IndexedBinaryHeap(PriorityQueue):
+    """Heap nhị phân có mảng vị trí: push/pop/decrease-key/remove đều O(log V)."""
+
+    def __init__(self, capacity):
+        self._heap = []
+        self._keys = [None] * capacity
+        # _pos[node] = vị trí của nút trong _heap, -1 nếu không có
+        self._pos = array('i', [NO_NODE]) * capacity
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, node):
+        return self._pos[node] != NO_NODE
+
+    def key_of(self, node):
+        return self._keys[node] if node in self else None
+
+    def _less(self, node1, node2):
+        key1, key2 = self._keys[node1], self._keys[node2]
+        return key1 < key2 or (key1 == key2 and node1 < node2)
+
+    def _sift_up(self, i):
+        heap, pos = self._heap, self._pos
+        node = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not self._less(node, heap[parent]):
+                break
+            heap[i] = heap[parent]
+            pos[heap[i]] = i
+            i = parent
+        heap[i] = node
+        pos[node] = i
+
+    def _sift_down(self, i):
+        heap, pos = self._heap, self._pos
+        size = len(heap)
+        node = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and self._less(heap[child + 1], heap[child]):
+                child += 1
+            if not self._less(heap[child], node):
+                break
+            heap[i] = heap[child]
+            pos[heap[i]] = i
+            i = child
+        heap[i] = node
+        pos[node] = i
+
+    def push(self, node, key):
+        i = self._pos[node]
+        if i == NO_NODE:
+            self._keys[node] = key
+            self._heap.append(node)
+            self._sift_up(len(self._heap) - 1)
+            return True
+        if key < self._keys[node]:
+            self._keys[node] = key
+            self._sift_up(i)
+            return True
+        return False
+
+    def pop(self):
+        heap = self._heap
+        node = heap[0]
+        last = heap.pop()
+        self._pos[node] = NO_NODE
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        return self._keys[node], node
+
+    def peek(self):
+        node = self._heap[0]
+        return self._keys[node], node
+
+    def remove(self, node):
+        i = self._pos[node]
+        if i == NO_NODE:
+            return
+        heap = self._heap
+        last = heap.pop()
+        self._pos[node] = NO_NODE
+        if i < len(heap):
+            heap[i] = last
+            self._sift_up(i)
+            self._sift_down(self._pos[last])
+
+    def items(self):
+        keys = self._keys
+        return [(keys[node], node) for node in self._heap]
+
+    def copy(self):
+        clone = IndexedBinaryHeap.__new__(IndexedBinaryHeap)
+        clone._heap = list(self._heap)
+        clone._keys = list(self._keys)
+        clone._pos = array('i', self._pos)
+        return clone
+
+
+class BucketQueue(PriorityQueue):
+    """
+    Hàng đợi Dial: khóa là số nguyên không âm và mọi khóa đang có nằm trong
+    [khóa nhỏ nhất, khóa nhỏ nhất + max_weight] (đúng với Dijkstra khi trọng số
+    là số nguyên <= max_weight). Dùng max_weight + 1 xô xoay vòng, push O(1),
+    pop O(1) khấu hao (cộng thời gian tìm nút id nhỏ nhất trong xô).
+    """
+
+    def __init__(self, capacity, max_weight):
+        if max_weight < 0 or int(max_weight) != max_weight:
+            raise ValueError("BucketQueue cần trọng số nguyên không âm")
+        self._num_buckets = int(max_weight) + 1
+        self._buckets = [set() for _ in range(self._num_buckets)]
+        self._keys = [None] * capacity
+        self._present = bytearray(capacity)
+        self._size = 0
+        self._current = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, node):
+        return self._present[node] == 1
+
+    def key_of(self, node):
+        return self._keys[node] if node in self else None
+
+    def _check_key(self, key):
+        if key < 0 or int(key) != key:
+            raise ValueError(f"BucketQueue chỉ nhận khóa nguyên không âm, nhận {key}")
+
+    def push(self, node, key):
+        self._check_key(key)
+        if self._present[node]:
+            if key >= self._keys[node]:
+                return False
+            self._buckets[int(self._keys[node]) % self._num_buckets].discard(node)
+        else:
+            self._present[node] = 1
+            self._size += 1
+        self._keys[node] = key
+        self._buckets[int(key) % self._num_buckets].add(node)
+        if key < self._current:
+            self._current = int(key)
+        return True
+
+    def pop(self):
+        if not self._size:
+            raise IndexError('pop from empty BucketQueue')
+        buckets = self._buckets
+        while not buckets[self._current % self._num_buckets]:
+            self._current += 1
+        bucket = buckets[self._current % self._num_buckets]
+        node = min(bucket)
+        bucket.discard(node)
+        self._present[node] = 0
+        self._size -= 1
+        return self._keys[node], node
+
+    def peek(self):
+        if not self._size:
+            raise IndexError('peek from empty BucketQueue')
+        buckets = self._buckets
+        while not buckets[self._current % self._num_buckets]:
+            self._current += 1
+        node = min(buckets[self._current % self._num_buckets])
+        return self._keys[node], node
+
+    def remove(self, node):
+        if self._present[node]:
+            self._buckets[int(self._keys[node]) % self._num_buckets].discard(node)
+            self._present[node] = 0
+            self._size -= 1
+
+    def items(self):
+        keys = self._keys
+        return [(keys[node], node) for bucket in self._buckets for node in bucket]
+
+    def copy(self):
+        clone = BucketQueue.__new__(BucketQueue)
+        clone._num_buckets = self._num_buckets
+        clone._buckets = [set(bucket) for bucket in self._buckets]
+        clone._keys = list(self._keys)
+        clone._present = bytearray(self._present)
+        clone._size = self._size
+        clone._current = self._current
+        return clone
+
+
+class PairingHeap(PriorityQueue):
+    """
+    Pairing heap trên mảng (con trái nhất / anh em kế / nút trước):
+    push và decrease-key O(1), pop O(log V) khấu hao.
+    """
+
+    def __init__(self, capacity):
+        self._keys = [None] * capacity
+        self._child = array('i', [NO_NODE]) * capacity
+        self._sibling = array('i', [NO_NODE]) * capacity
+        # _prev: anh em đứng trước, hoặc nút cha nếu là con trái nhất
+        self._prev = array('i', [NO_NODE]) * capacity
+        self._present = bytearray(capacity)
+        self._root = NO_NODE
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, node):
+        return self._present[node] == 1
+
+    def key_of(self, node):
+        return self._keys[node] if node in self else None
+
+    def _less(self, node1, node2):
+        key1, key2 = self._keys[node1], self._keys[node2]
+        return key1 < key2 or (key1 == key2 and node1 < node2)
+
+    def _link(self, node1, node2):
+        """Gộp hai cây (gốc rời, không có anh em); trả về gốc mới."""
+        if self._less(node2, node1):
+            node1, node2 = node2, node1
+        child = self._child[node1]
+        self._sibling[node2] = child
+        if child != NO_NODE:
+            self._prev[child] = node2
+        self._prev[node2] = node1
+        self._child[node1] = node2
+        return node1
+
+    def _cut(self, node):
+        """Tách cây con gốc 'node' khỏi cây hiện tại."""
+        prev, sibling = self._prev[node], self._sibling[node]
+        if self._child[prev] == node:
+            self._child[prev] = sibling
+        else:
+            self._sibling[prev] = sibling
+        if sibling != NO_NODE:
+            self._prev[sibling] = prev
+        self._prev[node] = NO_NODE
+        self._sibling[node] = NO_NODE
+
+    def _merge_children(self, node):
+        """Gộp hai lượt (trái sang phải theo cặp, rồi phải sang trái) các con của node."""
+        trees = []
+        child = self._child[node]
+        while child != NO_NODE:
+            next_child = self._sibling[child]
+            self._prev[child] = NO_NODE
+            self._sibling[child] = NO_NODE
+            trees.append(child)
+            child = next_child
+        self._child[node] = NO_NODE
+        if not trees:
+            return NO_NODE
+        paired = [self._link(trees[i], trees[i + 1]) if i + 1 < len(trees) else trees[i]
+                  for i in range(0, len(trees), 2)]
+        root = paired.pop()
+        while paired:
+            root = self._link(paired.pop(), root)
+        return root
+
+    def push(self, node, key):
+        if self._present[node]:
+            if not key < self._keys[node]:
+                return False
+            self._keys[node] = key
+            if node != self._root:
+                self._cut(node)
+                self._root = self._link(self._root, node)
+            return True
+        self._keys[node] = key
+        self._present[node] = 1
+        self._size += 1
+        self._root = node if self._root == NO_NODE else self._link(self._root, node)
+        return True
+
+    def pop(self):
+        root = self._root
+        if root == NO_NODE:
+            raise IndexError('pop from empty PairingHeap')
+        self._root = self._merge_children(root)
+        self._present[root] = 0
+        self._size -= 1
+        return self._keys[root], root
+
+    def peek(self):
+        root = self._root
+        if root == NO_NODE:
+            raise IndexError('peek from empty PairingHeap')
+        return self._keys[root], root
+
+    def remove(self, node):
+        if not self._present[node]:
+            return
+        if node == self._root:
+            self.pop()
+            return
+        self._cut(node)
+        subtree = self._merge_children(node)
+        if subtree != NO_NODE:
+            self._root = self._link(self._root, subtree)
+        self._present[node] = 0
+        self._size -= 1
+
+    def items(self):
+        keys = self._keys
+        result = []
+        pending = [self._root] if self._root != NO_NODE else []
+        while pending:
+            node = pending.pop()
+            result.append((keys[node], node))
+            child = self._child[node]
+            while child != NO_NODE:
+                pending.append(child)
+                child = self._sibling[child]
+        return result
+
+    def copy(self):
+        clone = PairingHeap.__new__(PairingHeap)
+        clone._keys = list(self._keys)
+        clone._child = array('i', self._child)
+        clone._sibling = array('i', self._sibling)
+        clone._prev = array('i', self._prev)
+        clone._present = bytearray(self._present)
+        clone._root = self._root
+        clone._size = self._size
+        return clone
+
+
+QUEUE_KINDS = ('binary', 'bucket', 'pairing')
+
+
+def create_priority_queue(kind, capacity, max_weight=None):
+    """Tạo hàng đợi theo tên: 'binary', 'bucket' (cần max_weight) hoặc 'pairing'."""
+    if kind == 'binary':
+        return IndexedBinaryHeap(capacity)
+    if kind == 'bucket':
+        if max_weight is None:
+            raise ValueError("BucketQueue cần max_weight (trọng số cạnh lớn nhất)")
+        return BucketQueue(capacity, max_weight)
+    if kind == 'pairing':
+        return PairingHeap(capacity)
+    raise ValueError(f"Loại hàng đợi không hỗ trợ: '{kind}' (chọn một trong {QUEUE_KINDS})")
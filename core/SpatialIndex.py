@@ -0,0 +1,104 @@
+import math
+from array import array
+
+from .compat import get_numpy
+
+
+class GridIndex:
+    """
+    Chỉ mục lưới đều trên các điểm (xs[i], ys[i]): mỗi ô giữ id các điểm nằm
+    trong nó (dạng CSR: cell_offsets + items). Truy vấn hình chữ nhật chỉ xét
+    các ô giao với nó, nên chi phí tỉ lệ với số điểm gần vùng cần tìm.
+    """
+
+    def __init__(self, xs, ys, cell_size=None, points_per_cell=4):
+        count = len(xs)
+        self.count = count
+        self.min_x = min(xs) if count else 0.0
+        self.min_y = min(ys) if count else 0.0
+        span_x = (max(xs) - self.min_x) if count else 0.0
+        span_y = (max(ys) - self.min_y) if count else 0.0
+        if cell_size is None:
+            # Khoảng points_per_cell điểm mỗi ô nếu các điểm phân bố đều
+            cells_per_side = max(1.0, math.sqrt(count / points_per_cell))
+            cell_size = max(span_x, span_y) / cells_per_side
+        self.cell_size = cell_size if cell_size > 0 else 1.0
+        self.cols = int(span_x / self.cell_size) + 1
+        self.rows = int(span_y / self.cell_size) + 1
+        self.xs = xs
+        self.ys = ys
+        self._arrays = None
+
+        np = get_numpy()
+        if np is not None and count:
+            self._build_numpy(np, xs, ys)
+        else:
+            self._build(xs, ys)
+
+    def _cell_of(self, x, y):
+        col = min(int((x - self.min_x) / self.cell_size), self.cols - 1)
+        row = min(int((y - self.min_y) / self.cell_size), self.rows - 1)
+        return row * self.cols + col
+
+    def _build(self, xs, ys):
+        num_cells = self.rows * self.cols
+        cells = array('i', (self._cell_of(xs[i], ys[i]) for i in range(self.count)))
+        offsets = array('q', bytes(8 * (num_cells + 1)))
+        for cell in cells:
+            offsets[cell + 1] += 1
+        for cell in range(num_cells):
+            offsets[cell + 1] += offsets[cell]
+        fill = array('q', offsets[:-1])
+        items = array('i', bytes(4 * self.count))
+        for i, cell in enumerate(cells):
+            items[fill[cell]] = i
+            fill[cell] += 1
+        self.cell_offsets = offsets
+        self.items = items
+
+    def _build_numpy(self, np, xs, ys):
+        x = np.asarray(xs, dtype=np.float64)
+        y = np.asarray(ys, dtype=np.float64)
+        cols = np.minimum(((x - self.min_x) / self.cell_size).astype(np.int64), self.cols - 1)
+        rows = np.minimum(((y - self.min_y) / self.cell_size).astype(np.int64), self.rows - 1)
+        cells = rows * self.cols + cols
+        counts = np.bincount(cells, minlength=self.rows * self.cols)
+        self.cell_offsets = array('q', bytes(8))
+        self.cell_offsets.frombytes(np.cumsum(counts, dtype=np.int64).tobytes())
+        self.items = array('i')
+        self.items.frombytes(np.argsort(cells, kind='stable').astype(np.int32).tobytes())
+        # Bản NumPy để truy vấn vùng lớn không phải lọc từng điểm bằng Python
+        self._arrays = (np, x, y, np.asarray(memoryview(self.items)),
+                        np.asarray(memoryview(self.cell_offsets)))
+
+    def query(self, x0, y0, x1, y1):
+        """Id các điểm nằm trong hình chữ nhật [x0, x1] x [y0, y1]."""
+        if not self.count or x1 < x0 or y1 < y0:
+            return []
+        size = self.cell_size
+        col0 = max(int((x0 - self.min_x) // size), 0)
+        col1 = min(int((x1 - self.min_x) // size), self.cols - 1)
+        row0 = max(int((y0 - self.min_y) // size), 0)
+        row1 = min(int((y1 - self.min_y) // size), self.rows - 1)
+        if col1 < col0 or row1 < row0:
+            return []
+        if self._arrays is not None:
+            return self._query_numpy(x0, y0, x1, y1, col0, col1, row0, row1)
+        xs, ys = self.xs, self.ys
+        offsets, items = self.cell_offsets, self.items
+        found = []
+        for row in range(row0, row1 + 1):
+            base = row * self.cols
+            # Các ô liền nhau trong cùng một hàng nằm liền nhau trong items
+            for i in items[offsets[base + col0]:offsets[base + col1 + 1]]:
+                if x0 <= xs[i] <= x1 and y0 <= ys[i] <= y1:
+                    found.append(i)
+        return found
+
+    def _query_numpy(self, x0, y0, x1, y1, col0, col1, row0, row1):
+        np, x, y, items, offsets = self._arrays
+        bases = np.arange(row0, row1 + 1, dtype=np.int64) * self.cols
+        starts, ends = offsets[bases + col0], offsets[bases + col1 + 1]
+        ids = np.concatenate([items[s:e] for s, e in zip(starts.tolist(), ends.tolist())])
+        px, py = x[ids], y[ids]
+        return ids[(px >= x0) & (px <= x1) & (py >= y0) & (py <= y1)].tolist()
@@ -0,0 +1,29 @@
+import importlib
+
+_MISSING = object()
+_modules = {}
+
+
+def _optional(name):
+    """Import trễ một module không bắt buộc; None nếu chưa cài (kết quả được nhớ lại)."""
+    module = _modules.get(name, _MISSING)
+    if module is _MISSING:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            module = None
+        _modules[name] = module
+    return module
+
+
+def get_numpy():
+    """
+    Trả về module numpy nếu đã cài, ngược lại trả về None.
+    Import trễ ở lần gọi đầu để NumPy không làm chậm lúc khởi động ứng dụng.
+    """
+    return _optional('numpy')
+
+
+def get_pillow():
+    """Trả về module PIL.Image nếu đã cài Pillow (dùng để xuất PNG), ngược lại None."""
+    return _optional('PIL.Image')
@@ -0,0 +1,292 @@
+"""
+Chạy thuật toán không cần giao diện Tk (server, kiểm thử, chạy hàng loạt ban đêm).
+
+Ví dụ:
+    python -m headless graph.gr -s Dijkstra --start 1
+    python -m headless a.el b.el -s BFS -s DFS --jobs 4 -o results.jsonl
+    python -m headless --batch jobs.txt --jobs 8 --no-trace
+    python -m headless road.gr --distances dijkstra --jobs 8 -o table.jsonl
+    python -m headless sample -s Dijkstra --export frames/ --jobs 4 --no-trace
+
+Mỗi job (đồ thị, strategy, nút bắt đầu) cho ra một dòng JSON gồm kết quả
+tóm tắt và (nếu không có --no-trace) toàn bộ các bước. Với --distances, mỗi
+nguồn (--start, mặc định: mọi nút) cho ra một dòng khoảng cách, không có trace.
+Với --export, mỗi job còn ghi chuỗi ảnh từng bước vào một thư mục con của DIR.
+"""
+import argparse
+import functools
+import json
+import os
+import re
+import shlex
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithms import STRATEGIES
+from algorithms.BatchShortestPaths import BatchShortestPaths, METHODS
+from algorithms.TraceCache import TraceCache
+from core.Graph import Graph
+from core.GraphGenerators import GENERATORS, from_spec
+from ui.FrameExporter import FrameExporter, FORMATS
+
+
+@functools.lru_cache(maxsize=8)
+def load_graph(path, fmt=None, directed=None):
+    """
+    Đọc đồ thị (mỗi tiến trình chỉ đọc một lần cho cùng một file).
+    'sample' là đồ thị mẫu; 'tên:khóa=giá trị,...' là đồ thị sinh ngẫu nhiên.
+    """
+    if path == 'sample':
+        return Graph()
+    if path.partition(':')[0] in GENERATORS:
+        return from_spec(path)
+    return Graph.from_file(path, fmt=fmt, directed=directed)
+
+
+def summarize_trace(steps):
+    """Kết quả tóm tắt rút ra từ danh sách bước (không phụ thuộc strategy)."""
+    op_counts = {}
+    # Thứ tự lần đầu tới mỗi nút (Kruskal thêm cả hai đầu mỗi cạnh, SPFA thăm lại nút)
+    order = []
+    seen = set()
+    distances = {}
+    parent = {}
+    tree_edges = []
+    cycle_edges = []
+    path_edges = []
+    for step in steps:
+        action = step[0]
+        op_counts[action] = op_counts.get(action, 0) + 1
+        if action in ('visit', 'add_node_to_mst'):
+            if step[1] not in seen:
+                seen.add(step[1])
+                order.append(step[1])
+        elif action == 'update_distance':
+            distances[step[1]] = step[2]
+            if len(step) > 3 and step[3] is not None:
+                parent[step[1]] = step[3]
+        elif action == 'add_edge_to_mst':
+            tree_edges.append([step[1], step[2]])
+        elif action == 'negative_cycle_edge':
+            cycle_edges.append([step[1], step[2]])
+        elif action == 'path_edge':
+            path_edges.append([step[1], step[2]])
+
+    summary = {'op_counts': op_counts}
+    if order:
+        summary['order'] = order
+    if distances:
+        summary['distances'] = distances
+        summary['parent'] = parent
+    if tree_edges:
+        summary['tree_edges'] = tree_edges
+    if cycle_edges:
+        summary['negative_cycle'] = cycle_edges
+    if path_edges:
+        summary['path'] = path_edges
+    return summary
+
+
+def run_job(job):
+    """
+    Chạy một job; trả về dict kết quả (dùng được trong ProcessPoolExecutor).
+    Lỗi của job được ghi vào trường 'error' thay vì làm dừng cả lô.
+    """
+    record = {'graph': job['graph'], 'strategy': job['strategy'], 'start': job.get('start')}
+    try:
+        graph = load_graph(job['graph'], job.get('format'), job.get('directed'))
+        try:
+            strategy_class = STRATEGIES.get(job['strategy'])
+        except (ImportError, AttributeError) as e:
+            # Strategy của gói ngoài (entry point) không import được
+            raise ValueError(f"Không nạp được strategy '{job['strategy']}': {e}") from e
+        if strategy_class is None:
+            raise ValueError(f"Không có strategy '{job['strategy']}' "
+                             f"(chọn một trong {', '.join(STRATEGIES)})")
+        start = job.get('start')
+        if start is None:
+            start = graph.default_start_node()
+        elif start not in graph.labels:
+            # Nhãn đọc từ file có thể là số nguyên
+            start = _coerce_label(graph, start)
+        record['start'] = start
+
+        strategy = strategy_class()
+        profiler = strategy.enable_profiling() if job.get('profile') else None
+        started = time.perf_counter()
+        cache = TraceCache(job['cache']) if job.get('cache') else None
+        steps = strategy.run(graph, start, cache=cache, **job.get('options', {}))
+        record['seconds'] = round(time.perf_counter() - started, 6)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+        return record
+
+    record['num_nodes'] = graph.num_nodes
+    record['num_arcs'] = graph.num_arcs
+    record['num_steps'] = len(steps)
+    record['result'] = summarize_trace(steps)
+    if profiler is not None:
+        record['profile'] = profiler.as_dict()
+    if job.get('export'):
+        directory = os.path.join(job['export'], _export_name(record))
+        try:
+            frames = FrameExporter(strategy_class, graph, steps).export(
+                directory, job.get('frame_format') or 'svg', workers=job.get('export_workers') or 1)
+            record['frames'] = {'directory': directory, 'count': len(frames)}
+        except Exception as e:  # Kể cả lỗi của process con (pickle, pool hỏng): chỉ hỏng job này
+            record['error'] = f"{type(e).__name__}: {e}"
+    if job.get('trace', True):
+        record['trace'] = [list(step) for step in steps]
+    return record
+
+
+def _export_name(record):
+    """Tên thư mục ảnh của một job, ví dụ 'road.gr-Dijkstra-1'."""
+    name = f"{os.path.basename(str(record['graph']))}-{record['strategy']}-{record['start']}"
+    return re.sub(r'[^\w.-]+', '_', name)
+
+
+def _coerce_label(graph, text):
+    for convert in (int, float):
+        try:
+            label = convert(text)
+        except ValueError:
+            continue
+        if label in graph.labels:
+            return label
+    raise KeyError(f"Không có nút '{text}' trong đồ thị")
+
+
+def _parse_option(text):
+    """'key=value' -> (key, value); value được đọc như JSON nếu có thể."""
+    key, sep, value = text.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Tùy chọn phải có dạng key=value: '{text}'")
+    try:
+        value = json.loads(value)
+    except ValueError:
+        pass
+    return key, value
+
+
+def build_jobs(args):
+    """Danh sách job từ các đối số dòng lệnh và file --batch."""
+    common = {'format': args.format, 'directed': args.directed or None,
+              'options': dict(args.option), 'trace': not args.no_trace,
+              'profile': args.profile, 'cache': args.cache,
+              'export': args.export, 'frame_format': args.frame_format}
+    strategies = args.strategy or list(STRATEGIES)
+    starts = args.start or [None]
+    jobs = [dict(common, graph=graph, strategy=name, start=start)
+            for graph in args.graphs for name in strategies for start in starts]
+
+    if args.batch:
+        # Mỗi dòng: <đồ thị> <strategy> [nút bắt đầu]; '#' là chú thích
+        with open(args.batch, encoding='utf-8') as f:
+            for line in f:
+                fields = shlex.split(line, comments=True)
+                if not fields:
+                    continue
+                if len(fields) < 2:
+                    raise ValueError(f"Dòng batch thiếu strategy: {line.strip()}")
+                jobs.append(dict(common, graph=fields[0], strategy=fields[1],
+                                 start=fields[2] if len(fields) > 2 else None))
+    if len(jobs) == 1:
+        # Một job: dùng các tiến trình cho việc vẽ ảnh thay vì cho các job
+        jobs[0]['export_workers'] = args.jobs
+    return jobs
+
+
+def run_jobs(jobs, workers=1):
+    """Chạy các job (song song nếu workers > 1); kết quả trả về theo đúng thứ tự job."""
+    if workers <= 1 or len(jobs) <= 1:
+        yield from map(run_job, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(run_job, jobs)
+
+
+def distance_records(args):
+    """Một dòng cho mỗi (đồ thị, nguồn): khoảng cách tới từng nút theo thứ tự nút (null: không tới được)."""
+    batch = BatchShortestPaths(args.distances, workers=args.jobs)
+    for path in args.graphs:
+        try:
+            graph = load_graph(path, args.format, args.directed or None)
+            sources = None
+            if args.start:
+                sources = [start if start in graph.labels else _coerce_label(graph, start)
+                           for start in args.start]
+            rows = batch.iter_distances(graph, sources)
+            for source, row in rows:
+                yield {'graph': path, 'method': args.distances, 'source': source,
+                       'distances': [None if d == float('inf') else
+                                     (int(d) if d.is_integer() else d) for d in row]}
+        except (OSError, ValueError, KeyError) as e:
+            yield {'graph': path, 'method': args.distances,
+                   'error': f"{type(e).__name__}: {e}"}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m headless',
+        description="Chạy thuật toán đồ thị không cần giao diện.")
+    parser.add_argument('graphs', nargs='*',
+                        help="File đồ thị (edge list, .gr, .mtx, .gsnap), 'sample' "
+                             "hoặc đồ thị sinh, ví dụ 'grid:rows=300'")
+    parser.add_argument('-s', '--strategy', action='append', choices=list(STRATEGIES),
+                        help="Thuật toán cần chạy (lặp lại được; mặc định: tất cả)")
+    parser.add_argument('--start', action='append',
+                        help="Nút bắt đầu (lặp lại được; mặc định: 'A' hoặc nút đầu tiên)")
+    parser.add_argument('--format', choices=('edgelist', 'dimacs', 'mtx', 'snapshot'),
+                        help="Định dạng file (mặc định: đoán theo đuôi file)")
+    parser.add_argument('--directed', action='store_true',
+                        help="Edge list là đồ thị có hướng")
+    parser.add_argument('--option', action='append', type=_parse_option, default=[],
+                        metavar='KEY=VALUE',
+                        help="Tùy chọn chuyển cho strategy, ví dụ queue_kind=bucket")
+    parser.add_argument('--batch', help="File danh sách job, mỗi dòng: đồ thị strategy [nút]")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Số tiến trình chạy song song (mặc định: 1)")
+    parser.add_argument('-o', '--output', help="Ghi kết quả JSON lines ra file (mặc định: stdout)")
+    parser.add_argument('--no-trace', action='store_true',
+                        help="Chỉ ghi kết quả tóm tắt, không ghi danh sách bước")
+    parser.add_argument('--profile', action='store_true',
+                        help="Ghi thêm bộ đếm thao tác và thời gian (trường 'profile')")
+    parser.add_argument('--distances', choices=METHODS,
+                        help="Chỉ tính bảng khoảng cách từ các nút --start (mặc định: mọi nút), "
+                             "song song theo --jobs")
+    parser.add_argument('--cache', metavar='DIR',
+                        help="Thư mục cache trace (dùng lại kết quả của lần chạy trước)")
+    parser.add_argument('--export', metavar='DIR',
+                        help="Xuất ảnh trạng thái sau từng bước vào DIR/<đồ thị>-<strategy>-<nút>/")
+    parser.add_argument('--frame-format', choices=FORMATS, default='svg',
+                        help="Định dạng ảnh khi --export (png cần Pillow; mặc định: svg)")
+    args = parser.parse_args(argv)
+    if not args.graphs and not args.batch:
+        parser.error("cần ít nhất một file đồ thị hoặc --batch")
+    if args.distances and args.batch:
+        parser.error("--distances không dùng chung với --batch")
+    if args.distances and args.export:
+        parser.error("--distances không có trace để --export")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    records = distance_records(args) if args.distances else run_jobs(build_jobs(args), args.jobs)
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    failed = 0
+    try:
+        for record in records:
+            failed += 'error' in record
+            out.write(json.dumps(record, ensure_ascii=False))
+            out.write('\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
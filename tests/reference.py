@@ -0,0 +1,71 @@
+"""
+Bản tham chiếu viết thẳng, không dùng code của repo: các test so kết quả của
+strategy/bộ duy trì với những hàm này (tính lại từ đầu).
+"""
+import heapq
+
+INF = float('inf')
+
+
+def arcs(graph):
+    """Mọi cung (u, v, trọng số) theo id của Graph (CSR)."""
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    return [(u, targets[k], weights[k])
+            for u in range(graph.num_nodes) for k in range(offsets[u], offsets[u + 1])]
+
+
+def arc_weight(graph, u, v):
+    """Trọng số nhỏ nhất của các cung u -> v, None nếu không có cung nào."""
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    found = [weights[k] for k in range(offsets[u], offsets[u + 1]) if targets[k] == v]
+    return min(found) if found else None
+
+
+def dijkstra(graph, source):
+    """Khoảng cách từ source tới mọi nút (INF nếu không tới được), dùng heapq."""
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = [INF] * graph.num_nodes
+    dist[source] = 0
+    heap = [(0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for k in range(offsets[u], offsets[u + 1]):
+            v, candidate = targets[k], d + weights[k]
+            if candidate < dist[v]:
+                dist[v] = candidate
+                heapq.heappush(heap, (candidate, v))
+    return dist
+
+
+def bellman_ford(graph, source):
+    """n - 1 vòng nới lỏng mọi cung; trả về (khoảng cách, có chu trình âm tới được từ source)."""
+    all_arcs = arcs(graph)
+    dist = [INF] * graph.num_nodes
+    dist[source] = 0
+    for _ in range(graph.num_nodes - 1):
+        for u, v, w in all_arcs:
+            if dist[u] + w < dist[v]:
+                dist[v] = dist[u] + w
+    has_cycle = any(dist[u] + w < dist[v] for u, v, w in all_arcs)
+    return dist, has_cycle
+
+
+def mst_weight(num_nodes, edges):
+    """Tổng trọng số rừng khung nhỏ nhất của các cạnh (u, v, trọng số): Kruskal + union-find."""
+    parent = list(range(num_nodes))
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    total = 0
+    for weight, u, v in sorted((w, u, v) for u, v, w in edges):
+        root_u, root_v = find(u), find(v)
+        if root_u != root_v:
+            parent[root_u] = root_v
+            total += weight
+    return total
@@ -0,0 +1,23 @@
+from algorithms.AStarStrategy import AStarStrategy
+from benchmarks.StubCanvas import StubCanvas
+from core.Graph import Graph
+
+
+def node_centers(canvas, scene):
+    centers = {}
+    for node, item in scene.node_ui.items():
+        x0, y0, x1, y1 = canvas.items[item]['coords']
+        centers[node] = ((x0 + x1) / 2, (y0 + y1) / 2)
+    return centers
+
+
+def test_scene_uses_search_coordinates():
+    # Đồ thị mẫu có bố cục Dijkstra riêng khác với tọa độ graph.xs/ys
+    graph = Graph()
+    assert dict(graph.nodes) != dict(graph.dijkstra_nodes)
+    strategy = AStarStrategy()
+    canvas = StubCanvas()
+    trace = strategy.run(graph, graph.default_start_node())
+    strategy.render_step(canvas, graph, trace, 0)
+    centers = node_centers(canvas, strategy.scene_for(canvas, graph))
+    assert centers == dict(graph.nodes)
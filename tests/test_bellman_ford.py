@@ -0,0 +1,62 @@
+import random
+from array import array
+
+import pytest
+
+import algorithms.BellmanFordStrategy as bellman_ford_module
+from algorithms.BellmanFordStrategy import BellmanFordStrategy, MODES
+from core.Graph import Graph
+
+from .reference import arc_weight, bellman_ford
+
+
+def random_graph(rng):
+    """Đồ thị có hướng nhỏ, trọng số có thể âm (khoảng 1/5 số đồ thị có chu trình âm tới được)."""
+    num_nodes = rng.randint(2, 12)
+    pairs = {(rng.randrange(num_nodes), rng.randrange(num_nodes))
+             for _ in range(rng.randint(1, 3 * num_nodes))}
+    pairs = sorted((u, v) for u, v in pairs if u != v)
+    sources = array('i', (u for u, _ in pairs))
+    targets = array('i', (v for _, v in pairs))
+    weights = array('q', (rng.randint(-8, 15) for _ in pairs))
+    return Graph.from_arcs([f"v{i}" for i in range(num_nodes)], sources, targets, weights)
+
+
+def run(graph, mode, monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(bellman_ford_module, 'get_numpy', lambda: None)
+    return list(BellmanFordStrategy(mode).run(graph, graph.default_start_node()))
+
+
+@pytest.mark.parametrize('mode,use_numpy', [(mode, True) for mode in MODES]
+                         + [('vectorized', False)])
+@pytest.mark.parametrize('seed', range(20))
+def test_modes_match_reference(seed, mode, use_numpy, monkeypatch):
+    rng = random.Random(seed)
+    for _ in range(20):
+        graph = random_graph(rng)
+        start = graph.index_of(graph.default_start_node())
+        expected, has_cycle = bellman_ford(graph, start)
+        steps = run(graph, mode, monkeypatch, use_numpy)
+        cycle = [(graph.index_of(step[1]), graph.index_of(step[2]))
+                 for step in steps if step[0] == 'negative_cycle_edge']
+        if not has_cycle:
+            assert not cycle
+            distances = [float('inf')] * graph.num_nodes
+            for step in steps:
+                if step[0] == 'update_distance':
+                    distances[graph.index_of(step[1])] = step[2]
+            assert distances == expected
+            continue
+
+        # Các cạnh (cha, con) được phát theo chiều lùi: nối thành một chu trình khép kín
+        assert cycle
+        for (parent, _), (_, next_child) in zip(cycle, cycle[1:] + cycle[:1]):
+            assert parent == next_child
+        assert len({child for _, child in cycle}) == len(cycle)
+        total = 0
+        for u, v in cycle:
+            weight = arc_weight(graph, u, v)
+            assert weight is not None, (u, v)
+            total += weight
+        assert total < 0
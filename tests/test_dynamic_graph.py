@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from algorithms.DynamicMST import DynamicMST
+from algorithms.DynamicShortestPaths import DynamicShortestPaths
+from core.DynamicGraph import DynamicGraph
+from core.GraphGenerators import road_like_graph
+
+from .reference import arcs, dijkstra, mst_weight
+
+
+def random_update(dynamic_graph, rng):
+    """Một thay đổi ngẫu nhiên: thêm cạnh, xóa cạnh, tăng hoặc giảm trọng số."""
+    labels = dynamic_graph.labels
+    edges = list(dynamic_graph.edges())
+    kind = rng.choice(('add', 'remove', 'weight'))
+    if kind == 'add' or not edges:
+        while True:
+            u, v = rng.sample(range(dynamic_graph.num_nodes), 2)
+            if v not in dynamic_graph.neighbors(u):
+                return dynamic_graph.add_edge(labels[u], labels[v], rng.randint(1, 100))
+    u, v, weight = rng.choice(edges)
+    if kind == 'remove':
+        return dynamic_graph.remove_edge(labels[u], labels[v])
+    return dynamic_graph.set_weight(labels[u], labels[v], rng.randint(1, 100))
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_mst_matches_kruskal_after_updates(seed):
+    rng = random.Random(seed)
+    dynamic_graph = DynamicGraph(road_like_graph(8, seed=seed))
+    mst = DynamicMST(dynamic_graph)
+    for _ in range(150):
+        random_update(dynamic_graph, rng)
+        assert mst.total_weight == mst_weight(dynamic_graph.num_nodes, dynamic_graph.edges())
+    # Cạnh của cây phải có trong đồ thị với đúng trọng số
+    for u_label, v_label, weight in mst.tree_edges():
+        assert dynamic_graph.weight(u_label, v_label) == weight
+
+
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('seed', range(4))
+def test_shortest_paths_match_dijkstra_after_updates(seed, directed):
+    rng = random.Random(seed)
+    dynamic_graph = DynamicGraph(road_like_graph(8, seed=seed), directed=directed)
+    source = dynamic_graph.labels[0]
+    paths = DynamicShortestPaths(dynamic_graph, source)
+    for _ in range(150):
+        random_update(dynamic_graph, rng)
+        expected = dijkstra(dynamic_graph.to_graph(), dynamic_graph.index_of(source))
+        labels = dynamic_graph.labels
+        assert [paths.distance(labels[node]) for node in range(len(labels))] == expected
+    # Cha của mỗi nút nằm trên một đường đi ngắn nhất
+    for node, label in enumerate(labels):
+        parent = paths.parent(label)
+        if parent is not None:
+            assert paths.distance(parent) + dynamic_graph.weight(parent, label) == expected[node]
+
+
+def test_to_graph_follows_updates():
+    rng = random.Random(7)
+    dynamic_graph = DynamicGraph(road_like_graph(6, seed=7))
+    for _ in range(60):
+        random_update(dynamic_graph, rng)
+    expected = {(u, v, weight) for u, v, weight in dynamic_graph.edges()}
+    expected |= {(v, u, weight) for u, v, weight in expected}
+    assert set(arcs(dynamic_graph.to_graph())) == expected
+
+
+def test_invalid_updates_are_rejected_before_changing_the_graph():
+    dynamic_graph = DynamicGraph(road_like_graph(4, seed=0))
+    paths = DynamicShortestPaths(dynamic_graph, dynamic_graph.labels[0])
+    u, v, weight = next(dynamic_graph.edges())
+    labels = dynamic_graph.labels
+    with pytest.raises(ValueError):
+        dynamic_graph.add_edge(labels[u], labels[v], 1)
+    with pytest.raises(ValueError):
+        dynamic_graph.add_edge(labels[u], labels[u], 1)
+    with pytest.raises(ValueError):
+        dynamic_graph.set_weight(labels[u], labels[v], -1)
+    assert dynamic_graph.weight(labels[u], labels[v]) == weight
+    assert not len(paths.steps)
@@ -0,0 +1,56 @@
+import pytest
+
+import algorithms.FloydStrategy as floyd_module
+from algorithms.FloydStrategy import FloydStrategy
+from core.GraphGenerators import erdos_renyi_graph
+
+from .reference import INF, arc_weight, dijkstra
+
+
+def steps(graph, start):
+    return [tuple(step) for step in FloydStrategy().run(graph, start)]
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_numpy_and_python_traces_are_equal(monkeypatch, seed):
+    pytest.importorskip('numpy')
+    graph = erdos_renyi_graph(60, num_edges=180, seed=seed)
+    start = graph.default_start_node()
+    with_numpy = steps(graph, start)
+    monkeypatch.setattr(floyd_module, 'get_numpy', lambda: None)
+    assert steps(graph, start) == with_numpy
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_all_pairs_matches_dijkstra(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(floyd_module, 'get_numpy', lambda: None)
+    graph = erdos_renyi_graph(50, num_edges=150, seed=11)
+    dist, parent = FloydStrategy().all_pairs(graph)
+    for i in range(graph.num_nodes):
+        expected = dijkstra(graph, i)
+        for j in range(graph.num_nodes):
+            assert dist[i][j] == expected[j]
+            if j != i and expected[j] != INF:
+                # Cha là nút ngay trước j trên một đường đi ngắn nhất
+                p = parent[i][j]
+                assert expected[p] + arc_weight(graph, p, j) == expected[j]
+
+
+def test_graphs_above_max_nodes_are_rejected(monkeypatch):
+    graph = erdos_renyi_graph(30, num_edges=60, seed=0)
+    monkeypatch.setattr(FloydStrategy, 'max_nodes', 20)
+    with pytest.raises(ValueError):
+        FloydStrategy().run(graph, graph.default_start_node())
+    with pytest.raises(ValueError):
+        FloydStrategy().all_pairs(graph)
+
+
+def test_benchmark_suite_skips_graphs_above_max_nodes(monkeypatch):
+    from benchmarks.BenchmarkSuite import run_suite
+
+    monkeypatch.setattr(FloydStrategy, 'max_nodes', 100)
+    results = run_suite(sizes=(100, 400), strategies=['Floyd'], render_max_edges=0)['results']
+    assert list(results) == ['Floyd/100']
@@ -0,0 +1,56 @@
+import os
+import pickle
+
+from algorithms import STRATEGIES
+from core.Graph import Graph
+from core.GraphGenerators import road_like_graph
+from ui.FrameExporter import FrameExporter
+
+
+def read_frames(paths):
+    contents = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            contents.append(f.read())
+    return contents
+
+
+def snapshot_graph(tmp_path):
+    path = str(tmp_path / 'graph.gsnap')
+    road_like_graph(5, seed=1).save_snapshot(path)
+    return Graph.load_snapshot(path)
+
+
+def test_snapshot_graph_survives_pickle(tmp_path):
+    graph = snapshot_graph(tmp_path)
+    copy = pickle.loads(pickle.dumps(graph))
+    assert copy.fingerprint() == graph.fingerprint()
+    assert copy.geometry_fingerprint() == graph.geometry_fingerprint()
+    assert list(copy.labels) == list(graph.labels)
+
+
+def test_parallel_export_matches_single_worker(tmp_path):
+    graph = snapshot_graph(tmp_path)
+    strategy_class = STRATEGIES['BFS']
+    trace = strategy_class().run(graph, graph.default_start_node())
+
+    single = FrameExporter(strategy_class, graph, trace).export(str(tmp_path / 'one'), workers=1)
+    parallel = FrameExporter(strategy_class, graph, trace).export(str(tmp_path / 'two'), workers=2)
+    assert len(single) == len(parallel) == len(trace)
+    assert [os.path.basename(path) for path in parallel] == [os.path.basename(path) for path in single]
+    assert read_frames(parallel) == read_frames(single)
+
+
+def test_repeated_frames_are_linked_across_chunks(tmp_path):
+    graph = road_like_graph(4, seed=2)
+    strategy_class = STRATEGIES['Kruskal']
+    trace = strategy_class().run(graph, graph.default_start_node())
+    paths = FrameExporter(strategy_class, graph, trace).export(str(tmp_path / 'frames'), workers=3)
+    frames = read_frames(paths)
+    single = FrameExporter(strategy_class, graph, trace).export(str(tmp_path / 'one'), workers=1)
+    assert frames == read_frames(single)
+    repeated = [(a, b) for a, b, data_a, data_b in zip(paths, paths[1:], frames, frames[1:])
+                if data_a == data_b]
+    assert repeated  # Kruskal có nhiều bước không làm đổi hình
+    for a, b in repeated:
+        assert os.path.samefile(a, b)
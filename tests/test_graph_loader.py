@@ -0,0 +1,118 @@
+import pytest
+
+from core import GraphLoader
+from core.Graph import Graph
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def arcs(graph):
+    """{(nhãn nguồn, nhãn đích): trọng số} của mọi cung."""
+    labels, offsets = graph.labels, graph.offsets
+    return {(labels[u], labels[graph.targets[k]]): graph.weights[k]
+            for u in range(graph.num_nodes) for k in range(offsets[u], offsets[u + 1])}
+
+
+def test_edge_list(tmp_path):
+    path = write(tmp_path, 'g.el', "# chú thích\na b 3\nb,c,2.5\nc a\n")
+    graph = GraphLoader.load(path)
+    assert list(graph.labels) == ['a', 'b', 'c']
+    assert arcs(graph) == {('a', 'b'): 3, ('b', 'a'): 3, ('b', 'c'): 2.5, ('c', 'b'): 2.5,
+                           ('c', 'a'): 1, ('a', 'c'): 1}
+    directed = GraphLoader.load(path, directed=True)
+    assert arcs(directed) == {('a', 'b'): 3, ('b', 'c'): 2.5, ('c', 'a'): 1}
+
+
+@pytest.mark.parametrize('text', ["a\n", "a b x\n"])
+def test_malformed_edge_list(tmp_path, text):
+    with pytest.raises(ValueError):
+        GraphLoader.load(write(tmp_path, 'g.el', text))
+
+
+def test_dimacs_with_coordinates(tmp_path):
+    path = write(tmp_path, 'g.gr', "c road\np sp 3 3\na 1 2 7\na 2 3 4\na 3 1 1\n")
+    write(tmp_path, 'g.co', "p aux sp co 3\nv 1 0 0\nv 2 10 0\nv 3 10 5\n")
+    graph = GraphLoader.load(path)
+    assert graph.num_nodes == 3
+    assert arcs(graph) == {('1', '2'): 7, ('2', '3'): 4, ('3', '1'): 1}
+    # Tọa độ được co vào canvas nhưng giữ thứ tự
+    assert graph.xs[0] < graph.xs[1] == graph.xs[2]
+
+
+@pytest.mark.parametrize('text', [
+    "p sp 3 1\na 1 4 7\n",   # đích ngoài 1..n
+    "p sp 3 1\na 0 2 7\n",   # id 0
+    "p sp 3 1\na 1 2\n",     # thiếu trọng số
+    "a 1 2 7\np sp 3 1\n",   # cung trước dòng p
+    "a 1 2 7\n",             # không có dòng p
+])
+def test_malformed_dimacs(tmp_path, text):
+    with pytest.raises(ValueError):
+        GraphLoader.load(write(tmp_path, 'g.gr', text))
+
+
+def test_dimacs_coordinates_out_of_range(tmp_path):
+    path = write(tmp_path, 'g.gr', "p sp 2 1\na 1 2 1\n")
+    write(tmp_path, 'g.co', "v 1 0 0\nv 3 1 1\n")
+    with pytest.raises(ValueError):
+        GraphLoader.load(path)
+
+
+def test_matrix_market(tmp_path):
+    general = write(tmp_path, 'general.mtx',
+                    "%%MatrixMarket matrix coordinate real general\n% x\n3 3 2\n1 2 1.5\n3 1 2\n")
+    assert arcs(GraphLoader.load(general)) == {('1', '2'): 1.5, ('3', '1'): 2.0}
+    symmetric = write(tmp_path, 'symmetric.mtx',
+                      "%%MatrixMarket matrix coordinate pattern symmetric\n3 3 2\n2 1\n3 3\n")
+    assert arcs(GraphLoader.load(symmetric)) == {('2', '1'): 1, ('1', '2'): 1, ('3', '3'): 1}
+
+
+@pytest.mark.parametrize('entries', [
+    "4 1 5\n",   # nguồn ngoài 1..n
+    "1 4 5\n",   # đích ngoài 1..n
+    "0 1 5\n",   # id 0
+    "1 2\n",     # thiếu giá trị
+])
+def test_malformed_matrix_market(tmp_path, entries):
+    path = write(tmp_path, 'g.mtx',
+                 "%%MatrixMarket matrix coordinate integer general\n3 3 1\n" + entries)
+    with pytest.raises(ValueError):
+        GraphLoader.load(path)
+
+
+def test_matrix_market_must_be_square(tmp_path):
+    path = write(tmp_path, 'g.mtx', "%%MatrixMarket matrix coordinate real general\n3 4 0\n")
+    with pytest.raises(ValueError):
+        GraphLoader.load(path)
+
+
+@pytest.mark.parametrize('graph', [Graph(), None], ids=['sample', 'edge-list'])
+def test_snapshot_round_trip(tmp_path, graph):
+    if graph is None:
+        graph = GraphLoader.load(write(tmp_path, 'g.el', "x y 2\ny z 0.5\n"))
+    path = str(tmp_path / 'g.gsnap')
+    graph.save_snapshot(path)
+    loaded = GraphLoader.load(path)
+    assert loaded.fingerprint() == graph.fingerprint()
+    assert list(loaded.labels) == list(graph.labels)
+    assert arcs(loaded) == arcs(graph)
+    assert dict(loaded.nodes) == dict(graph.nodes)
+    assert dict(loaded.dijkstra_nodes) == dict(graph.dijkstra_nodes)
+    assert loaded.has_integer_weights == graph.has_integer_weights
+
+
+def test_skew_symmetric_matrix_market_negates_the_mirror(tmp_path):
+    path = write(tmp_path, 'g.mtx',
+                 "%%MatrixMarket matrix coordinate integer skew-symmetric\n2 2 1\n2 1 5\n")
+    assert arcs(GraphLoader.load(path)) == {('2', '1'): 5, ('1', '2'): -5}
+
+
+@pytest.mark.parametrize('header', ["complex general", "real hermitian", "complex hermitian"])
+def test_unsupported_matrix_market_kinds(tmp_path, header):
+    path = write(tmp_path, 'g.mtx', f"%%MatrixMarket matrix coordinate {header}\n2 2 1\n2 1 5 0\n")
+    with pytest.raises(ValueError):
+        GraphLoader.load(path)
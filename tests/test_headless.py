@@ -0,0 +1,13 @@
+from algorithms import STRATEGIES
+from core.GraphGenerators import road_like_graph
+from headless import summarize_trace
+
+
+def test_order_lists_each_node_once():
+    graph = road_like_graph(10, seed=4)
+    start = graph.default_start_node()
+    for name in ('Kruskal', 'Prim', 'Bellman-Ford'):
+        order = summarize_trace(STRATEGIES[name]().run(graph, start))['order']
+        assert len(order) == len(set(order)), name
+    kruskal = summarize_trace(STRATEGIES['Kruskal']().run(graph, start))
+    assert set(kruskal['order']) == {node for edge in kruskal['tree_edges'] for node in edge}
@@ -0,0 +1,36 @@
+import importlib
+import os
+import sys
+
+from algorithms.StrategyRegistry import StrategyRegistry, _path_stamp
+
+
+def test_path_stamp_ignores_script_and_plain_directories(tmp_path, monkeypatch):
+    script_dir, plain, installed = (tmp_path / name for name in ('script', 'plain', 'installed'))
+    for directory in (script_dir, plain, installed / 'demo-1.0.dist-info'):
+        directory.mkdir(parents=True)
+    monkeypatch.setattr(sys, 'path', [str(script_dir), '', str(plain), str(installed)])
+    stamp = _path_stamp()
+    assert [path for path, _ in stamp] == [str(installed)]
+
+    # Sửa file trong thư mục làm việc không làm đổi stamp
+    (script_dir / 'notes.txt').write_text('x')
+    (plain / 'module.py').write_text('x')
+    assert _path_stamp() == stamp
+
+
+def test_entry_point_scan_is_reused_while_stamp_is_unchanged(tmp_path, monkeypatch):
+    # algorithms.StrategyRegistry là class (được re-export), lấy module qua importlib
+    registry_module = importlib.import_module('algorithms.StrategyRegistry')
+    scans = []
+
+    def fake_entry_points(group):
+        scans.append(group)
+        return []
+
+    monkeypatch.setattr(registry_module, '_entry_points', fake_entry_points)
+    cache_path = os.path.join(str(tmp_path), 'entry_points.json')
+    assert list(StrategyRegistry({'BFS': 'algorithms.BFSStrategy:BFSStrategy'},
+                                 cache_path=cache_path)) == ['BFS']
+    assert list(StrategyRegistry(cache_path=cache_path)) == []
+    assert len(scans) == 1
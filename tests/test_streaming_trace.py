@@ -0,0 +1,23 @@
+from algorithms.StepTrace import Op
+from algorithms.StreamingTrace import StreamingTrace
+from core.Graph import Graph
+
+
+def test_close_runs_the_generator_cleanup():
+    graph = Graph()
+    finished = []
+
+    def raw_steps():
+        try:
+            for node in range(graph.num_nodes):
+                yield Op.VISIT, node
+        finally:
+            finished.append(True)
+
+    source = raw_steps()  # Giữ tham chiếu: cleanup không được nhờ vào bộ thu gom rác
+    trace = StreamingTrace(source, graph.labels, capacity=2)
+    assert trace.ensure(1)
+    assert not finished
+    trace.close()
+    assert finished == [True]
+    assert trace.exhausted
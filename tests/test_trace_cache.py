@@ -0,0 +1,122 @@
+import os
+from array import array
+
+import pytest
+
+from algorithms.AStarStrategy import AStarStrategy
+from algorithms.BellmanFordStrategy import BellmanFordStrategy
+from algorithms import STRATEGIES
+from algorithms.DFSStrategy import DFSStrategy
+from algorithms.TraceCache import TraceCache
+from core.Graph import Graph
+from core.GraphGenerators import road_like_graph
+
+
+def raw_steps(trace):
+    return [tuple(step) for step in trace]
+
+
+def with_coordinates(graph, xs, ys):
+    """Cùng nhãn, cung, trọng số với graph nhưng tọa độ khác."""
+    offsets = graph.offsets
+    sources = array('i', (u for u in range(graph.num_nodes)
+                          for _ in range(offsets[u], offsets[u + 1])))
+    return Graph.from_arcs(graph.labels, sources, graph.targets, graph.weights, xs, ys)
+
+
+def test_constructor_settings_are_part_of_the_key(tmp_path):
+    cache = TraceCache(str(tmp_path))
+    graph = road_like_graph(12, seed=3)
+    start = graph.default_start_node()
+    spfa = BellmanFordStrategy('spfa').run(graph, start, cache=cache)
+    early_exit = BellmanFordStrategy('early_exit').run(graph, start, cache=cache)
+    assert raw_steps(early_exit) == raw_steps(BellmanFordStrategy('early_exit').run(graph, start))
+    assert raw_steps(spfa) != raw_steps(early_exit)
+
+
+def test_coordinates_are_part_of_the_key_for_astar(tmp_path):
+    cache = TraceCache(str(tmp_path))
+    first = road_like_graph(15, seed=1)
+    # Giãn trục x: cùng cung, khác hình học nên heuristic khác
+    stretched = with_coordinates(first, array('d', (2 * x for x in first.xs)), first.ys)
+    assert first.fingerprint() == stretched.fingerprint()
+    start = first.default_start_node()
+
+    AStarStrategy().run(first, start, cache=cache)
+    cached = AStarStrategy().run(stretched, start, cache=cache)
+    fresh = AStarStrategy().run(stretched, start)
+    assert raw_steps(cached) == raw_steps(fresh)
+    assert raw_steps(fresh) != raw_steps(AStarStrategy().run(first, start))
+
+
+def test_dfs_timestamps_are_restored_on_cache_hit(tmp_path):
+    cache = TraceCache(str(tmp_path))
+    graph = road_like_graph(20, seed=2)
+    start = graph.default_start_node()
+    fresh = DFSStrategy()
+    fresh.run(graph, start, cache=cache)
+
+    cached = DFSStrategy()
+    trace = cached.run(graph, start, cache=cache)
+    assert not isinstance(trace.op, array)  # lấy từ cache (mmap), không chạy lại
+    assert cached.discovery_time == fresh.discovery_time
+    assert cached.finish_time == fresh.finish_time
+
+
+@pytest.mark.parametrize('name', ['BFS', 'Dijkstra', 'Kruskal', 'Floyd', 'Bellman-Ford'])
+def test_round_trip(tmp_path, name):
+    cache = TraceCache(str(tmp_path))
+    graph = road_like_graph(10, seed=5)
+    start = graph.default_start_node()
+    strategy_class = STRATEGIES[name]
+    assert cache.load(strategy_class(), graph, start) is None
+    fresh = strategy_class().run(graph, start, cache=cache)
+
+    loaded = cache.load(strategy_class(), graph, start)
+    assert loaded is not None
+    assert raw_steps(loaded) == raw_steps(fresh)
+    streamed = strategy_class().stream(graph, start, cache=cache)
+    assert raw_steps(streamed) == raw_steps(fresh)
+
+
+def test_interrupted_run_is_not_stored(tmp_path):
+    cache = TraceCache(str(tmp_path))
+    graph = road_like_graph(10, seed=5)
+    start = graph.default_start_node()
+    trace = STRATEGIES['BFS']().stream(graph, start, cache=cache)
+    trace.ensure(5)
+    trace.close()
+    assert cache.entries() == []
+    assert cache.load(STRATEGIES['BFS'](), graph, start) is None
+
+
+def test_truncated_file_is_a_miss_and_removed(tmp_path):
+    cache = TraceCache(str(tmp_path))
+    graph = road_like_graph(10, seed=5)
+    start = graph.default_start_node()
+    STRATEGIES['BFS']().run(graph, start, cache=cache)
+    (_, size, path), = cache.entries()
+    with open(path, 'r+b') as f:
+        f.truncate(size // 2)
+    assert cache.load(STRATEGIES['BFS'](), graph, start) is None
+    assert not os.path.exists(path)
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = TraceCache(str(tmp_path))
+    graph = road_like_graph(10, seed=5)
+    starts = [graph.labels[node] for node in range(3)]
+    for start in starts:
+        DFSStrategy().run(graph, start, cache=cache)
+    paths = {start: cache.path_for(cache.key_for(DFSStrategy(), graph, start)) for start in starts}
+    for age, start in enumerate(starts):
+        os.utime(paths[start], (1_000_000 + age, 1_000_000 + age))
+    # Đọc trúng trace cũ nhất: nó thành mới dùng nhất
+    assert cache.load(DFSStrategy(), graph, starts[0]) is not None
+
+    sizes = {path: size for _, size, path in cache.entries()}
+    cache.evict(sizes[paths[starts[0]]] + sizes[paths[starts[2]]])
+    assert sorted(path for _, _, path in cache.entries()) == sorted([paths[starts[0]], paths[starts[2]]])
+
+    cache.clear()
+    assert cache.size() == 0
@@ -0,0 +1,409 @@
+from array import array
+
+from core.compat import get_numpy
+from core.Layout import CANVAS_WIDTH, CANVAS_HEIGHT
+from core.SpatialIndex import GridIndex
+
+NODE_RADIUS = 20
+DEFAULT_COLOR = 'lightgray'
+# Bán kính (pixel) nhỏ nhất còn hiện nhãn nút / trọng số cạnh
+MIN_LABEL_RADIUS = 8
+MIN_SCALE, MAX_SCALE = 0.001, 50.0
+
+
+class CanvasScene:
+    """
+    Cảnh vẽ bền vững trên canvas: các item (cạnh, trọng số, nút, nhãn) được tạo
+    một lần và giữ lại; mỗi bước chỉ gọi itemconfig cho những nút/cạnh có thuộc
+    tính thực sự thay đổi so với lần vẽ trước.
+
+    Với đồ thị lớn, chỉ những nút/cạnh nằm trong khung nhìn (viewport) mới có
+    item trên canvas: chỉ mục lưới (GridIndex) trên tọa độ nút cho biết phần nào
+    đang hiện. Khi phóng to/thu nhỏ/kéo (zoom/pan), item ra khỏi khung bị xóa,
+    item mới vào khung được tạo lại với đúng màu của trạng thái hiện tại.
+    Nếu khung chứa quá `max_nodes` nút, chỉ vẽ các nút đang được tô màu cùng
+    một phần mẫu đều của số còn lại, để thời gian mỗi khung hình có giới hạn.
+    """
+
+    def __init__(self, canvas, graph, positions, edges, weighted=False, max_nodes=2000):
+        self.canvas = canvas
+        self.graph = graph
+        self.weighted = weighted
+        self.max_nodes = max_nodes
+        self.max_edges = 2 * max_nodes
+
+        self.node_ui = {}
+        self.edge_ui = {}
+        self.text_ui = {}
+        self.weight_ui = {}
+        self.info_ui = {}
+
+        # Thuộc tính đang hiển thị (chỉ lưu khi khác mặc định)
+        self._node_fill = {}
+        self._edge_fill = {}
+        self._node_text = {}
+        self._info_text = {}
+        # Trạng thái đã vẽ lần trước (để biết có thể dùng 'dirty' hay phải so toàn bộ)
+        self._state = None
+        # Tên các map đã dùng ở lần sync gần nhất (để tô đúng màu cho item tạo mới)
+        self._node_fill_map = self._edge_fill_map = self._node_text_map = None
+        self._text_format = lambda node, value: str(value)
+
+        # Phép biến đổi khung nhìn: màn hình = thế giới * scale + offset
+        self.scale = 1.0
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self._drawn_view = None
+
+        self._build_geometry(positions, edges)
+        canvas.delete("all")
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # Hình học (tọa độ thế giới) và chỉ mục không gian
+    # ------------------------------------------------------------------
+    def _build_geometry(self, positions, edges):
+        self._node_keys = list(positions)
+        xs, ys = array('d'), array('d')
+        for node in self._node_keys:
+            x, y = positions[node]
+            xs.append(x)
+            ys.append(y)
+        self._xs, self._ys = xs, ys
+        self._node_index = GridIndex(xs, ys)
+
+        node_ids = {node: i for i, node in enumerate(self._node_keys)}
+        self._edge_keys = []
+        self._edge_weights = []
+        edge_a, edge_b = array('i'), array('i')
+        seen = set()
+        for node, neighbors in edges.items():
+            a = node_ids[node]
+            pairs = neighbors.items() if self.weighted else ((n, None) for n in neighbors)
+            for neighbor, weight in pairs:
+                key = (node, neighbor) if node <= neighbor else (neighbor, node)
+                if key in seen:
+                    continue
+                seen.add(key)
+                self._edge_keys.append(key)
+                self._edge_weights.append(weight)
+                edge_a.append(a)
+                edge_b.append(node_ids[neighbor])
+        self._edge_a, self._edge_b = edge_a, edge_b
+        self._node_ids = node_ids
+        self._edge_ids = {key: k for k, key in enumerate(self._edge_keys)}
+
+        # Cạnh ngắn: chỉ mục theo trung điểm, truy vấn nới thêm nửa chiều dài lớn nhất.
+        # Cạnh dài (dài hơn một ô lưới) được xét riêng từng cạnh.
+        limit = self._node_index.cell_size
+        mid_x, mid_y = array('d'), array('d')
+        self._short_edges = array('i')
+        self._long_edges = array('i')
+        self._edge_pad = 0.0
+        for k in range(len(edge_a)):
+            x1, y1, x2, y2 = xs[edge_a[k]], ys[edge_a[k]], xs[edge_b[k]], ys[edge_b[k]]
+            half = max(abs(x2 - x1), abs(y2 - y1)) / 2
+            if half <= limit:
+                self._short_edges.append(k)
+                mid_x.append((x1 + x2) / 2)
+                mid_y.append((y1 + y2) / 2)
+                self._edge_pad = max(self._edge_pad, half)
+            else:
+                self._long_edges.append(k)
+        self._edge_index = GridIndex(mid_x, mid_y, cell_size=limit)
+
+    def world_bounds(self):
+        if not self._xs:
+            return 0.0, 0.0, 0.0, 0.0
+        return min(self._xs), min(self._ys), max(self._xs), max(self._ys)
+
+    # ------------------------------------------------------------------
+    # Zoom / pan
+    # ------------------------------------------------------------------
+    def _canvas_size(self):
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        # Canvas chưa hiện lên (winfo trả về 1): dùng kích thước mặc định
+        if width <= 1 or height <= 1:
+            return CANVAS_WIDTH, CANVAS_HEIGHT
+        return width, height
+
+    def set_view(self, scale, offset_x, offset_y):
+        self.scale = min(max(scale, MIN_SCALE), MAX_SCALE)
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.refresh()
+
+    def zoom(self, factor, x, y):
+        """Phóng to (factor > 1) / thu nhỏ quanh điểm màn hình (x, y)."""
+        scale = min(max(self.scale * factor, MIN_SCALE), MAX_SCALE)
+        factor = scale / self.scale
+        self.set_view(scale, x - (x - self.offset_x) * factor, y - (y - self.offset_y) * factor)
+
+    def pan(self, dx, dy):
+        self.set_view(self.scale, self.offset_x + dx, self.offset_y + dy)
+
+    def fit_view(self, margin=NODE_RADIUS):
+        """Co khung nhìn để thấy toàn bộ đồ thị."""
+        min_x, min_y, max_x, max_y = self.world_bounds()
+        width, height = self._canvas_size()
+        span = max(max_x - min_x, max_y - min_y) or 1.0
+        scale = min(width - 2 * margin, height - 2 * margin) / span
+        self.set_view(scale, margin - min_x * scale, margin - min_y * scale)
+
+    def _node_radius(self):
+        return max(min(NODE_RADIUS * self.scale, NODE_RADIUS), 2)
+
+    # ------------------------------------------------------------------
+    # Tạo / xóa item theo khung nhìn
+    # ------------------------------------------------------------------
+    def refresh(self):
+        """Tính lại phần đồ thị trong khung nhìn và cập nhật các item tương ứng."""
+        width, height = self._canvas_size()
+        scale = self.scale
+        radius = self._node_radius()
+        view = (scale, self.offset_x, self.offset_y, radius)
+        moved = view != self._drawn_view
+        self._drawn_view = view
+
+        pad = radius / scale
+        x0 = -self.offset_x / scale - pad
+        y0 = -self.offset_y / scale - pad
+        x1 = (width - self.offset_x) / scale + pad
+        y1 = (height - self.offset_y) / scale + pad
+
+        nodes = self._limit(self._node_index.query(x0, y0, x1, y1), self.max_nodes,
+                            self._node_keys, self._node_ids, self._styled(self._node_fill_map))
+        edges = self._limit(self._visible_edges(x0, y0, x1, y1), self.max_edges,
+                            self._edge_keys, self._edge_ids, self._styled(self._edge_fill_map))
+        show_labels = radius >= MIN_LABEL_RADIUS
+        created_edges = self._show_edges(edges, moved, show_labels)
+        created_nodes = self._show_nodes(nodes, moved, radius, show_labels)
+        if created_edges and self.node_ui:
+            # Cạnh mới tạo phải nằm dưới các nút
+            self.canvas.tag_lower('edge')
+        if created_nodes and self.info_ui:
+            self.canvas.tag_raise('info_text')
+
+    def _visible_edges(self, x0, y0, x1, y1):
+        pad = self._edge_pad
+        xs, ys = self._xs, self._ys
+        edge_a, edge_b = self._edge_a, self._edge_b
+        short_edges = self._short_edges
+        found = [short_edges[i] for i in self._edge_index.query(x0 - pad, y0 - pad,
+                                                                x1 + pad, y1 + pad)]
+        long_edges = self._long_edges
+        if not long_edges:
+            return found
+        np = get_numpy()
+        if np is not None:
+            ids = np.asarray(memoryview(long_edges))
+            a, b = np.asarray(memoryview(edge_a))[ids], np.asarray(memoryview(edge_b))[ids]
+            wx, wy = np.asarray(memoryview(xs)), np.asarray(memoryview(ys))
+            ax, ay, bx, by = wx[a], wy[a], wx[b], wy[b]
+            hit = ((np.minimum(ax, bx) <= x1) & (np.maximum(ax, bx) >= x0)
+                   & (np.minimum(ay, by) <= y1) & (np.maximum(ay, by) >= y0))
+            found.extend(ids[hit].tolist())
+            return found
+        for k in long_edges:
+            ax, ay, bx, by = xs[edge_a[k]], ys[edge_a[k]], xs[edge_b[k]], ys[edge_b[k]]
+            if min(ax, bx) <= x1 and max(ax, bx) >= x0 and min(ay, by) <= y1 and max(ay, by) >= y0:
+                found.append(k)
+        return found
+
+    @staticmethod
+    def _limit(ids, budget, keys, ids_of, styled):
+        """Giữ tối đa `budget` phần tử: ưu tiên phần tử đang được tô màu, phần còn lại lấy mẫu đều."""
+        if len(ids) <= budget:
+            return ids
+        if len(styled) < len(ids):
+            # Duyệt phía nhỏ hơn: các phần tử được tô màu có trong khung nhìn
+            visible = set(ids)
+            chosen = [i for i in map(ids_of.get, styled) if i in visible][:budget]
+        else:
+            chosen = [i for i in ids if keys[i] in styled][:budget]
+        rest = budget - len(chosen)
+        if rest > 0:
+            step = len(ids) / rest
+            chosen.extend(ids[int(j * step)] for j in range(rest))
+        return chosen
+
+    def _styled(self, name):
+        if self._state is None or name is None:
+            return {}
+        return self._state.maps[name]
+
+    def _to_screen(self, i):
+        return (self._xs[i] * self.scale + self.offset_x,
+                self._ys[i] * self.scale + self.offset_y)
+
+    def _current(self, name, key):
+        if self._state is None or name is None:
+            return None
+        return self._state.maps[name].get(key)
+
+    def _show_edges(self, ids, moved, show_weights):
+        canvas = self.canvas
+        keys = self._edge_keys
+        wanted = {keys[k]: k for k in ids}
+        for key in [key for key in self.edge_ui if key not in wanted]:
+            canvas.delete(self.edge_ui.pop(key))
+            self._edge_fill.pop(key, None)
+            weight_item = self.weight_ui.pop(key, None)
+            if weight_item is not None:
+                canvas.delete(weight_item)
+
+        created = False
+        for key, k in wanted.items():
+            x1, y1 = self._to_screen(self._edge_a[k])
+            x2, y2 = self._to_screen(self._edge_b[k])
+            item = self.edge_ui.get(key)
+            if item is None:
+                color = self._current(self._edge_fill_map, key)
+                self.edge_ui[key] = canvas.create_line(
+                    x1, y1, x2, y2, fill=color or DEFAULT_COLOR, width=3 if color else 2,
+                    tags='edge'
+                )
+                if color is not None:
+                    self._edge_fill[key] = color
+                created = True
+            elif moved:
+                canvas.coords(item, x1, y1, x2, y2)
+
+            if not self.weighted:
+                continue
+            weight_item = self.weight_ui.get(key)
+            if not show_weights:
+                if weight_item is not None:
+                    canvas.delete(self.weight_ui.pop(key))
+            elif weight_item is None:
+                # Vẽ trọng số (weight) ở giữa cạnh
+                self.weight_ui[key] = canvas.create_text(
+                    (x1 + x2) / 2, (y1 + y2) / 2,
+                    text=str(self._edge_weights[k]),
+                    font=('Arial', 10, 'bold'),
+                    fill='blue', tags='edge'
+                )
+                created = True
+            elif moved:
+                canvas.coords(weight_item, (x1 + x2) / 2, (y1 + y2) / 2)
+        return created
+
+    def _show_nodes(self, ids, moved, radius, show_labels):
+        canvas = self.canvas
+        keys = self._node_keys
+        wanted = {keys[i]: i for i in ids}
+        for node in [node for node in self.node_ui if node not in wanted]:
+            canvas.delete(self.node_ui.pop(node))
+            self._node_fill.pop(node, None)
+            text_item = self.text_ui.pop(node, None)
+            if text_item is not None:
+                canvas.delete(text_item)
+                self._node_text.pop(node, None)
+
+        created = False
+        for node, i in wanted.items():
+            x, y = self._to_screen(i)
+            item = self.node_ui.get(node)
+            if item is None:
+                color = self._current(self._node_fill_map, node)
+                self.node_ui[node] = canvas.create_oval(
+                    x - radius, y - radius,
+                    x + radius, y + radius,
+                    fill=color or DEFAULT_COLOR, outline='black', width=2, tags='node'
+                )
+                if color is not None:
+                    self._node_fill[node] = color
+                created = True
+            elif moved:
+                canvas.coords(item, x - radius, y - radius, x + radius, y + radius)
+
+            text_item = self.text_ui.get(node)
+            if not show_labels:
+                if text_item is not None:
+                    canvas.delete(self.text_ui.pop(node))
+                    self._node_text.pop(node, None)
+            elif text_item is None:
+                value = self._current(self._node_text_map, node)
+                text = node if value is None else self._text_format(node, value)
+                self.text_ui[node] = canvas.create_text(x, y, text=text,
+                                                        font=('Arial', 12, 'bold'), tags='node')
+                if value is not None:
+                    self._node_text[node] = value
+                created = True
+            elif moved:
+                canvas.coords(text_item, x, y)
+        return created
+
+    # ------------------------------------------------------------------
+    # Đồng bộ trạng thái
+    # ------------------------------------------------------------------
+    def sync(self, state, node_fill=None, edge_fill=None, node_text=None,
+             text_format=None):
+        """
+        Đồng bộ các map của RenderState lên canvas (chỉ các item đang có trong khung nhìn).
+        Trả về tập tên map/seq đã đổi, hoặc None nếu phải so sánh toàn bộ
+        (trạng thái khác đối tượng lần trước, ví dụ vừa khôi phục checkpoint).
+        """
+        dirty = state.take_dirty()
+        if state is not self._state:
+            self._state = state
+            dirty = None
+        self._node_fill_map = node_fill
+        self._edge_fill_map = edge_fill
+        self._node_text_map = node_text
+
+        if node_fill is not None:
+            self._sync_map(state.maps[node_fill], dirty, node_fill,
+                           self._node_fill, self.node_ui, self._apply_node_fill)
+        if edge_fill is not None:
+            self._sync_map(state.maps[edge_fill], dirty, edge_fill,
+                           self._edge_fill, self.edge_ui, self._apply_edge_fill)
+        if node_text is not None:
+            self._text_format = text_format or (lambda node, value: str(value))
+            self._sync_map(state.maps[node_text], dirty, node_text,
+                           self._node_text, self.text_ui, self._apply_node_text)
+        return None if dirty is None else set(dirty)
+
+    @staticmethod
+    def _sync_map(values, dirty, name, applied, items, apply):
+        if dirty is None:
+            keys = set(values)
+            keys.update(applied)
+        else:
+            keys = dirty.get(name, ())
+        for key in keys:
+            if key not in items:
+                continue
+            value = values.get(key)
+            if applied.get(key) != value:
+                apply(key, value)
+                if value is None:
+                    applied.pop(key, None)
+                else:
+                    applied[key] = value
+
+    def _apply_node_fill(self, node, color):
+        self.canvas.itemconfig(self.node_ui[node], fill=color or DEFAULT_COLOR)
+
+    def _apply_edge_fill(self, edge_key, color):
+        if color is None:
+            self.canvas.itemconfig(self.edge_ui[edge_key], fill=DEFAULT_COLOR, width=2)
+        else:
+            self.canvas.itemconfig(self.edge_ui[edge_key], fill=color, width=3)
+
+    def _apply_node_text(self, node, value):
+        text = node if value is None else self._text_format(node, value)
+        self.canvas.itemconfig(self.text_ui[node], text=text)
+
+    def set_info(self, slot, x, y, text, fill):
+        """Dòng chữ thông tin (Visited, Queue, ...): tạo một lần, sau đó chỉ đổi text."""
+        item = self.info_ui.get(slot)
+        if item is None:
+            self.info_ui[slot] = self.canvas.create_text(
+                x, y, anchor="w", text=text,
+                font=("Helvetica", 14, "bold"), fill=fill, tags="info_text"
+            )
+            self._info_text[slot] = text
+        elif self._info_text[slot] != text:
+            self.canvas.itemconfig(item, text=text)
+            self._info_text[slot] = text
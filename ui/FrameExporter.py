@@ -0,0 +1,139 @@
+import hashlib
+import os
+import shutil
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithms.StepTrace import StepTrace
+from core.compat import get_pillow
+from core.Layout import CANVAS_WIDTH, CANVAS_HEIGHT
+from .SvgCanvas import SvgCanvas
+
+FORMATS = ('svg', 'png')
+
+
+class FrameExporter:
+    """
+    Xuất trace thành chuỗi ảnh (frame_000000.svg, ...) không cần màn hình: mỗi khung
+    là trạng thái sau một bước, vẽ bằng đúng draw_state của strategy lên SvgCanvas.
+
+    - Các đoạn bước liên tiếp được chia cho các process (mỗi process có StepCursor
+      riêng nên chỉ tua một lần tới đầu đoạn của nó).
+    - Khung không đổi so với khung trước (canvas không có item nào đổi, hoặc cùng nội
+      dung) không được vẽ lại: file của nó là hard link tới file trước (hoặc bản sao
+      nếu hệ thống file không hỗ trợ link), dãy số khung vẫn liền mạch.
+    """
+
+    def __init__(self, strategy_class, graph, trace, width=CANVAS_WIDTH, height=CANVAS_HEIGHT,
+                 fit=True):
+        self.strategy_class = strategy_class
+        self.graph = graph
+        self.trace = _materialized(trace)
+        self.width = width
+        self.height = height
+        # Co khung nhìn cho vừa cả đồ thị (nếu không: tọa độ canvas gốc, scale 1)
+        self.fit = fit
+
+    def export(self, directory, fmt='svg', start=0, stop=None, every=1, workers=None,
+               prefix='frame'):
+        """Ghi các khung start, start+every, ... < stop; trả về list đường dẫn theo thứ tự khung."""
+        if fmt not in FORMATS:
+            raise ValueError(f"Định dạng không hợp lệ: '{fmt}' (chọn một trong {', '.join(FORMATS)})")
+        if fmt == 'png' and get_pillow() is None:
+            raise ValueError("Cần cài Pillow để xuất PNG")
+        stop = len(self.trace) if stop is None else min(stop, len(self.trace))
+        indices = range(start, stop, max(every, 1))
+        os.makedirs(directory, exist_ok=True)
+        workers = workers or os.cpu_count() or 1
+
+        settings = (self.strategy_class, self.graph, self.trace, self.width, self.height,
+                    self.fit, directory, fmt, prefix)
+        count = len(indices)
+        chunks = [indices[j * count // workers:(j + 1) * count // workers] for j in range(workers)]
+        chunks = [chunk for chunk in chunks if len(chunk)]
+        if len(chunks) <= 1:
+            results = [_render_chunk(settings, chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(len(chunks)) as pool:
+                results = list(pool.map(_render_chunk, [settings] * len(chunks), chunks))
+
+        # Ghép kết quả các đoạn: khung đầu một đoạn có thể trùng khung cuối đoạn trước
+        paths = []
+        previous_tail = previous_source = None
+        for frames, head, tail in results:
+            if head == previous_tail:
+                # Cả loạt khung đầu đoạn (tới file được ghi tiếp theo) là bản trùng
+                for i, (path, written) in enumerate(frames):
+                    if i and written:
+                        break
+                    _link(previous_source, path)
+            paths.extend(path for path, _ in frames)
+            sources = [path for path, written in frames if written]
+            previous_source = sources[-1] if sources else previous_source
+            previous_tail = tail
+        return paths
+
+
+def _materialized(trace):
+    """StepTrace trên array gửi được sang process khác (không phải view, mmap hay trace sinh dần)."""
+    copy = StepTrace(trace.labels, trace.integral_values)
+    if isinstance(trace, StepTrace):
+        columns = (trace.op, trace.a, trace.b, trace.value)
+        if trace._start == 0 and trace._stop is None and all(isinstance(c, array) for c in columns):
+            return trace
+        start, stop = trace._start, trace._start + len(trace)
+        for target, column in zip((copy.op, copy.a, copy.b, copy.value), columns):
+            target.frombytes(bytes(memoryview(column)[start:stop]))
+        return copy
+    index = 0
+    while trace.ensure(index):
+        copy.append(trace[index])
+        index += 1
+    return copy
+
+
+def _render_chunk(settings, indices):
+    """
+    Vẽ các khung `indices` (tăng dần). Trả về ([(đường dẫn, đã ghi file?)], digest khung
+    đầu, digest khung cuối) — hai digest để nối với các đoạn kề bên.
+    """
+    strategy_class, graph, trace, width, height, fit, directory, fmt, prefix = settings
+    strategy = strategy_class()
+    canvas = SvgCanvas(width, height)
+    if fit:
+        strategy.scene_for(canvas, graph).fit_view()
+    frames = []
+    head = last_version = last_data = last_path = None
+    for index in indices:
+        strategy.render_step(canvas, graph, trace, index)
+        path = os.path.join(directory, f"{prefix}_{index:06d}.{fmt}")
+        if canvas.version != last_version:
+            last_version = canvas.version
+            data = canvas.to_png() if fmt == 'png' else canvas.to_svg_bytes()
+            if data != last_data:
+                with open(path, 'wb') as f:
+                    f.write(data)
+                if head is None:
+                    head = _digest(data)
+                last_data, last_path = data, path
+                frames.append((path, True))
+                continue
+        _link(last_path, path)
+        frames.append((path, False))
+    return frames, head, _digest(last_data) if last_data is not None else None
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _link(source, path):
+    """path trỏ tới cùng nội dung với source (hard link, không được thì chép)."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(source, path)
+    except OSError:
+        shutil.copyfile(source, path)
@@ -1,7 +1,11 @@
 import tkinter as tk
 from tkinter import font as tkFont
+from tkinter import filedialog
 
 class MainMenuView(tk.Frame):
+    # Số cột của lưới nút thuật toán (đủ chỗ cho cửa sổ 800x600 khi có nhiều strategy)
+    columns = 3
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller # 'controller' là App (root)
@@ -9,7 +13,7 @@ class MainMenuView(tk.Frame):
         # Tiêu đề
         title_font = tkFont.Font(family='Helvetica', size=24, weight='bold')
         label = tk.Label(self, text="Chọn Thuật Toán", font=title_font)
-        label.pack(pady=40, padx=20)
+        label.pack(pady=30, padx=20)
 
         # Khung chứa các nút
         button_frame = tk.Frame(self)
@@ -17,7 +21,7 @@ class MainMenuView(tk.Frame):
 
         # Lấy danh sách tên thuật toán từ controller
         button_font = tkFont.Font(family='Helvetica', size=14)
-        for strategy_name in self.controller.strategies.keys():
+        for i, strategy_name in enumerate(self.controller.strategies.keys()):
             # Tạo nút cho mỗi thuật toán
             button = tk.Button(
                 button_frame,
@@ -28,4 +32,35 @@ class MainMenuView(tk.Frame):
                 command=lambda name=strategy_name:
                     self.controller.show_visualizer(name)
             )
-            button.pack(pady=10)
\ No newline at end of file
+            row, column = divmod(i, self.columns)
+            button.grid(row=row, column=column, padx=8, pady=6)
+
+        # Chọn file đồ thị (mặc định dùng đồ thị mẫu)
+        graph_frame = tk.Frame(self)
+        graph_frame.pack(pady=20)
+
+        graph_label = tk.Label(
+            graph_frame,
+            text=f"Đồ thị: {self.controller.graph_name} "
+                 f"({self.controller.graph.num_nodes} nút, "
+                 f"{self.controller.graph.num_arcs} cung)",
+            font=("Arial", 12))
+        graph_label.pack(side=tk.LEFT, padx=10)
+
+        open_button = tk.Button(graph_frame, text="Mở file đồ thị...",
+                                command=self.on_open_graph)
+        open_button.pack(side=tk.LEFT)
+
+    def on_open_graph(self):
+        path = filedialog.askopenfilename(
+            title="Chọn file đồ thị",
+            filetypes=[
+                ("Tất cả đồ thị", "*.txt *.csv *.el *.gr *.mtx *.gsnap *.gz"),
+                ("Edge list", "*.txt *.csv *.el"),
+                ("DIMACS", "*.gr"),
+                ("Matrix Market", "*.mtx"),
+                ("Snapshot nhị phân", "*.gsnap"),
+                ("Tất cả", "*"),
+            ])
+        if path:
+            self.controller.load_graph(path)
@@ -0,0 +1,124 @@
+import time
+
+
+class PlaybackScheduler:
+    """
+    Điều phối việc vẽ các bước của trace trên một widget Tk (chỉ dùng after/after_idle).
+
+    - request(index): yêu cầu vẽ bước index. Các yêu cầu dồn tới trước khi Tk rảnh
+      (bấm Next liên tục, kéo thanh seek) được gộp lại: chỉ vẽ bước cuối cùng.
+    - play(): tự chạy với tốc độ `speed` bước/giây theo thời gian thực. Mỗi khung
+      hình nhảy tới bước ứng với thời điểm hiện tại, bỏ qua các bước ở giữa, nên
+      tốc độ hàng nghìn bước/giây vẫn chỉ vẽ tối đa `target_fps` khung/giây.
+    - Thời gian vẽ một khung được đo (trung bình trượt `render_cost`): nếu vẽ chậm,
+      khung hình thưa ra để việc vẽ chiếm tối đa `max_busy` thời gian, giao diện
+      vẫn nhận được sự kiện chuột/phím.
+    """
+    target_fps = 30
+    max_busy = 0.8
+
+    def __init__(self, widget, steps, render, speed=2.0, on_finished=None,
+                 clock=time.perf_counter):
+        self.widget = widget
+        self.steps = steps
+        # render(index) vẽ bước index (gồm cả cập nhật nút, nhãn đếm)
+        self.render = render
+        self.speed = speed
+        self.on_finished = on_finished
+        self.clock = clock
+        self.index = 0
+        self.playing = False
+        self.render_cost = 0.0
+        self._pending = None
+        self._draw_job = None
+        self._tick_job = None
+        # Phần bước lẻ chưa đi (speed * thời gian trôi qua tích lũy)
+        self._budget = 0.0
+        self._last_tick = 0.0
+
+    # ------------------------------------------------------------------
+    # Vẽ theo yêu cầu
+    # ------------------------------------------------------------------
+    def request(self, index):
+        """Vẽ bước index khi Tk rảnh; gọi nhiều lần trước đó thì chỉ lần cuối có hiệu lực."""
+        self.index = index
+        self._pending = index
+        if self._draw_job is None:
+            self._draw_job = self.widget.after_idle(self._flush)
+
+    def _flush(self):
+        self._draw_job = None
+        if self._pending is not None:
+            index, self._pending = self._pending, None
+            self._draw(index)
+
+    def _draw(self, index):
+        started = self.clock()
+        self.render(index)
+        cost = self.clock() - started
+        # Trung bình trượt: một khung chậm bất thường không làm đổi nhịp ngay
+        self.render_cost = cost if not self.render_cost else 0.8 * self.render_cost + 0.2 * cost
+
+    # ------------------------------------------------------------------
+    # Tự chạy
+    # ------------------------------------------------------------------
+    def play(self):
+        if self.playing:
+            return
+        self.playing = True
+        self._budget = 0.0
+        self._last_tick = self.clock()
+        self._schedule(min(1 / self.speed, self.frame_interval()))
+
+    def pause(self):
+        self.playing = False
+        if self._tick_job is not None:
+            self.widget.after_cancel(self._tick_job)
+            self._tick_job = None
+
+    def cancel(self):
+        """Hủy mọi việc đang chờ (khi đóng view)."""
+        self.pause()
+        if self._draw_job is not None:
+            self.widget.after_cancel(self._draw_job)
+            self._draw_job = None
+        self._pending = None
+
+    def set_speed(self, speed):
+        self.speed = max(float(speed), 1e-3)
+
+    def frame_interval(self):
+        """Khoảng cách (giây) giữa hai khung khi tự chạy, theo target_fps và thời gian vẽ đo được."""
+        return max(1 / self.target_fps, self.render_cost / self.max_busy)
+
+    def _tick(self):
+        self._tick_job = None
+        if not self.playing:
+            return
+        now = self.clock()
+        self._budget += (now - self._last_tick) * self.speed
+        self._last_tick = now
+        advance = int(self._budget)
+        if advance >= 1:
+            target = self.index + advance
+            if not self.steps.ensure(target):
+                # Chưa sinh kịp (hoặc đã hết): đi tới bước cuối đang có, không dồn nợ
+                target = len(self.steps) - 1
+                self._budget = 0.0
+            else:
+                self._budget -= advance
+            if target > self.index:
+                self._pending = None
+                self.index = target
+                self._draw(target)
+            elif self.steps.exhausted:
+                self.playing = False
+                if self.on_finished is not None:
+                    self.on_finished()
+                return
+        # Chờ tới khung kế tiếp, hoặc tới lúc đủ một bước nếu tốc độ chậm hơn fps
+        wait_step = (1 - self._budget) / self.speed
+        self._schedule(max(self.frame_interval() - self.render_cost, wait_step, 0.001))
+
+    def _schedule(self, delay):
+        self._tick_job = self.widget.after(max(int(delay * 1000), 1), self._tick)
@@ -0,0 +1,225 @@
+from io import BytesIO
+from xml.sax.saxutils import escape, quoteattr
+
+from core.compat import get_pillow
+from core.Layout import CANVAS_WIDTH, CANVAS_HEIGHT
+
+# Cỡ chữ Tk tính bằng point: đổi sang pixel của SVG/PNG
+_POINT = 4 / 3
+_ANCHORS = {'center': 'middle', 'w': 'start', 'e': 'end'}
+
+
+class SvgCanvas:
+    """
+    Canvas không cần màn hình, có cùng các hàm tk.Canvas mà CanvasScene dùng
+    (create_line/oval/text, itemconfig, coords, delete, tag_lower/tag_raise),
+    xuất ra SVG hoặc ảnh PNG (cần Pillow).
+
+    - `version` tăng mỗi khi có item thực sự đổi: hai khung hình liền nhau cùng
+      version là giống hệt nhau, không cần xuất lại.
+    - Chuỗi SVG của từng item được giữ lại theo thứ tự vẽ, chỉ tạo lại cho item vừa
+      đổi: xuất một khung chỉ còn là nối các chuỗi có sẵn.
+    """
+
+    def __init__(self, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, background='white'):
+        self.width = width
+        self.height = height
+        self.background = background
+        self.items = {}
+        self.version = 0
+        # Thứ tự vẽ (dưới -> trên): _order[i] là id item, _body[i] là chuỗi SVG (bytes)
+        # đã tạo của nó; _slot: id -> i. Item vừa đổi nằm trong _dirty, chỉ tạo lại khi xuất.
+        self._order = []
+        self._body = []
+        self._slot = {}
+        self._dirty = set()
+        self._next_id = 0
+
+    # ------------------------------------------------------------------
+    # API giống tk.Canvas
+    # ------------------------------------------------------------------
+    def _create(self, kind, coords, options):
+        self._next_id += 1
+        item = self._next_id
+        options['kind'] = kind
+        options['coords'] = coords
+        self.items[item] = options
+        self._slot[item] = len(self._order)
+        self._order.append(item)
+        self._body.append(b'')
+        self._dirty.add(item)
+        self.version += 1
+        return item
+
+    def create_line(self, *coords, **options):
+        return self._create('line', coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self._create('oval', coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create('text', coords, options)
+
+    def itemconfig(self, item, **options):
+        current = self.items[item]
+        if any(current.get(key) != value for key, value in options.items()):
+            current.update(options)
+            self._dirty.add(item)
+            self.version += 1
+
+    itemconfigure = itemconfig
+
+    def coords(self, item, *coords):
+        if self.items[item]['coords'] != coords:
+            self.items[item]['coords'] = coords
+            self._dirty.add(item)
+            self.version += 1
+
+    def delete(self, *items):
+        for item in items:
+            if item == 'all':
+                if self.items:
+                    self.version += 1
+                self.items.clear()
+                self._restack([])
+            elif self.items.pop(item, None) is not None:
+                # Chỗ của item đã xóa để trống; dọn khi chiếm quá nửa
+                self._body[self._slot.pop(item)] = b''
+                self._dirty.discard(item)
+                self.version += 1
+        if len(self._order) > 2 * len(self.items) + 64:
+            self._restack(self._live_order())
+
+    def _live_order(self):
+        items = self.items
+        return [item for item in self._order if item in items]
+
+    def tag_lower(self, tag):
+        """Đưa các item có tag xuống dưới cùng (giữ thứ tự tương đối)."""
+        order = self._live_order()
+        tagged = [item for item in order if self.items[item].get('tags') == tag]
+        self._reorder(tagged + [item for item in order if self.items[item].get('tags') != tag])
+
+    def tag_raise(self, tag):
+        """Đưa các item có tag lên trên cùng (giữ thứ tự tương đối)."""
+        order = self._live_order()
+        tagged = [item for item in order if self.items[item].get('tags') == tag]
+        self._reorder([item for item in order if self.items[item].get('tags') != tag] + tagged)
+
+    def _reorder(self, order):
+        if order != self._live_order():
+            self._restack(order)
+            self.version += 1
+
+    def _restack(self, order):
+        body, slot = self._body, self._slot
+        self._body = [body[slot[item]] for item in order]
+        self._slot = {item: i for i, item in enumerate(order)}
+        self._order = order
+        self._dirty &= self._slot.keys()
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    # ------------------------------------------------------------------
+    # Xuất
+    # ------------------------------------------------------------------
+    def to_svg(self):
+        return self.to_svg_bytes().decode('utf-8')
+
+    def to_svg_bytes(self):
+        """Tài liệu SVG (UTF-8); chỉ tạo lại chuỗi của các item đã đổi từ lần xuất trước."""
+        body, slot, items = self._body, self._slot, self.items
+        for item in self._dirty:
+            body[slot[item]] = _svg_item(items[item]).encode('utf-8')
+        self._dirty.clear()
+        head = (f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" '
+                f'height="{self.height}" viewBox="0 0 {self.width} {self.height}">\n'
+                f'<rect width="100%" height="100%" fill={quoteattr(self.background)}/>\n')
+        return b''.join((head.encode('utf-8'), *body, b'</svg>\n'))
+
+    def to_png(self):
+        """Ảnh PNG (bytes) của canvas; cần Pillow."""
+        from PIL import ImageDraw, ImageFont
+        Image = get_pillow()
+
+        image = Image.new('RGB', (self.width, self.height), self.background)
+        draw = ImageDraw.Draw(image)
+        fonts = {}
+        for item in self._live_order():
+            options = self.items[item]
+            kind, coords = options['kind'], options['coords']
+            if kind == 'line':
+                draw.line(coords, fill=options.get('fill', 'black'),
+                          width=int(options.get('width', 1)))
+            elif kind == 'oval':
+                x0, y0, x1, y1 = coords
+                draw.ellipse((min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)),
+                             fill=options.get('fill') or None,
+                             outline=options.get('outline', 'black'),
+                             width=int(options.get('width', 1)))
+            else:
+                size = round(_font(options)[1] * _POINT)
+                font = fonts.get(size)
+                if font is None:
+                    font = fonts[size] = _pil_font(ImageFont, size)
+                x, y = coords
+                anchor = {'w': 'lm', 'e': 'rm'}.get(options.get('anchor'), 'mm')
+                lines = str(options.get('text', '')).split('\n')
+                top = y - (len(lines) - 1) * size * 0.6
+                for i, line in enumerate(lines):
+                    draw.text((x, top + i * size * 1.2), line, fill=options.get('fill', 'black'),
+                              font=font, anchor=anchor)
+        out = BytesIO()
+        image.save(out, format='PNG')
+        return out.getvalue()
+
+
+def _font(options):
+    """(họ font, cỡ, đậm?) từ font kiểu Tk, ví dụ ('Arial', 12, 'bold')."""
+    font = options.get('font') or ('Arial', 10)
+    family = font[0] if len(font) > 0 else 'Arial'
+    size = font[1] if len(font) > 1 else 10
+    return family, size, 'bold' in font[2:]
+
+
+def _pil_font(image_font, size):
+    try:
+        return image_font.truetype('DejaVuSans.ttf', size)
+    except OSError:
+        return image_font.load_default()
+
+
+def _svg_item(options):
+    return _svg_element(options) + '\n'
+
+
+def _svg_element(options):
+    kind, coords = options['kind'], options['coords']
+    if kind == 'line':
+        x1, y1, x2, y2 = coords[:4]
+        return (f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
+                f'stroke={quoteattr(options.get("fill", "black"))} '
+                f'stroke-width="{options.get("width", 1)}"/>')
+    if kind == 'oval':
+        x0, y0, x1, y1 = coords
+        return (f'<ellipse cx="{(x0 + x1) / 2:.1f}" cy="{(y0 + y1) / 2:.1f}" '
+                f'rx="{abs(x1 - x0) / 2:.1f}" ry="{abs(y1 - y0) / 2:.1f}" '
+                f'fill={quoteattr(options.get("fill") or "none")} '
+                f'stroke={quoteattr(options.get("outline", "black"))} '
+                f'stroke-width="{options.get("width", 1)}"/>')
+    x, y = coords
+    family, size, bold = _font(options)
+    lines = str(options.get('text', '')).split('\n')
+    # Nhiều dòng: căn giữa cả khối theo y như Tk
+    first_dy = -(len(lines) - 1) * 0.6
+    spans = ''.join(f'<tspan x="{x:.1f}" dy="{first_dy if i == 0 else 1.2:.2f}em">{escape(line)}</tspan>'
+                    for i, line in enumerate(lines))
+    return (f'<text x="{x:.1f}" y="{y:.1f}" font-family={quoteattr(family)} '
+            f'font-size="{size * _POINT:.1f}" font-weight="{"bold" if bold else "normal"}" '
+            f'text-anchor="{_ANCHORS.get(options.get("anchor", "center"), "middle")}" '
+            f'dominant-baseline="central" fill={quoteattr(options.get("fill", "black"))}>'
+            f'{spans}</text>')
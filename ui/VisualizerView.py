@@ -1,26 +1,47 @@
 import tkinter as tk
-from core.Graph import Graph
+from tkinter import messagebox, ttk
 from algorithms.IBaseAlgorithmStrategy import IBaseAlgorithmStrategy
+from .PlaybackScheduler import PlaybackScheduler
 
 
 class VisualizerView(tk.Frame):
+    step_capacity = 1_000_000
+    # Mỗi lần poll nhận tối đa poll_chunk bước từ luồng nền, cách nhau poll_interval_ms
+    poll_chunk = 20_000
+    poll_interval_ms = 50
+    # Các mức tốc độ tự chạy (bước/giây)
+    speeds = (1, 2, 5, 10, 30, 100, 300, 1000, 3000, 10000)
+    default_speed = 2
+
     def __init__(self, parent, controller, strategy: IBaseAlgorithmStrategy):
         super().__init__(parent)
         self.controller = controller
         self.strategy = strategy  # Đối tượng chiến lược
 
         # --- Dữ liệu Logic ---
-        self.graph = Graph()  # Tải đồ thị mẫu
-        self.all_steps = self.strategy.run(self.graph, 'A')  # Chạy logic 1 lần
-
-        self.current_step_index = 0
-        self.is_auto_running = False
-        self.auto_run_delay_ms = 500
+        self.graph = controller.graph  # Đồ thị mẫu hoặc đồ thị đã mở từ file
+        self.start_node = self.graph.default_start_node()
+        # Bật profiler trước khi chạy để đo được cả thời gian sinh bước
+        if getattr(controller, 'profiling', False):
+            self.strategy.enable_profiling()
+        # Thuật toán chạy trong luồng nền, các bước về dần (giữ tối đa step_capacity
+        # bước trong RAM, phần cũ hơn ghi ra file tạm) -> xem được phần đã có ngay.
+        # Nếu trace đã có trong cache thì dùng luôn (đủ bước, không cần chạy lại)
+        self.all_steps = self.strategy.stream(self.graph, self.start_node,
+                                              capacity=self.step_capacity, background=True,
+                                              cache=getattr(controller, 'trace_cache', None))
+        self._poll_job = None
+
+        # Vẽ theo yêu cầu (gộp các lần bấm liên tiếp) và tự chạy có bỏ khung
+        self.playback = PlaybackScheduler(self, self.all_steps, self.draw_step,
+                                          speed=self.default_speed,
+                                          on_finished=self.on_playback_finished)
 
         self.setup_ui()
 
-        # --- Vẽ trạng thái ban đầu (bước 0) ---
-        self.render_current_step()
+        # Nhận các bước từ luồng nền bằng after(), không chặn giao diện;
+        # bước 0 được vẽ ngay khi về tới
+        self.poll_steps()
 
     def setup_ui(self):
         top_frame = tk.Frame(self)
@@ -33,13 +54,47 @@ class VisualizerView(tk.Frame):
         self.step_label = tk.Label(top_frame, text="Bước: 0 / 0", font=("Arial", 12))
         self.step_label.pack(side=tk.LEFT, padx=20)
 
+        # Tiến độ chạy thuật toán (chưa biết tổng số bước nên dùng thanh chạy qua lại)
+        self.progress_bar = ttk.Progressbar(top_frame, mode="indeterminate", length=120)
+        self.progress_bar.pack(side=tk.LEFT)
+        self.progress_bar.start(20)
+        self.progress_label = tk.Label(top_frame, text="", font=("Arial", 10))
+        self.progress_label.pack(side=tk.LEFT, padx=5)
+
+        self.profile_var = tk.BooleanVar(value=self.strategy.profiler is not None)
+        profile_check = tk.Checkbutton(top_frame, text="Profile", variable=self.profile_var,
+                                       command=self.on_toggle_profile)
+        profile_check.pack(side=tk.RIGHT)
+
+        fit_button = tk.Button(top_frame, text="Vừa khung", command=self.on_fit_view)
+        fit_button.pack(side=tk.RIGHT, padx=5)
+
         self.canvas = tk.Canvas(self, bg="white", highlightthickness=1,
                                 highlightbackground="black")
         self.canvas.pack(fill="both", expand=True, padx=10, pady=5)
 
+        # Zoom bằng con lăn (Windows/macOS: MouseWheel, Linux: Button-4/5), kéo chuột trái để pan
+        self._drag_from = None
+        self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self.on_mouse_wheel)
+        self.canvas.bind("<ButtonPress-1>", self.on_drag_start)
+        self.canvas.bind("<B1-Motion>", self.on_drag)
+        self.canvas.bind("<Configure>", self.on_canvas_resize)
+
+        # Panel số liệu profiler, đặt đè lên góc phải trên của canvas
+        self.profile_panel = tk.Label(self.canvas, justify=tk.LEFT, anchor="nw",
+                                      font=("Courier", 9), bg="lightyellow",
+                                      relief=tk.SOLID, borderwidth=1)
+
         bottom_frame = tk.Frame(self)
         bottom_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=10)
 
+        # Thanh kéo để nhảy tới bất kỳ bước nào
+        self.seek_scale = tk.Scale(bottom_frame, from_=0, to=0, orient=tk.HORIZONTAL,
+                                   showvalue=False, command=self.on_seek)
+        self.seek_scale.pack(fill=tk.X, padx=10)
+
         button_container = tk.Frame(bottom_frame)
         button_container.pack()
 
@@ -59,87 +114,205 @@ class VisualizerView(tk.Frame):
                                      command=self.on_stop)
         self.stop_button.pack(side=tk.LEFT, padx=5)
 
+        tk.Label(button_container, text="Tốc độ (bước/giây):").pack(side=tk.LEFT, padx=(20, 2))
+        self.speed_var = tk.StringVar(value=str(self.default_speed))
+        speed_box = tk.Spinbox(button_container, values=self.speeds, width=6,
+                               textvariable=self.speed_var, command=self.on_speed_change)
+        speed_box.pack(side=tk.LEFT)
+        speed_box.bind("<Return>", self.on_speed_change)
+
+    @property
+    def current_step_index(self):
+        return self.playback.index
+
+    @property
+    def is_auto_running(self):
+        return self.playback.playing
+
     def render_current_step(self):
+        """Vẽ lại bước hiện tại khi Tk rảnh (gộp với các yêu cầu vẽ khác đang chờ)."""
+        self.playback.request(self.current_step_index)
+
+    def go_to_step(self, index):
+        self.playback.request(index)
+
+    def draw_step(self, index):
         if not self.all_steps:
             return
 
         # Yêu cầu strategy class vẽ
-        self.strategy.render_step(
-            self.canvas,
-            self.graph,
-            self.all_steps,
-            self.current_step_index
-        )
+        self.strategy.render_step(self.canvas, self.graph, self.all_steps, index)
 
         # Cập nhật trạng thái nút (Prev/Next) và nhãn đếm
         self.update_button_states()
+        self.update_profile_panel()
+        # Vẽ xong ngay để PlaybackScheduler đo được cả thời gian Tk vẽ lại canvas
+        self.canvas.update_idletasks()
+
+    def on_toggle_profile(self):
+        enabled = self.profile_var.get()
+        self.controller.profiling = enabled
+        if enabled:
+            self.strategy.enable_profiling()
+        else:
+            self.strategy.disable_profiling()
+        self.update_profile_panel()
+
+    def scene(self):
+        return self.strategy.scene_for(self.canvas, self.graph)
+
+    def on_mouse_wheel(self, event):
+        zoom_in = event.num == 4 or getattr(event, 'delta', 0) > 0
+        self.scene().zoom(1.2 if zoom_in else 1 / 1.2, event.x, event.y)
+
+    def on_drag_start(self, event):
+        self._drag_from = (event.x, event.y)
+
+    def on_drag(self, event):
+        if self._drag_from is None:
+            return
+        last_x, last_y = self._drag_from
+        self._drag_from = (event.x, event.y)
+        self.scene().pan(event.x - last_x, event.y - last_y)
+
+    def on_canvas_resize(self, event):
+        # Khung nhìn rộng/hẹp hơn: tạo thêm hoặc bỏ bớt item ở mép
+        self.scene().refresh()
+
+    def on_fit_view(self):
+        self.scene().fit_view()
+
+    def update_profile_panel(self):
+        profiler = self.strategy.profiler
+        if profiler is None:
+            self.profile_panel.place_forget()
+            return
+        lines = profiler.format_lines() or ["(chưa có số liệu)"]
+        self.profile_panel.config(text="\n".join(lines))
+        self.profile_panel.place(relx=1.0, x=-5, y=5, anchor="ne")
+
+    def poll_steps(self):
+        self._poll_job = None
+        had_steps = len(self.all_steps) > 0
+        try:
+            self.all_steps.poll(self.poll_chunk)
+        except Exception as e:  # Lỗi của thuật toán trong luồng nền (ví dụ chu trình âm)
+            self.show_run_error(e)
+            return
+        self.update_progress()
+        if not had_steps and self.all_steps:
+            # Bước 0 vừa về: vẽ ngay, không chờ thuật toán chạy xong
+            self.render_current_step()
+        else:
+            self.update_button_states()
+        if not self.all_steps.exhausted:
+            self._poll_job = self.after(self.poll_interval_ms, self.poll_steps)
+
+    def update_progress(self):
+        if self.all_steps.running:
+            self.progress_label.config(text=f"Đang chạy... {len(self.all_steps)} bước")
+            return
+        self.progress_bar.stop()
+        self.progress_bar.pack_forget()
+        self.progress_label.config(text=f"Xong: {len(self.all_steps)} bước")
+
+    def show_run_error(self, error):
+        """Thuật toán dừng vì lỗi: dừng thanh tiến độ, báo lỗi; vẫn xem được các bước đã có."""
+        self.progress_bar.stop()
+        self.progress_bar.pack_forget()
+        self.progress_label.config(text=f"Lỗi sau {len(self.all_steps)} bước", fg="red")
+        if self.all_steps:
+            self.render_current_step()
+        else:
+            self.update_button_states()
+        messagebox.showerror("Lỗi", f"Thuật toán dừng vì lỗi:\n{error}")
+
+    def min_step_index(self):
+        """Bước nhỏ nhất còn lùi về được (luôn là 0 trừ khi trace bỏ bớt bước cũ)."""
+        return self.strategy.cursor_for(self.graph, self.all_steps).min_index()
+
+    def has_next_step(self):
+        # Kéo thêm 1 bước từ generator nếu cần
+        return self.all_steps.ensure(self.current_step_index + 1)
 
     def on_back(self):
-        self.is_auto_running = False
+        self.playback.cancel()
+        if self._poll_job is not None:
+            self.after_cancel(self._poll_job)
+            self._poll_job = None
+        # Hủy luồng nền nếu thuật toán chưa chạy xong
+        self.all_steps.close()
         self.controller.show_main_menu()
 
     def on_next(self):
-        if self.current_step_index < len(self.all_steps) - 1:
-            self.current_step_index += 1
-            self.render_current_step()
+        if self.has_next_step():
+            self.go_to_step(self.current_step_index + 1)
 
     def on_prev(self):
-        if self.current_step_index > 0:
-            self.current_step_index -= 1
-            self.render_current_step()
+        if self.current_step_index > self.min_step_index():
+            self.go_to_step(self.current_step_index - 1)
+
+    def on_seek(self, value):
+        index = int(float(value))
+        if index != self.current_step_index:
+            self.go_to_step(index)
+
+    def on_speed_change(self, event=None):
+        try:
+            speed = float(self.speed_var.get())
+        except ValueError:
+            return
+        if speed > 0:
+            self.playback.set_speed(speed)
 
     def on_play_pause(self):
-        self.is_auto_running = not self.is_auto_running
-        if self.is_auto_running:
+        if not self.is_auto_running:
             self.play_pause_button.config(text="⏸ Pause")
-            if self.current_step_index == len(self.all_steps) - 1:
-                self.current_step_index = 0
-                self.render_current_step()
-            self.auto_run_loop()
+            if not self.has_next_step() and self.all_steps.exhausted:
+                self.go_to_step(self.min_step_index())
+            self.playback.play()
         else:
+            self.playback.pause()
             self.play_pause_button.config(text="▶ Play")
+        self.update_button_states()
 
     def on_stop(self):
-        self.is_auto_running = False
+        self.playback.pause()
         self.play_pause_button.config(text="▶ Play")
-        self.current_step_index = 0
-        self.render_current_step()
-
-    def auto_run_loop(self):
-        if not self.is_auto_running:
-            return
+        self.go_to_step(self.min_step_index())
 
-        if self.current_step_index >= len(self.all_steps) - 1:
-            self.is_auto_running = False
-            self.play_pause_button.config(text="▶ Play")
-            self.update_button_states()
-            return
-
-        self.on_next()
-
-        if self.is_auto_running:
-            self.after(self.auto_run_delay_ms, self.auto_run_loop)
+    def on_playback_finished(self):
+        self.play_pause_button.config(text="▶ Play")
+        self.update_button_states()
 
     def update_button_states(self):
         if not self.all_steps:
             total_steps = 0
         else:
             total_steps = len(self.all_steps) - 1
+        min_index = self.min_step_index()
 
-        # Vô hiệu hóa Prev ở bước 0
+        # Vô hiệu hóa Prev ở bước đầu
         self.prev_button.config(
-            state=tk.DISABLED if self.current_step_index == 0 else tk.NORMAL)
+            state=tk.DISABLED if self.current_step_index <= min_index else tk.NORMAL)
 
-        # Vô hiệu hóa Next ở bước cuối
-        self.next_button.config(
-            state=tk.DISABLED if self.current_step_index >= total_steps else tk.NORMAL)
+        # Vô hiệu hóa Next ở bước cuối (chỉ biết chắc khi generator đã chạy hết)
+        at_end = self.all_steps.exhausted and self.current_step_index >= total_steps
+        self.next_button.config(state=tk.DISABLED if at_end else tk.NORMAL)
 
+        # Dấu '+' cho biết thuật toán vẫn còn bước chưa sinh ra
+        more = "" if self.all_steps.exhausted else "+"
         self.step_label.config(
-            text=f"Bước: {self.current_step_index} / {total_steps}")
+            text=f"Bước: {self.current_step_index} / {total_steps}{more}")
+
+        # Scale bỏ qua set() khi đang DISABLED nên phải bật lại trước khi cập nhật
+        self.seek_scale.config(state=tk.NORMAL, from_=min_index, to=total_steps)
+        self.seek_scale.set(self.current_step_index)
 
         if self.is_auto_running:
             self.prev_button.config(state=tk.DISABLED)
             self.next_button.config(state=tk.DISABLED)
             self.stop_button.config(state=tk.DISABLED)
+            self.seek_scale.config(state=tk.DISABLED)
         else:
             self.stop_button.config(state=tk.NORMAL)
\ No newline at end of file